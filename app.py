@@ -0,0 +1,551 @@
+# app.py
+from mcp.server.fastmcp import FastMCP
+import aiohttp
+import asyncio
+import json
+import os
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Awaitable, Callable
+from modules.battle_analyzer import BattleAnalyzer
+from modules.battle_simulator import MAX_GAMES, shutdown_simulation_pool
+from modules.team_builder import TeamBuilder
+from modules.team_archetypes import TeamArchetypes
+from modules.stat_comparator import StatComparator
+from modules.team_coverage import MAX_TEAM_SIZE, TeamCoverage
+from modules.pokedex_index import PokedexIndex, page_bounds
+from modules.evolution_index import EvolutionIndex
+from utils.reference_data import get_reference_data
+from utils.http_client import get_http_client, close_http_client, POKEAPI_BASE
+from utils.response_cache import ResponseCache
+from utils.single_flight import AsyncSingleFlight
+from utils.projections import project, SLIM_POKEMON_FIELDS, SLIM_SPECIES_FIELDS
+from utils.local_mirror import LocalMirror
+
+# Create an MCP server
+mcp = FastMCP(
+    name="Pokemon MCP Server",
+    host="0.0.0.0",
+    port=8050,
+)
+
+# Local SQLite mirror of PokéAPI, consulted before the network. Set
+# POKEAPI_NETWORK_FALLBACK=0 to serve only from the mirror.
+local_mirror = LocalMirror()
+NETWORK_FALLBACK = os.getenv("POKEAPI_NETWORK_FALLBACK", "1") != "0"
+
+battle_analyzer = BattleAnalyzer(local_mirror)
+team_builder = TeamBuilder()
+team_archetypes = TeamArchetypes()
+reference_data = get_reference_data()
+stat_comparator = StatComparator()
+team_coverage = TeamCoverage()
+
+# In-memory cache of PokéAPI responses, shared by the data tools and resources
+response_cache = ResponseCache(max_entries=int(os.getenv("POKEAPI_CACHE_SIZE", "1024")))
+
+# In-memory national dex index for search_pokemon, built on first search
+pokedex_index = PokedexIndex(local_mirror)
+
+# Evolution graph over all mirrored chains; chains fetched from PokéAPI are added as they are seen
+evolution_index = EvolutionIndex(local_mirror)
+
+# Concurrent fetches of the same endpoint share one upstream request
+inflight_fetches = AsyncSingleFlight()
+
+# Upper bound on concurrent upstream fetches and on names per batch tool call
+BATCH_CONCURRENCY = int(os.getenv("POKEAPI_BATCH_CONCURRENCY", "6"))
+MAX_BATCH_SIZE = 50
+MAX_COVERAGE_TEAMS = 1000
+MAX_COVERAGE_NAMES = 200
+MAX_SIMULATIONS = MAX_GAMES
+
+
+async def fetch_pokemon_data(endpoint: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+    """Helper function to fetch data from PokéAPI, optionally projected onto the given fields"""
+    if fields is not None:
+        fields = tuple(dict.fromkeys(fields))
+    # Projections are cached under their own key; the raw payload is only cached for full callers
+    key = endpoint if fields is None else f"{endpoint}#{','.join(fields)}"
+
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    return await inflight_fetches.do(key, lambda: _fetch_uncached(endpoint, fields, key))
+
+
+async def _fetch_uncached(endpoint: str, fields: Optional[Tuple[str, ...]], key: str) -> Dict[str, Any]:
+    """Fetch an endpoint, project it once onto the fields if given and cache successful responses"""
+    if fields is None:
+        data = await _fetch_raw(endpoint)
+    else:
+        # Different projections of one endpoint share a single upstream fetch
+        data = await inflight_fetches.do(endpoint, lambda: _fetch_raw(endpoint))
+        if "error" not in data:
+            data = project(endpoint.split("/", 1)[0], data, fields)
+
+    if "error" not in data:
+        response_cache.set(key, data)
+    return data
+
+
+async def _fetch_raw(endpoint: str) -> Dict[str, Any]:
+    """Fetch the raw payload of an endpoint from the local mirror or PokéAPI"""
+    data = local_mirror.get(endpoint)
+    if data is not None:
+        return data
+    if not NETWORK_FALLBACK:
+        return {"error": f"Not found in local mirror: {endpoint}"}
+    try:
+        return await get_http_client().get_json_async(f"{POKEAPI_BASE}/{endpoint}")
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        return {"error": f"Failed to fetch data: {str(e)}"}
+
+
+async def fetch_pokemon_many(
+    names: List[str],
+    fields: Optional[Sequence[str]],
+    fetch: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch several Pokémon concurrently, at most BATCH_CONCURRENCY at a time, keeping input order
+
+    fetch replaces the PokeAPI pokemon endpoint lookup, e.g. with a module's own fetcher; fields is then unused.
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch_one(name: str) -> Dict[str, Any]:
+        async with semaphore:
+            if fetch is not None:
+                data = await fetch(name)
+            else:
+                data = await fetch_pokemon_data(f"pokemon/{name.lower()}", fields)
+        if "error" in data:
+            return {"name": name, "error": data["error"]}
+        return {"name": name, "data": data}
+
+    return await asyncio.gather(*(fetch_one(name) for name in names))
+
+
+# Competitive Analysis Tools
+@mcp.tool()
+def get_type_effectiveness(
+    attacking_type: str, defending_types: List[str], context: str = "", full: bool = False
+) -> Dict[str, Any]:
+    """Get the damage multiplier of an attacking type against one or two defending types.
+
+    The full type chart is published once as the type-chart://{version} resource; pass
+    `full=True` to embed the raw damage relations in the response instead.
+    """
+    return reference_data.type_calculator.get_effectiveness(attacking_type, defending_types, compact=not full)
+
+
+@mcp.tool()
+async def build_balanced_team(
+    core_pokemon: str, format: str = "OU", style: str = "balanced", excluded_types: List[str] = None
+) -> Dict[str, Any]:
+    """Build a balanced team around a core Pokemon."""
+    return await team_builder.build_team_async(core_pokemon, format, style, excluded_types or [])
+
+
+@mcp.tool()
+async def get_team_archetype(
+    archetype: str, format: str = "OU", key_pokemon: Optional[str] = None, style: str = "balanced"
+) -> Dict[str, Any]:
+    """Get team suggestions for specific archetypes."""
+    return await team_archetypes.get_team_suggestion_async(archetype, format, key_pokemon, style)
+
+
+@mcp.tool()
+async def predict_matchup(
+    team1: List[str], team2: List[str], format: str = "OU", scoring_priority: str = "overall", simulate: int = 0
+) -> Dict[str, Any]:
+    """Predict battle outcome between two teams.
+
+    Set simulate to a number of games to also estimate win rates with
+    Monte Carlo simulation, with 95% confidence intervals and MVP stats.
+    """
+    if simulate > MAX_SIMULATIONS:
+        return {"error": f"At most {MAX_SIMULATIONS} games can be simulated per call, got {simulate}"}
+    return await battle_analyzer.predict_matchup_async(team1, team2, format, scoring_priority, simulate)
+
+
+# Pokemon Data Tools
+@mcp.tool()
+async def get_pokemon(name_or_id: str, fields: Optional[List[str]] = None, full: bool = False) -> Dict[str, Any]:
+    """Get information about a specific Pokémon by name or ID.
+
+    Returns id, name, types, stats, abilities and move names by default. Pass `fields` to pick
+    top-level fields instead, or `full=True` for the raw PokéAPI payload.
+    """
+    return await fetch_pokemon_data(f"pokemon/{name_or_id.lower()}", None if full else (fields or SLIM_POKEMON_FIELDS))
+
+
+@mcp.tool()
+async def get_pokemon_batch(names: List[str], fields: Optional[List[str]] = None, full: bool = False) -> Dict[str, Any]:
+    """Get several Pokémon in one call, e.g. a whole team.
+
+    Results are returned in input order; each entry holds either `data` or an `error`.
+    Accepts the same `fields` and `full` options as get_pokemon.
+    """
+    if len(names) > MAX_BATCH_SIZE:
+        return {"error": f"At most {MAX_BATCH_SIZE} Pokémon can be fetched per batch, got {len(names)}"}
+
+    results = await fetch_pokemon_many(names, None if full else (fields or SLIM_POKEMON_FIELDS))
+    return {"results": results, "count": len(results), "errors": sum(1 for r in results if "error" in r)}
+
+
+@mcp.tool()
+async def get_pokemon_species(
+    name_or_id: str, fields: Optional[List[str]] = None, full: bool = False
+) -> Dict[str, Any]:
+    """Get species information about a Pokémon including flavor text and evolution chain.
+
+    Returns a compact profile (generation, evolution chain id, legendary status, egg groups, English
+    genus and flavor text) by default. Pass `fields` to pick top-level fields, or `full=True` for the
+    raw PokéAPI payload.
+    """
+    return await fetch_pokemon_data(
+        f"pokemon-species/{name_or_id.lower()}", None if full else (fields or SLIM_SPECIES_FIELDS)
+    )
+
+
+@mcp.tool()
+async def get_pokemon_ability(name_or_id: str) -> Dict[str, Any]:
+    """Get information about a specific Pokémon ability"""
+    return await fetch_pokemon_data(f"ability/{name_or_id.lower()}")
+
+
+@mcp.tool()
+async def get_pokemon_move(name_or_id: str) -> Dict[str, Any]:
+    """Get information about a specific Pokémon move"""
+    return await fetch_pokemon_data(f"move/{name_or_id.lower()}")
+
+
+@mcp.tool()
+async def get_pokemon_type(name_or_id: str) -> Dict[str, Any]:
+    """Get information about a Pokémon type including damage relations"""
+    return await fetch_pokemon_data(f"type/{name_or_id.lower()}")
+
+
+@mcp.tool()
+async def search_pokemon(
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    pokemon_type: Optional[str] = None,
+    generation: Optional[str] = None,
+    min_bst: Optional[int] = None,
+    max_bst: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Search and list Pokémon with pagination and optional type, generation and base stat total filters.
+
+    Results include id, types, generation, base stats and BST, at most 100 per page. Pass the
+    returned `next_cursor` as `cursor`, with the same filters, to get the next page. Without a local
+    mirror, filtered searches only cover cached Pokémon and return `complete: false` with no total count.
+    """
+    try:
+        limit, offset = page_bounds(limit, offset)
+    except ValueError as e:
+        return {"error": str(e)}
+    await asyncio.to_thread(pokedex_index.ensure_built)
+
+    # Without a full local dex, unfiltered listings still come from PokéAPI
+    filtered = cursor or pokemon_type or generation is not None or min_bst is not None or max_bst is not None
+    if not pokedex_index.complete and not filtered:
+        return await fetch_pokemon_data(f"pokemon?limit={limit}&offset={offset}")
+
+    try:
+        return pokedex_index.search(limit, offset, cursor, pokemon_type, generation, min_bst, max_bst)
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+async def get_evolution_chain(chain_id: int) -> Dict[str, Any]:
+    """Get evolution chain information by chain ID"""
+    return await fetch_pokemon_data(f"evolution-chain/{chain_id}")
+
+
+@mcp.tool()
+async def get_evolution_line(species: str) -> Dict[str, Any]:
+    """Get a species' full evolution line by name or ID, without needing its chain ID.
+
+    Returns pre-evolutions, direct and all later evolutions, the evolution method for each
+    stage, and whether the species is fully evolved.
+    """
+    await asyncio.to_thread(evolution_index.ensure_built)
+    line = evolution_index.lookup(species)
+
+    if line is None and not evolution_index.complete:
+        species_data = await fetch_pokemon_data(f"pokemon-species/{species.lower()}", SLIM_SPECIES_FIELDS)
+        if "error" in species_data:
+            return species_data
+        if species_data["evolution_chain_id"] is None:
+            return {"error": f"No evolution chain for species: {species}"}
+        chain = await fetch_pokemon_data(f"evolution-chain/{species_data['evolution_chain_id']}")
+        if "error" in chain:
+            return chain
+        evolution_index.add_chain(chain)
+        line = evolution_index.lookup(species)
+
+    return line or {"error": f"Unknown species: {species}"}
+
+
+@mcp.tool()
+async def get_pokemon_location_encounters(name_or_id: str) -> Dict[str, Any]:
+    """Get location areas where a Pokémon can be encountered"""
+    return await fetch_pokemon_data(f"pokemon/{name_or_id.lower()}/encounters")
+
+
+@mcp.tool()
+async def get_generation(name_or_id: str) -> Dict[str, Any]:
+    """Get information about a specific Pokémon generation"""
+    return await fetch_pokemon_data(f"generation/{name_or_id.lower()}")
+
+
+@mcp.tool()
+async def compare_pokemon_stats(pokemon1: str, pokemon2: str) -> Dict[str, Any]:
+    """Compare base stats between two Pokémon"""
+    data1, data2 = await asyncio.gather(
+        fetch_pokemon_data(f"pokemon/{pokemon1.lower()}", SLIM_POKEMON_FIELDS),
+        fetch_pokemon_data(f"pokemon/{pokemon2.lower()}", SLIM_POKEMON_FIELDS),
+    )
+
+    if "error" in data1 or "error" in data2:
+        return {"error": "Failed to fetch one or both Pokémon"}
+
+    stats_comparison = {
+        "pokemon1": {"name": data1["name"], "stats": dict(data1["stats"])},
+        "pokemon2": {"name": data2["name"], "stats": dict(data2["stats"])},
+        "differences": {},
+    }
+
+    for stat_name in stats_comparison["pokemon1"]["stats"]:
+        diff = stats_comparison["pokemon2"]["stats"][stat_name] - stats_comparison["pokemon1"]["stats"][stat_name]
+        stats_comparison["differences"][stat_name] = diff
+
+    return stats_comparison
+
+
+@mcp.tool()
+async def compare_pokemon_stats_multi(pokemon: List[str]) -> Dict[str, Any]:
+    """Compare base stats across a team or shortlist of Pokémon.
+
+    Returns per-stat and BST rankings, percentile positions within the group and
+    pairwise difference matrices (entry [i][j] is how much Pokémon j exceeds Pokémon i).
+    """
+    if len(pokemon) > MAX_BATCH_SIZE:
+        return {"error": f"At most {MAX_BATCH_SIZE} Pokémon can be compared at once, got {len(pokemon)}"}
+
+    results = await fetch_pokemon_many(pokemon, SLIM_POKEMON_FIELDS)
+    fetched = [r["data"] for r in results if "data" in r]
+    errors = {r["name"]: r["error"] for r in results if "error" in r}
+
+    if len(fetched) < 2:
+        return {"error": "At least two Pokémon are needed for a comparison", "failed": errors}
+
+    comparison = stat_comparator.compare(fetched)
+    comparison["failed"] = errors
+    return comparison
+
+
+@mcp.tool()
+async def analyze_speed_tiers(
+    team: List[str], investment: str = "max_plus", modifier: str = "none", limit: int = 10
+) -> Dict[str, Any]:
+    """Rank team members in level 100 speed tiers, normally and under Trick Room.
+
+    The field is every Pokémon in the local mirror, or every cached Pokémon without one; members
+    are left out of their own field.
+
+    investment is one of min, uninvested, max or max_plus; modifier is none, scarf or tailwind.
+    Each member lists who outspeeds it, its percentile and what Trick Room flips.
+    """
+    if len(team) > MAX_BATCH_SIZE:
+        return {"error": f"At most {MAX_BATCH_SIZE} Pokémon can be ranked at once, got {len(team)}"}
+
+    results = await fetch_pokemon_many(team, None, fetch=battle_analyzer.fetch_pokemon_data_async)
+    errors = {r["name"]: r["error"] for r in results if "error" in r}
+    team_data = [r["data"] for r in results if "data" in r]
+    try:
+        result = battle_analyzer.speed_tiers.analyze_team(team_data, investment, modifier, limit)
+    except ValueError as e:
+        return {"error": str(e)}
+    if errors:
+        result["failed"] = errors
+    return result
+
+
+@mcp.tool()
+async def analyze_team_coverage(team: List[str]) -> Dict[str, Any]:
+    """Compute the defensive and offensive type coverage of a team of up to 6 Pokémon.
+
+    Returns a member x attacking type defensive multiplier matrix, a member x defending type
+    best-STAB offensive matrix, shared weaknesses, unresisted and uncovered types and a
+    0-100 coverage score.
+    """
+    if not 1 <= len(team) <= MAX_TEAM_SIZE:
+        return {"error": f"A team needs 1 to {MAX_TEAM_SIZE} Pokémon, got {len(team)}"}
+
+    results = await fetch_pokemon_many(team, SLIM_POKEMON_FIELDS)
+    errors = {r["name"]: r["error"] for r in results if "error" in r}
+    if errors:
+        return {"error": "Failed to fetch some team members", "failed": errors}
+
+    try:
+        return team_coverage.analyze([r["data"]["types"] for r in results], [r["data"]["name"] for r in results])
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+async def score_team_coverage(teams: List[List[str]]) -> Dict[str, Any]:
+    """Score the type coverage of many candidate teams in one call, best first.
+
+    Each team is a list of up to 6 Pokémon names, with at most 200 distinct names across all
+    teams. Results give each team's input index, coverage score, shared weaknesses, unresisted
+    and uncovered types.
+    """
+    if len(teams) > MAX_COVERAGE_TEAMS:
+        return {"error": f"At most {MAX_COVERAGE_TEAMS} teams can be scored per call, got {len(teams)}"}
+    oversized = [i for i, team in enumerate(teams) if not 1 <= len(team) <= MAX_TEAM_SIZE]
+    if oversized:
+        return {"error": f"Each team needs 1 to {MAX_TEAM_SIZE} Pokémon", "invalid_teams": oversized}
+
+    names = list(dict.fromkeys(name.lower() for team in teams for name in team))
+    if len(names) > MAX_COVERAGE_NAMES:
+        return {"error": f"At most {MAX_COVERAGE_NAMES} distinct Pokémon can be scored per call, got {len(names)}"}
+    results = await fetch_pokemon_many(names, SLIM_POKEMON_FIELDS)
+    types = {r["name"]: r["data"]["types"] for r in results if "data" in r}
+    errors = {r["name"]: r["error"] for r in results if "error" in r}
+    if errors:
+        return {"error": "Failed to fetch some Pokémon", "failed": errors}
+
+    try:
+        return team_coverage.analyze_many([[types[name.lower()] for name in team] for team in teams])
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+# Resource Formatters
+@mcp.resource("pokemon://{name_or_id}")
+async def get_pokemon_resource(name_or_id: str) -> str:
+    """Get Pokémon data as a formatted resource"""
+    data = await fetch_pokemon_data(f"pokemon/{name_or_id.lower()}")
+
+    if "error" in data:
+        return f"Error: {data['error']}"
+
+    return f"""
+# {data['name'].title()} (#{data['id']})
+
+**Height:** {data['height']/10} m
+**Weight:** {data['weight']/10} kg
+**Base Experience:** {data['base_experience']}
+
+## Types
+{', '.join([t['type']['name'].title() for t in data['types']])}
+
+## Abilities
+{', '.join([a['ability']['name'].title() for a in data['abilities']])}
+
+## Base Stats
+{chr(10).join([f"- **{stat['stat']['name'].title()}:** {stat['base_stat']}" for stat in data['stats']])}
+
+## Sprites
+- Front Default: {data['sprites']['front_default']}
+- Front Shiny: {data['sprites']['front_shiny']}
+"""
+
+
+@mcp.resource("pokemon-move://{name_or_id}")
+async def get_move_resource(name_or_id: str) -> str:
+    """Get Pokémon move data as a formatted resource"""
+    data = await fetch_pokemon_data(f"move/{name_or_id.lower()}")
+
+    if "error" in data:
+        return f"Error: {data['error']}"
+
+    effect_text = ""
+    if data.get("effect_entries"):
+        effect_text = data["effect_entries"][0]["effect"]
+
+    return f"""
+# {data['name'].title()}
+
+**Type:** {data['type']['name'].title()}
+**Power:** {data.get('power', 'N/A')}
+**Accuracy:** {data.get('accuracy', 'N/A')}
+**PP:** {data.get('pp', 'N/A')}
+**Damage Class:** {data['damage_class']['name'].title()}
+
+## Effect
+{effect_text}
+
+## Target
+{data['target']['name'].title()}
+"""
+
+
+@mcp.resource("pokemon-type://{name_or_id}")
+async def get_type_resource(name_or_id: str) -> str:
+    """Get Pokémon type data with damage relations"""
+    data = await fetch_pokemon_data(f"type/{name_or_id.lower()}")
+
+    if "error" in data:
+        return f"Error: {data['error']}"
+
+    relations = data["damage_relations"]
+
+    return f"""
+# {data['name'].title()} Type
+
+## Damage Relations
+
+### Super Effective Against
+{', '.join([t['name'].title() for t in relations['double_damage_to']]) or 'None'}
+
+### Not Very Effective Against
+{', '.join([t['name'].title() for t in relations['half_damage_to']]) or 'None'}
+
+### No Effect Against
+{', '.join([t['name'].title() for t in relations['no_damage_to']]) or 'None'}
+
+### Weak To
+{', '.join([t['name'].title() for t in relations['double_damage_from']]) or 'None'}
+
+### Resists
+{', '.join([t['name'].title() for t in relations['half_damage_from']]) or 'None'}
+
+### Immune To
+{', '.join([t['name'].title() for t in relations['no_damage_from']]) or 'None'}
+"""
+
+
+@mcp.resource("type-chart://{version}")
+def get_type_chart_resource(version: str) -> str:
+    """Get the full type chart by content hash version, as referenced by type analysis responses"""
+    try:
+        return json.dumps(reference_data.type_calculator.get_type_chart(version))
+    except ValueError as e:
+        return f"Error: {e}"
+
+
+@mcp.resource("cache://stats")
+def get_cache_stats_resource() -> str:
+    """Get PokéAPI response cache size and hit/miss/eviction counters"""
+    return json.dumps(response_cache.stats(), indent=2)
+
+
+@mcp.resource("cache://matchups")
+def get_matchup_cache_stats_resource() -> str:
+    """Get matchup analysis cache size and hit/miss/eviction/invalidation counters"""
+    return json.dumps(battle_analyzer.cache_stats(), indent=2)
+
+
+async def serve() -> None:
+    """Run the SSE server, closing the shared HTTP client's sessions and the simulation pool on shutdown."""
+    try:
+        await mcp.run_sse_async()
+    finally:
+        await close_http_client()
+        await asyncio.to_thread(shutdown_simulation_pool)
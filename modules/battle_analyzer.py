@@ -2,96 +2,295 @@
 Battle analyzer module that provides data for Pokemon battle analysis.
 """
 
-from typing import List, Dict, Any
-from utils.type_calculator import TypeCalculator
-from pathlib import Path
-import json
-import requests
+from typing import List, Dict, Any, Optional, Tuple
+from modules.battle_simulator import BattleSimulator
+from modules.damage_calculator import DamageCalculator
+from modules.matchup_scorer import MAX_TEAM_SIZE, MatchupScorer
+from modules.speed_tiers import SpeedTierIndex
+from utils.local_mirror import LocalMirror
+from utils.matchup_cache import MatchupCache, canonical_key, data_version
+from utils.pokemon_fetcher import PokemonFetcher
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
 
+# Upper bound on Pokemon fetched at once while loading a matchup's teams
+TEAM_FETCH_CONCURRENCY = int(os.getenv("POKEAPI_TEAM_CONCURRENCY", "6"))
 
-class BattleAnalyzer:
+# Share of the speed tier field a Pokemon must outspeed at max speed to count as fast for its role
+FAST_PERCENTILE = 0.75
+
+
+class BattleAnalyzer(PokemonFetcher):
     """Provides data for analyzing Pokemon battles."""
 
-    def __init__(self):
-        """Initialize with required components."""
-        self.type_calculator = TypeCalculator()
-        self.pokeapi_base = "https://pokeapi.co/api/v2"
-        self.cache_dir = Path(__file__).parent.parent / "data" / "cache"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    # Matchup analyses shared by all instances, persisted when POKEMON_MATCHUP_CACHE_DIR is set
+    _matchup_cache = MatchupCache(
+        int(os.getenv("POKEMON_MATCHUP_CACHE_SIZE", "256")), os.getenv("POKEMON_MATCHUP_CACHE_DIR") or None
+    )
 
-    def fetch_pokemon_data(self, name: str) -> Dict[str, Any]:
-        """Fetch Pokemon data from PokeAPI with caching."""
-        cache_file = self.cache_dir / f"{name.lower()}.json"
+    def __init__(self, mirror: Optional[LocalMirror] = None):
+        """Initialize with required components, ranking speed against the mirror's Pokemon when one is given."""
+        super().__init__()
+        self.matchup_scorer = MatchupScorer()
+        self.damage_calculator = DamageCalculator()
+        self.battle_simulator = BattleSimulator()
+        self.speed_tiers = SpeedTierIndex(self.cache_dir, mirror)
 
-        if cache_file.exists():
-            with open(cache_file, "r") as f:
-                return json.load(f)
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get the matchup analysis cache's size and hit/miss/eviction/invalidation counters."""
+        return self._matchup_cache.stats()
 
+    def predict_matchup(
+        self,
+        team1: List[str],
+        team2: List[str],
+        format: str = "OU",
+        scoring_priority: str = "overall",
+        simulate: int = 0,
+    ) -> Dict[str, Any]:
+        """Provide data for battle matchup analysis, plus simulate Monte Carlo games if it is positive."""
         try:
-            response = requests.get(f"{self.pokeapi_base}/pokemon/{name.lower()}")
-            data = response.json()
-
-            pokemon_data = {
-                "id": data["id"],
-                "name": data["name"],
-                "types": [t["type"]["name"] for t in data["types"]],
-                "stats": {s["stat"]["name"]: s["base_stat"] for s in data["stats"]},
-                "abilities": [a["ability"]["name"] for a in data["abilities"]],
-                "moves": [m["move"]["name"] for m in data["moves"]],
-            }
-
-            with open(cache_file, "w") as f:
-                json.dump(pokemon_data, f, indent=2)
+            team1_data, team2_data = self._load_teams(team1, team2)
 
-            return pokemon_data
+            analysis = self._cached_analysis(team1, team2, team1_data, team2_data, format, scoring_priority)
+            if simulate > 0:
+                analysis["simulation"] = self.battle_simulator.simulate(team1_data, team2_data, simulate, format)
+            return analysis
 
         except Exception as e:
-            return {"error": f"Failed to fetch data for {name}: {str(e)}"}
+            return {"error": f"Matchup analysis failed: {str(e)}", "teams": {"team1": team1, "team2": team2}}
 
-    def predict_matchup(
-        self, team1: List[str], team2: List[str], format: str = "OU", scoring_priority: str = "overall"
+    async def predict_matchup_async(
+        self,
+        team1: List[str],
+        team2: List[str],
+        format: str = "OU",
+        scoring_priority: str = "overall",
+        simulate: int = 0,
     ) -> Dict[str, Any]:
-        """Provide data for battle matchup analysis."""
+        """Provide data for battle matchup analysis, fetching all Pokemon concurrently."""
+        try:
+            team1_data, team2_data = await self._load_teams_async(team1, team2)
+
+            analysis = self._cached_analysis(team1, team2, team1_data, team2_data, format, scoring_priority)
+            if simulate > 0:
+                analysis["simulation"] = await self.battle_simulator.simulate_async(
+                    team1_data, team2_data, simulate, format
+                )
+            return analysis
+
+        except Exception as e:
+            return {"error": f"Matchup analysis failed: {str(e)}", "teams": {"team1": team1, "team2": team2}}
+
+    def _fetch_member(self, name: str) -> Dict[str, Any]:
+        """Fetch one team member, turning any failure into a named error entry."""
         try:
-            # Get data for all Pokemon
-            team1_data = [self.fetch_pokemon_data(p) for p in team1]
-            team2_data = [self.fetch_pokemon_data(p) for p in team2]
+            data = self.fetch_pokemon_data(name)
+        except Exception as e:
+            data = {"error": f"Failed to fetch data for {name}: {str(e)}"}
+        return {"name": name, **data} if "error" in data else data
 
-            # Get type data for matchup analysis
-            team1_types = [p["types"] for p in team1_data if "types" in p]
-            team2_types = [p["types"] for p in team2_data if "types" in p]
-            type_matchup = self.type_calculator.analyze_team_types(team1_types, team2_types)
+    async def _fetch_member_async(self, name: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Fetch one team member under the semaphore, turning any failure into a named error entry."""
+        try:
+            async with semaphore:
+                data = await self.fetch_pokemon_data_async(name)
+        except Exception as e:
+            data = {"error": f"Failed to fetch data for {name}: {str(e)}"}
+        return {"name": name, **data} if "error" in data else data
 
-            # Get meta context data
-            meta_data = self._get_meta_context(format)
+    def _load_teams(self, team1: List[str], team2: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch both teams' Pokemon on a bounded thread pool, keeping input order."""
+        names = team1 + team2
+        with ThreadPoolExecutor(max_workers=max(min(TEAM_FETCH_CONCURRENCY, len(names)), 1)) as pool:
+            team_data = list(pool.map(self._fetch_member, names))
+        return team_data[: len(team1)], team_data[len(team1) :]
+
+    async def _load_teams_async(
+        self, team1: List[str], team2: List[str]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch both teams' Pokemon concurrently, at most TEAM_FETCH_CONCURRENCY at a time, keeping input order."""
+        semaphore = asyncio.Semaphore(TEAM_FETCH_CONCURRENCY)
+        team_data = await asyncio.gather(*(self._fetch_member_async(p, semaphore) for p in team1 + team2))
+        return list(team_data[: len(team1)]), list(team_data[len(team1) :])
+
+    def _cached_analysis(
+        self,
+        team1: List[str],
+        team2: List[str],
+        team1_data: List[Dict[str, Any]],
+        team2_data: List[Dict[str, Any]],
+        format: str,
+        scoring_priority: str,
+    ) -> Dict[str, Any]:
+        """Get matchup analysis from the matchup cache, analyzing and caching it on a miss.
 
+        Analyses are computed with both teams in canonical order, so a reordered
+        team or a swapped matchup reuses the same entry, and are mapped back to
+        the caller's team and member order. Entries are versioned by the
+        members' data, the move data and the format's type chart version.
+        Roles and the speed control summary of a cached analysis are
+        recomputed from the current speed tier field. Matchups with members
+        that failed to load or teams over the size limit are analyzed in the
+        caller's order and not cached.
+        """
+        if any("error" in p for p in team1_data + team2_data) or max(len(team1), len(team2)) > MAX_TEAM_SIZE:
+            return self._analyze_matchup(team1_data, team2_data, format, scoring_priority)
+
+        key, swapped = canonical_key(team1, team2, format, scoring_priority)
+        # Canonical position k holds the caller's member order[k]
+        order1 = sorted(range(len(team1)), key=lambda i: team1[i].lower())
+        order2 = sorted(range(len(team2)), key=lambda i: team2[i].lower())
+        first, second = [team1_data[i] for i in order1], [team2_data[i] for i in order2]
+        if swapped:
+            first, second = second, first
+
+        chart_version = self.type_calculator.for_format(format).chart_version
+        version = data_version(chart_version, self.reference_data.moves_version, first + second)
+        analysis = self._matchup_cache.get(key, version)
+        hit = analysis is not None
+        if not hit:
+            analysis = self._analyze_matchup(first, second, format, scoring_priority)
+            self._matchup_cache.set(key, version, analysis)
+
+        # Cached analyses are shared, so callers get new dicts down to what is reordered
+        if swapped:
+            analysis = self._mirror_analysis(analysis)
+        analysis = self._reorder_analysis(
+            analysis,
+            sorted(range(len(order1)), key=order1.__getitem__),
+            sorted(range(len(order2)), key=order2.__getitem__),
+        )
+        # A cached analysis may predate the current speed tier field; a fresh one was just computed from it
+        if hit:
+            for team in ("team1", "team2"):
+                analysis[team]["roles"] = self._get_team_roles(analysis[team]["pokemon"])
+            analysis["meta_context"] = {**analysis["meta_context"], "speed_control": self.speed_tiers.summary()}
+        return analysis
+
+    @staticmethod
+    def _mirror_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Get matchup analysis with the two teams swapped from an existing analysis."""
+
+        def swap_keys(data: Dict[str, Any]) -> Dict[str, Any]:
+            # Keys keep their order and take the value of their team1/team2 counterpart
             return {
-                "team1": {"pokemon": team1_data, "roles": self._get_team_roles(team1_data), "team_types": team1_types},
-                "team2": {"pokemon": team2_data, "roles": self._get_team_roles(team2_data), "team_types": team2_types},
-                "type_matchup": type_matchup,
-                "meta_context": meta_data,
-                "format_info": self._get_format_data(format),
-                "scoring_priority": scoring_priority,
+                key: data[key.replace("team1", "\0").replace("team2", "team1").replace("\0", "team2")] for key in data
             }
 
-        except Exception as e:
-            return {"error": f"Matchup analysis failed: {str(e)}", "teams": {"team1": team1, "team2": team2}}
+        damage = swap_keys(analysis["damage"])
+        damage["moves_considered"] = swap_keys(damage["moves_considered"])
+        return {
+            **swap_keys(analysis),
+            "type_matchup": swap_keys(analysis["type_matchup"]),
+            "prediction": MatchupScorer.mirror(analysis["prediction"]),
+            "damage": damage,
+            "errors": swap_keys(analysis["errors"]),
+        }
+
+    @staticmethod
+    def _reorder_analysis(analysis: Dict[str, Any], order1: List[int], order2: List[int]) -> Dict[str, Any]:
+        """Get matchup analysis with each team's members reordered from an existing analysis.
+
+        order1[i] is the existing position of the team 1 member that goes
+        i-th, and likewise for order2. Every member has data, so the per-member
+        lists line up with the teams.
+        """
+
+        def take(items: List[Any], order: List[int]) -> List[Any]:
+            return [items[i] for i in order]
+
+        def by_keys(data: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
+            return {key: data[key] for key in dict.fromkeys(keys) if key in data}
+
+        teams, type_matchup, damage = {}, dict(analysis["type_matchup"]), dict(analysis["damage"])
+        names = {}
+        for team, order in (("team1", order1), ("team2", order2)):
+            members = analysis[team]
+            teams[team] = {
+                **members,
+                "pokemon": take(members["pokemon"], order),
+                "roles": take(members["roles"], order),
+                "team_types": take(members["team_types"], order),
+            }
+            names[team] = [p["name"] for p in teams[team]["pokemon"]]
+            types = take(type_matchup[f"{team}_types"], order)
+            type_matchup[f"{team}_types"] = types
+            type_matchup[f"{team}_defensive_profiles"] = by_keys(
+                type_matchup[f"{team}_defensive_profiles"], [str(t) for t in types]
+            )
+
+        for attackers, defenders in (("team1", "team2"), ("team2", "team1")):
+            table = damage[f"{attackers}_to_{defenders}"]
+            damage[f"{attackers}_to_{defenders}"] = {
+                attacker: by_keys(table[attacker], names[defenders])
+                for attacker in dict.fromkeys(names[attackers])
+                if attacker in table
+            }
+
+        return {
+            **analysis,
+            **teams,
+            "type_matchup": type_matchup,
+            "prediction": MatchupScorer.reorder(analysis["prediction"], order1, order2),
+            "damage": damage,
+        }
+
+    def _analyze_matchup(
+        self,
+        team1_data: List[Dict[str, Any]],
+        team2_data: List[Dict[str, Any]],
+        format: str,
+        scoring_priority: str,
+    ) -> Dict[str, Any]:
+        """Assemble matchup analysis data from both teams' Pokemon data."""
+        # Get type data for matchup analysis
+        team1_types = [p["types"] for p in team1_data if "types" in p]
+        team2_types = [p["types"] for p in team2_data if "types" in p]
+        type_matchup = self.type_calculator.for_format(format).analyze_team_types(team1_types, team2_types)
+
+        # Get meta context data
+        meta_data = self._get_meta_context(format)
+
+        return {
+            "team1": {"pokemon": team1_data, "roles": self._get_team_roles(team1_data), "team_types": team1_types},
+            "team2": {"pokemon": team2_data, "roles": self._get_team_roles(team2_data), "team_types": team2_types},
+            "type_matchup": type_matchup,
+            "prediction": self.matchup_scorer.score(team1_data, team2_data, format, scoring_priority),
+            "damage": self.damage_calculator.calculate(team1_data, team2_data, format),
+            "meta_context": meta_data,
+            "format_info": self._get_format_data(format),
+            "scoring_priority": scoring_priority,
+            # Members that failed to load are left out of the analysis and listed here
+            "errors": {
+                "team1": [p for p in team1_data if "error" in p],
+                "team2": [p for p in team2_data if "error" in p],
+            },
+        }
 
     def _get_team_roles(self, team_data: List[Dict[str, Any]]) -> List[str]:
-        """Get typical roles based on stats and movesets."""
+        """Get typical roles based on stats and movesets.
+
+        A Pokemon is fast when it outspeeds at least FAST_PERCENTILE of the
+        speed tier field at max speed investment, or when its base speed is
+        over 100 if the field is empty.
+        """
         roles = []
         for pokemon in team_data:
             if "stats" not in pokemon:
                 continue
 
             stats = pokemon["stats"]
+            percentile = self.speed_tiers.rank(stats.get("speed", 1), limit=0, name=pokemon.get("name"))["percentile"]
+            fast = stats.get("speed", 1) > 100 if percentile is None else percentile >= FAST_PERCENTILE
             if stats.get("attack", 0) > stats.get("special-attack", 0):
-                if stats.get("speed", 0) > 100:
+                if fast:
                     roles.append("physical_sweeper")
                 else:
                     roles.append("physical_attacker")
             else:
-                if stats.get("speed", 0) > 100:
+                if fast:
                     roles.append("special_sweeper")
                 else:
                     roles.append("special_attacker")
@@ -107,21 +306,9 @@ class BattleAnalyzer:
                 {"pokemon": "Toxapex", "usage": 19.8, "common_moves": ["Scald", "Toxic"]},
             ],
             "meta_styles": {"hyper_offense": 35, "balance": 40, "stall": 25},
-            "speed_control": {"trick_room": 15, "tailwind": 20, "priority": 30, "natural_speed": 35},
+            "speed_control": self.speed_tiers.summary(),
         }
 
     def _get_format_data(self, format: str) -> Dict[str, Any]:
         """Get format-specific data."""
-        format_data = {
-            "OU": {
-                "name": "OverUsed",
-                "level_cap": 100,
-                "clauses": ["Sleep Clause", "Species Clause", "OHKO Clause", "Evasion Clause", "Endless Battle Clause"],
-            },
-            "UU": {
-                "name": "UnderUsed",
-                "level_cap": 100,
-                "clauses": ["Sleep Clause", "Species Clause", "OHKO Clause", "Evasion Clause", "Endless Battle Clause"],
-            },
-        }
-        return format_data.get(format.upper(), {"name": format, "description": "Custom format"})
+        return self.reference_data.get_format(format)
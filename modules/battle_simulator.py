@@ -0,0 +1,335 @@
+"""
+Battle simulator module that estimates win probabilities with Monte Carlo games.
+
+Benchmark games per second for different worker counts with:
+
+    python -m modules.battle_simulator --games 20000 --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from modules.damage_calculator import ROLLS, DamageCalculator
+
+DEFAULT_WORKERS = int(os.getenv("POKEMON_SIM_WORKERS", "0")) or os.cpu_count() or 1
+MAX_GAMES = 100000
+TURN_LIMIT = 200
+CRIT_CHANCE = 1 / 24
+CRIT_MULTIPLIER = 1.5
+
+# Games per work unit; each chunk has its own seed, so results do not depend on the worker count
+CHUNK_SIZE = 250
+
+
+def _simulate_chunk(battle: Dict[str, Any], games: int, seed: int) -> Dict[str, Any]:
+    """Play games of a prepared battle and return summed results.
+
+    Each side leads with its first member and attacks the opposing active
+    Pokemon with its best move against it, which may miss or crit. The faster
+    side moves first and a KO'd Pokemon does not move that turn. A fainted
+    Pokemon is replaced by the remaining member with the best matchup value
+    against the opposing active.
+    """
+    rng = random.Random(seed)
+    hp = battle["hp"]
+    speed = battle["speed"]
+    rolls = battle["rolls"]
+    accuracy = battle["accuracy"]
+    crit_chance = battle["crit_chance"]
+    value = battle["value"]
+    sizes = (len(hp[0]), len(hp[1]))
+
+    wins = [0, 0, 0]
+    turns = 0
+    kos = [[0] * sizes[0], [0] * sizes[1]]
+    damage = [[0.0] * sizes[0], [0.0] * sizes[1]]
+    survived = [[0] * sizes[0], [0] * sizes[1]]
+
+    for _ in range(games):
+        current = [list(hp[0]), list(hp[1])]
+        alive = [set(range(sizes[0])), set(range(sizes[1]))]
+        active = [0, 0]
+        turn = 0
+        while alive[0] and alive[1] and turn < TURN_LIMIT:
+            turn += 1
+            a, b = active
+            if speed[0][a] != speed[1][b]:
+                first = 0 if speed[0][a] > speed[1][b] else 1
+            else:
+                first = rng.randrange(2)
+
+            for side in (first, 1 - first):
+                other = 1 - side
+                attacker, defender = active[side], active[other]
+                if current[side][attacker] <= 0 or rng.random() >= accuracy[side][attacker][defender]:
+                    continue
+                hit = rng.choice(rolls[side][attacker][defender])
+                if rng.random() < crit_chance[side][attacker][defender]:
+                    hit = int(hit * CRIT_MULTIPLIER)
+                hit = min(hit, current[other][defender])
+                current[other][defender] -= hit
+                damage[side][attacker] += hit / hp[other][defender]
+                if current[other][defender] <= 0:
+                    kos[side][attacker] += 1
+                    alive[other].discard(defender)
+
+            for side in (0, 1):
+                if current[side][active[side]] <= 0 and alive[side]:
+                    opponent = active[1 - side]
+                    active[side] = max(sorted(alive[side]), key=lambda m: value[side][m][opponent])
+
+        turns += turn
+        if alive[0] and not alive[1]:
+            wins[0] += 1
+        elif alive[1] and not alive[0]:
+            wins[1] += 1
+        else:
+            wins[2] += 1
+        for side in (0, 1):
+            for member in alive[side]:
+                survived[side][member] += 1
+
+    return {"games": games, "wins": wins, "turns": turns, "kos": kos, "damage": damage, "survived": survived}
+
+
+def _wilson_interval(successes: int, trials: int, z: float = 1.96) -> List[float]:
+    """Get the 95% Wilson score interval of a success rate."""
+    if not trials:
+        return [0.0, 1.0]
+    rate = successes / trials
+    center = (rate + z * z / (2 * trials)) / (1 + z * z / trials)
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / (1 + z * z / trials)
+    return [round(max(center - margin, 0.0), 4), round(min(center + margin, 1.0), 4)]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_simulation_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool for simulations, started on first use.
+
+    Spawned workers re-import the main script, so a script that simulates
+    more than CHUNK_SIZE games must start its work under an
+    `if __name__ == "__main__":` guard, or the workers re-run it and fail
+    with multiprocessing's "bootstrapping phase" RuntimeError. Keep that
+    script light too: everything it imports at module level is imported
+    again by every worker.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn keeps worker processes independent of the server's threads and sockets
+                _pool = ProcessPoolExecutor(max_workers=DEFAULT_WORKERS, mp_context=get_context("spawn"))
+    return _pool
+
+
+def shutdown_simulation_pool() -> None:
+    """Shut down the shared simulation pool, e.g. on server shutdown. The next simulation starts a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class BattleSimulator:
+    """Estimates matchup win rates by simulating simplified 6v6 games.
+
+    Damage rolls, HP and speed come from the damage calculator, so each
+    simulated turn is only a table lookup and a random roll. Games are split
+    into fixed-size seeded chunks and spread over a process pool, so a given
+    seed always gives the same result however many workers run it.
+    """
+
+    def __init__(self):
+        """Initialize with a damage calculator."""
+        self.damage_calculator = DamageCalculator()
+
+    def prepare(
+        self, team1_data: List[Dict[str, Any]], team2_data: List[Dict[str, Any]], format: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Precompute HP, speed, best-move damage rolls, hit and crit chances and switch-in values for both teams."""
+        matchup = self.damage_calculator.matchup_rolls(team1_data, team2_data, format)
+        teams = (matchup["team1"], matchup["team2"])
+        stats = (matchup["team1_stats"], matchup["team2_stats"])
+
+        rolls, accuracy, crit_chance, mean = [], [], [], []
+        for side, key in enumerate(("team1_rolls", "team2_rolls")):
+            side_rolls = matchup[key]
+            best = self.damage_calculator.best_moves(teams[side], side_rolls)
+            # Members without known moves deal no damage
+            damage = np.zeros(best.shape + (len(ROLLS),), dtype=np.int64)
+            hit_chance = np.ones(best.shape)
+            # Rolls of moves that always crit already include the crit
+            crit = np.full(best.shape, CRIT_CHANCE)
+            known = best >= 0
+            damage[known] = side_rolls["damage"][best[known], np.nonzero(known)[1]]
+            hit_chance[known] = side_rolls["accuracy"][best[known]]
+            crit[known] = np.where(teams[side]["move_crit"][best[known]], 0.0, CRIT_CHANCE)
+            rolls.append(damage.tolist())
+            accuracy.append(hit_chance.tolist())
+            crit_chance.append(crit.tolist())
+            mean.append(damage.mean(axis=2) * hit_chance / np.maximum(stats[1 - side][:, 0], 1))
+
+        # Switch-in value: share of the opponent's HP dealt per turn minus share of own HP taken
+        value = [(mean[0] - mean[1].T).tolist(), (mean[1] - mean[0].T).tolist()]
+        return {
+            "names": [teams[0]["names"], teams[1]["names"]],
+            "hp": [stats[0][:, 0].tolist(), stats[1][:, 0].tolist()],
+            "speed": [stats[0][:, 5].tolist(), stats[1][:, 5].tolist()],
+            "rolls": rolls,
+            "accuracy": accuracy,
+            "crit_chance": crit_chance,
+            "value": value,
+        }
+
+    @staticmethod
+    def _chunks(games: int, seed: int) -> List[List[int]]:
+        """Split games into (games, seed) work units derived from one seed."""
+        counts = [CHUNK_SIZE] * (games // CHUNK_SIZE) + ([games % CHUNK_SIZE] if games % CHUNK_SIZE else [])
+        seeds = np.random.SeedSequence(seed).generate_state(len(counts)).tolist()
+        return [[count, chunk_seed] for count, chunk_seed in zip(counts, seeds)]
+
+    def _summarize(self, battle: Dict[str, Any], results: List[Dict[str, Any]], seed: int, elapsed: float):
+        """Merge chunk results into win rates, confidence intervals and per-member stats."""
+        games = sum(r["games"] for r in results)
+        wins = [sum(r["wins"][i] for r in results) for i in range(3)]
+        members, mvp = {}, {}
+        for side, team in enumerate(("team1", "team2")):
+            members[team] = {
+                name: {
+                    "kos_per_game": round(sum(r["kos"][side][m] for r in results) / games, 3),
+                    "damage_per_game": round(sum(r["damage"][side][m] for r in results) / games, 3),
+                    "survival_rate": round(sum(r["survived"][side][m] for r in results) / games, 3),
+                }
+                for m, name in enumerate(battle["names"][side])
+            }
+            if members[team]:
+                mvp[team] = max(
+                    members[team], key=lambda n: (members[team][n]["kos_per_game"], members[team][n]["damage_per_game"])
+                )
+
+        return {
+            "games": games,
+            "seed": seed,
+            "team1_win_rate": round(wins[0] / games, 4),
+            "team2_win_rate": round(wins[1] / games, 4),
+            "draw_rate": round(wins[2] / games, 4),
+            "team1_win_rate_ci95": _wilson_interval(wins[0], games),
+            "team2_win_rate_ci95": _wilson_interval(wins[1], games),
+            "average_turns": round(sum(r["turns"] for r in results) / games, 1),
+            "members": members,
+            "mvp": mvp,
+            "games_per_second": round(games / elapsed) if elapsed > 0 else None,
+        }
+
+    def _start(
+        self,
+        team1_data: List[Dict[str, Any]],
+        team2_data: List[Dict[str, Any]],
+        games: int,
+        format: Optional[str],
+        seed: int,
+        pool: Optional[ProcessPoolExecutor],
+    ) -> Dict[str, Any]:
+        """Prepare a battle and start playing its seeded chunks of games.
+
+        Returns the battle, one future per chunk and the start time, or an
+        error if a team has no Pokemon with data. A single chunk is played
+        right here rather than on the pool.
+        """
+        games = max(1, min(games, MAX_GAMES))
+        battle = self.prepare(team1_data, team2_data, format)
+        if not battle["names"][0] or not battle["names"][1]:
+            return {"error": "Both teams need at least one Pokemon with data to simulate"}
+
+        start = time.perf_counter()
+        chunks = self._chunks(games, seed)
+        if len(chunks) == 1:
+            future = Future()
+            future.set_result(_simulate_chunk(battle, *chunks[0]))
+            futures = [future]
+        else:
+            pool = pool or get_simulation_pool()
+            futures = [pool.submit(_simulate_chunk, battle, *chunk) for chunk in chunks]
+        return {"battle": battle, "futures": futures, "seed": seed, "start": start}
+
+    def simulate(
+        self,
+        team1_data: List[Dict[str, Any]],
+        team2_data: List[Dict[str, Any]],
+        games: int,
+        format: Optional[str] = None,
+        seed: int = 0,
+        pool: Optional[ProcessPoolExecutor] = None,
+    ) -> Dict[str, Any]:
+        """Simulate games between two teams of Pokemon data dicts on the process pool."""
+        run = self._start(team1_data, team2_data, games, format, seed, pool)
+        if "error" in run:
+            return run
+        results = [future.result() for future in run["futures"]]
+        return self._summarize(run["battle"], results, seed, time.perf_counter() - run["start"])
+
+    async def simulate_async(
+        self,
+        team1_data: List[Dict[str, Any]],
+        team2_data: List[Dict[str, Any]],
+        games: int,
+        format: Optional[str] = None,
+        seed: int = 0,
+        pool: Optional[ProcessPoolExecutor] = None,
+    ) -> Dict[str, Any]:
+        """Simulate games on the process pool without blocking the event loop."""
+        run = self._start(team1_data, team2_data, games, format, seed, pool)
+        if "error" in run:
+            return run
+        results = await asyncio.gather(*(asyncio.wrap_future(future) for future in run["futures"]))
+        return self._summarize(run["battle"], list(results), seed, time.perf_counter() - run["start"])
+
+
+def main():
+    """Benchmark simulation throughput on cached Pokemon for several worker counts."""
+    from modules.battle_analyzer import BattleAnalyzer
+
+    parser = argparse.ArgumentParser(description="Benchmark Monte Carlo battle simulation throughput.")
+    parser.add_argument(
+        "--team1", nargs="+", default=["garchomp", "zapdos", "ferrothorn", "swampert", "charizard", "tyranitar"]
+    )
+    parser.add_argument(
+        "--team2", nargs="+", default=["excadrill", "pelipper", "barraskewda", "garchomp", "zapdos", "ferrothorn"]
+    )
+    parser.add_argument("--games", type=int, default=20000, help="Games per run")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, DEFAULT_WORKERS], help="Worker counts to compare")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    analyzer = BattleAnalyzer()
+    team1 = [analyzer.fetch_pokemon_data(name) for name in args.team1]
+    team2 = [analyzer.fetch_pokemon_data(name) for name in args.team2]
+    simulator = BattleSimulator()
+
+    for workers in dict.fromkeys(args.workers):
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            # Warm up the workers so process start-up is not counted
+            list(pool.map(abs, range(workers)))
+            result = simulator.simulate(team1, team2, args.games, seed=args.seed, pool=pool)
+        print(
+            f"workers={workers}: {result['games_per_second']} games/s, "
+            f"team1 win rate {result['team1_win_rate']} {result['team1_win_rate_ci95']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
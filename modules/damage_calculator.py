@@ -0,0 +1,247 @@
+"""
+Damage calculator module that computes damage ranges and KO chances between teams.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.projections import STAT_NAMES
+from utils.reference_data import ReferenceDataMixin
+from utils.type_calculator import COMBO_INDEX, NO_TYPE, TYPE_IDS, TypeCalculator
+
+# The 16 damage rolls, 85% to 100%
+ROLLS = np.arange(85, 101, dtype=np.int64)
+
+# 31 IVs, no EVs and a neutral nature
+NEUTRAL_SPREAD: Dict[str, Any] = {"ivs": {}, "evs": {}, "nature": {}}
+
+# Critical hits multiply damage by 1.5 before the random roll
+CRIT_MULTIPLIER = 1.5
+
+
+class DamageCalculator(ReferenceDataMixin):
+    """Computes damage rolls for every attacker move against every defender at once.
+
+    Implements the standard damage formula with level, base power, attacking
+    and defending stats, the 16 random rolls, STAB and the type multiplier
+    from the format's chart. KO chances and best move choices account for
+    accuracy. Random crits, abilities, items, weather and other field effects
+    are not modelled. Moves come from the curated move_data.json, which lists
+    common fixed-power damaging moves and leaves out recharge, charge-turn,
+    self-KO, multi-hit, first-turn-only and variable-power moves such as
+    Eruption. Return and Frustration are listed at the 102 power competitive
+    sets run them at. A move entry may override the stat it attacks with
+    ("attack_stat"), whose stat that is ("attack_stat_source": "target" for
+    Foul Play), the stat it hits ("defense_stat") and whether it always crits
+    ("always_crit").
+    """
+
+    @staticmethod
+    def calc_stats(base_stats: np.ndarray, level: int, spread: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """Compute actual stats from an (N x 6) base stat array, a level and an EV/IV/nature spread.
+
+        spread has optional "evs" and "ivs" dicts keyed by stat name and a
+        "nature" dict with the "plus" and "minus" stat names.
+        """
+        spread = spread or NEUTRAL_SPREAD
+        ivs = np.array([spread.get("ivs", {}).get(stat, 31) for stat in STAT_NAMES], dtype=np.int64)
+        evs = np.array([spread.get("evs", {}).get(stat, 0) for stat in STAT_NAMES], dtype=np.int64)
+        nature = np.ones(len(STAT_NAMES))
+        if spread.get("nature", {}).get("plus") in STAT_NAMES[1:]:
+            nature[STAT_NAMES.index(spread["nature"]["plus"])] += 0.1
+        if spread.get("nature", {}).get("minus") in STAT_NAMES[1:]:
+            nature[STAT_NAMES.index(spread["nature"]["minus"])] -= 0.1
+
+        core = (2 * base_stats.astype(np.int64) + ivs + evs // 4) * level // 100
+        stats = np.floor((core + 5) * nature).astype(np.int64)
+        stats[:, 0] = core[:, 0] + level + 10
+        return stats
+
+    def _encode(self, team: List[Dict[str, Any]], format: Optional[str] = None) -> Dict[str, Any]:
+        """Get names, base stats, type ids and known damaging moves of a team's valid members.
+
+        Types are encoded as of the format's generation chart.
+        """
+        members = [p for p in team if "types" in p and "stats" in p]
+        moves = self.reference_data.moves
+        calculator = self.type_calculator.for_format(format)
+        types = np.full((len(members), 2), NO_TYPE, dtype=np.intp)
+        for m, pokemon in enumerate(members):
+            first, second = calculator.encode_chart_types(pokemon["types"])
+            types[m] = (first, NO_TYPE if second == first else second)
+
+        # Cached movelists hold move names or {"name": ...} dicts
+        movelists = [[m["name"] if isinstance(m, dict) else m for m in p.get("moves", [])] for p in members]
+        rows = [
+            (m, name, moves[name])
+            for m, movelist in enumerate(movelists)
+            for name in dict.fromkeys(movelist)
+            if name in moves and moves[name]["type"] in TYPE_IDS
+        ]
+        return {
+            "names": [p["name"] for p in members],
+            "base_stats": np.array([[p["stats"].get(s, 1) for s in STAT_NAMES] for p in members], dtype=np.int64),
+            "types": types,
+            "move_attacker": np.array([m for m, _, _ in rows], dtype=np.intp),
+            "move_names": [name for _, name, _ in rows],
+            "move_power": np.array([move["power"] for _, _, move in rows], dtype=np.int64),
+            "move_type": np.array([TYPE_IDS[move["type"]] for _, _, move in rows], dtype=np.intp),
+            "move_attack_stat": np.array([self._attack_stat(move) for _, _, move in rows], dtype=np.intp),
+            "move_attack_target": np.array([move.get("attack_stat_source") == "target" for _, _, move in rows], bool),
+            "move_defense_stat": np.array([self._defense_stat(move) for _, _, move in rows], dtype=np.intp),
+            "move_crit": np.array([move.get("always_crit", False) for _, _, move in rows], dtype=bool),
+            # Moves that never miss have no accuracy
+            "move_accuracy": np.array([(move.get("accuracy") or 100) / 100 for _, _, move in rows], dtype=float),
+        }
+
+    @staticmethod
+    def _attack_stat(move: Dict[str, Any]) -> int:
+        """Get the stat column a move attacks with: its override or its category's attacking stat."""
+        default = "attack" if move["category"] == "physical" else "special-attack"
+        return STAT_NAMES.index(move.get("attack_stat", default))
+
+    @staticmethod
+    def _defense_stat(move: Dict[str, Any]) -> int:
+        """Get the stat column a move hits: its override or its category's defending stat."""
+        default = "defense" if move["category"] == "physical" else "special-defense"
+        return STAT_NAMES.index(move.get("defense_stat", default))
+
+    def damage_rolls(
+        self,
+        attackers: Dict[str, Any],
+        defenders: Dict[str, Any],
+        calculator: TypeCalculator,
+        level: int,
+        attacker_spread: Optional[Dict[str, Any]] = None,
+        defender_spread: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Compute (moves x defenders x 16) damage rolls and per-move KO chances for encoded teams.
+
+        Damage rolls are for a hit; OHKO and 2HKO chances include the chance
+        that the move misses.
+        """
+        attack_stats = self.calc_stats(attackers["base_stats"].reshape(-1, 6), level, attacker_spread)
+        defense_stats = self.calc_stats(defenders["base_stats"].reshape(-1, 6), level, defender_spread)
+        hp = defense_stats[:, 0]
+        attacker = attackers["move_attacker"]
+        attack_stat = attackers["move_attack_stat"]
+
+        attack = np.where(
+            attackers["move_attack_target"][:, np.newaxis],
+            defense_stats[:, attack_stat].T,
+            attack_stats[attacker, attack_stat][:, np.newaxis],
+        )
+        defense = defense_stats[:, attackers["move_defense_stat"]].T
+        base = (2 * level // 5 + 2) * attackers["move_power"][:, np.newaxis] * attack // defense // 50 + 2
+        base = np.where(attackers["move_crit"][:, np.newaxis], np.floor(base * CRIT_MULTIPLIER).astype(np.int64), base)
+
+        damage = base[:, :, np.newaxis] * ROLLS // 100
+        stab = (attackers["types"][attacker] == attackers["move_type"][:, np.newaxis]).any(axis=1)
+        # STAB rounds halves down, like the games
+        damage = np.where(stab[:, np.newaxis, np.newaxis], np.ceil(damage * 1.5 - 0.5), damage)
+
+        combos = COMBO_INDEX[defenders["types"][:, 0], defenders["types"][:, 1]]
+        effectiveness = calculator.profiles[combos[np.newaxis, :], attackers["move_type"][:, np.newaxis]]
+        damage = np.floor(damage * effectiveness[:, :, np.newaxis]).astype(np.int64)
+        damage = np.where(effectiveness[:, :, np.newaxis] > 0, np.maximum(damage, 1), 0)
+
+        two_hits = damage[:, :, :, np.newaxis] + damage[:, :, np.newaxis, :]
+        ohko = (damage >= hp[:, np.newaxis]).mean(axis=2)
+        twohko = (two_hits >= hp[:, np.newaxis, np.newaxis]).mean(axis=(2, 3))
+        accuracy = attackers["move_accuracy"][:, np.newaxis]
+        return {
+            "damage": damage,
+            "hp": hp,
+            "effectiveness": effectiveness,
+            "accuracy": attackers["move_accuracy"],
+            "ohko": accuracy * ohko,
+            # Both attempts hit, or exactly one hits and that hit is a KO
+            "twohko": accuracy**2 * twohko + 2 * accuracy * (1 - accuracy) * ohko,
+        }
+
+    @staticmethod
+    def best_moves(attackers: Dict[str, Any], rolls: Dict[str, np.ndarray]) -> np.ndarray:
+        """Get the (attackers x defenders) move row with the highest expected damage, or -1 for no known moves."""
+        mean_damage = rolls["damage"].mean(axis=2) * rolls["accuracy"][:, np.newaxis]
+        best = np.full((len(attackers["names"]), len(rolls["hp"])), -1, dtype=np.intp)
+        for a in range(len(attackers["names"])):
+            moves = np.flatnonzero(attackers["move_attacker"] == a)
+            if len(moves):
+                best[a] = moves[mean_damage[moves].argmax(axis=0)]
+        return best
+
+    def _summarize(
+        self, attackers: Dict[str, Any], defenders: Dict[str, Any], rolls: Dict[str, np.ndarray]
+    ) -> Dict[str, Any]:
+        """Summarize the highest expected damage move of each attacker against each defender."""
+        best_moves = self.best_moves(attackers, rolls)
+        hp = rolls["hp"]
+        table = {}
+        for a, name in enumerate(attackers["names"]):
+            best = best_moves[a]
+            if len(best) and best[0] < 0:
+                continue
+            table[name] = {
+                defender: {
+                    "move": attackers["move_names"][best[d]],
+                    "effectiveness": float(rolls["effectiveness"][best[d], d]),
+                    "accuracy": float(rolls["accuracy"][best[d]]),
+                    "min_percent": round(float(rolls["damage"][best[d], d, 0] / hp[d] * 100), 1),
+                    "max_percent": round(float(rolls["damage"][best[d], d, -1] / hp[d] * 100), 1),
+                    "ohko_chance": round(float(rolls["ohko"][best[d], d]), 3),
+                    "twohko_chance": round(float(rolls["twohko"][best[d], d]), 3),
+                }
+                for d, defender in enumerate(defenders["names"])
+            }
+        return table
+
+    def matchup_rolls(
+        self,
+        team1_data: List[Dict[str, Any]],
+        team2_data: List[Dict[str, Any]],
+        format: Optional[str] = None,
+        level: Optional[int] = None,
+        team1_spread: Optional[Dict[str, Any]] = None,
+        team2_spread: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Encode both teams and compute damage rolls both ways.
+
+        The level defaults to the format's level cap. Spreads apply to every
+        member of a team and default to 31 IVs, no EVs and a neutral nature.
+        """
+        calculator = self.type_calculator.for_format(format)
+        level = level or self.reference_data.get_format(format or "").get("level_cap", 100)
+        team1, team2 = self._encode(team1_data, format), self._encode(team2_data, format)
+        return {
+            "level": level,
+            "team1": team1,
+            "team2": team2,
+            "team1_stats": self.calc_stats(team1["base_stats"].reshape(-1, 6), level, team1_spread),
+            "team2_stats": self.calc_stats(team2["base_stats"].reshape(-1, 6), level, team2_spread),
+            "team1_rolls": self.damage_rolls(team1, team2, calculator, level, team1_spread, team2_spread),
+            "team2_rolls": self.damage_rolls(team2, team1, calculator, level, team2_spread, team1_spread),
+        }
+
+    def calculate(
+        self,
+        team1_data: List[Dict[str, Any]],
+        team2_data: List[Dict[str, Any]],
+        format: Optional[str] = None,
+        level: Optional[int] = None,
+        team1_spread: Optional[Dict[str, Any]] = None,
+        team2_spread: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Get each member's best move, damage range and KO chances against every opposing member, both ways.
+
+        The level defaults to the format's level cap. Spreads apply to every
+        member of a team and default to 31 IVs, no EVs and a neutral nature.
+        """
+        matchup = self.matchup_rolls(team1_data, team2_data, format, level, team1_spread, team2_spread)
+        team1, team2 = matchup["team1"], matchup["team2"]
+        return {
+            "level": matchup["level"],
+            "team1_to_team2": self._summarize(team1, team2, matchup["team1_rolls"]),
+            "team2_to_team1": self._summarize(team2, team1, matchup["team2_rolls"]),
+            "moves_considered": {"team1": len(team1["move_names"]), "team2": len(team2["move_names"])},
+        }
@@ -0,0 +1,143 @@
+"""
+Evolution index module that resolves a species to its full evolution line.
+"""
+
+import threading
+from array import array
+from typing import Any, Dict, List, Optional
+
+from utils.local_mirror import LocalMirror
+from utils.projections import id_from_url
+
+
+def _evolution_method(details: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Summarize how a species evolves from its parent: trigger plus any set conditions."""
+    if not details:
+        return None
+    method = {}
+    for key, value in details[0].items():
+        if value in (None, False, "") or key == "trigger":
+            continue
+        method[key] = value["name"] if isinstance(value, dict) and "name" in value else value
+    return {"trigger": (details[0].get("trigger") or {}).get("name"), **method}
+
+
+class EvolutionIndex:
+    """Evolution graph over all known species.
+
+    Species are numbered densely; parent pointers, depths and chain ids live in
+    flat int arrays and children in per-species adjacency lists, so a full line
+    is recovered by walking at most the length of its chain.
+    """
+
+    def __init__(self, mirror: Optional[LocalMirror] = None):
+        """Initialize with an optional mirror to build from. The index is built on first use."""
+        self.mirror = mirror
+        self.names: List[str] = []
+        self.species_ids = array("i")
+        self.parent = array("i")
+        self.depth = array("i")
+        self.chain_ids = array("i")
+        self.children: List[List[int]] = []
+        self.methods: List[Optional[Dict[str, Any]]] = []
+        self._by_name: Dict[str, int] = {}
+        self._by_id: Dict[int, int] = {}
+        self._built = False
+        self._lock = threading.Lock()
+
+    @property
+    def complete(self) -> bool:
+        """Whether every chain was loaded from the mirror."""
+        return self._built and self.mirror is not None and self.mirror.count("evolution-chain") > 0
+
+    def ensure_built(self) -> None:
+        """Load all evolution chains from the mirror if not done yet."""
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    if self.mirror is not None:
+                        for chain in self.mirror.iter_resource("evolution-chain"):
+                            self.add_chain(chain)
+                    self._built = True
+
+    def add_chain(self, chain: Dict[str, Any]) -> None:
+        """Add one PokeAPI evolution-chain payload to the graph."""
+        if chain["chain"]["species"]["name"] in self._by_name:
+            return
+        stack = [(chain["chain"], -1, 0)]
+        while stack:
+            link, parent, depth = stack.pop()
+            index = self._add_species(link, parent, depth, chain["id"])
+            stack.extend((child, index, depth + 1) for child in reversed(link.get("evolves_to", [])))
+
+    def _add_species(self, link: Dict[str, Any], parent: int, depth: int, chain_id: int) -> int:
+        """Append one species node and link it to its parent."""
+        index = len(self.names)
+        name = link["species"]["name"]
+        species_id = id_from_url(link["species"]["url"]) or 0
+
+        self.names.append(name)
+        self.species_ids.append(species_id)
+        self.parent.append(parent)
+        self.depth.append(depth)
+        self.chain_ids.append(chain_id)
+        self.children.append([])
+        self.methods.append(_evolution_method(link.get("evolution_details", [])))
+        if parent >= 0:
+            self.children[parent].append(index)
+
+        self._by_name[name] = index
+        self._by_id[species_id] = index
+        return index
+
+    def find(self, species: str) -> Optional[int]:
+        """Get the node index of a species by name or national dex id."""
+        species = str(species).lower()
+        if species.isdigit():
+            return self._by_id.get(int(species))
+        return self._by_name.get(species)
+
+    def lookup(self, species: str) -> Optional[Dict[str, Any]]:
+        """Get the full evolution line of a species, or None if it is not indexed."""
+        index = self.find(species)
+        if index is None:
+            return None
+
+        pre_evolutions = []
+        node = self.parent[index]
+        while node >= 0:
+            pre_evolutions.append(node)
+            node = self.parent[node]
+        root = pre_evolutions[-1] if pre_evolutions else index
+
+        line = self._subtree(root)
+        post_evolutions = self._subtree(index)[1:]
+
+        return {
+            "species": self.names[index],
+            "chain_id": self.chain_ids[index],
+            "stage": self.depth[index] + 1,
+            "is_fully_evolved": not self.children[index],
+            "is_branching": any(len(self.children[node]) > 1 for node in line),
+            "pre_evolutions": [self.names[node] for node in reversed(pre_evolutions)],
+            "evolutions": [self.names[node] for node in self.children[index]],
+            "all_post_evolutions": [self.names[node] for node in post_evolutions],
+            "line": [
+                {
+                    "species": self.names[node],
+                    "stage": self.depth[node] + 1,
+                    "evolves_from": self.names[self.parent[node]] if self.parent[node] >= 0 else None,
+                    "method": self.methods[node],
+                }
+                for node in line
+            ],
+        }
+
+    def _subtree(self, root: int) -> List[int]:
+        """Get root and all its descendants in depth-first order."""
+        nodes, stack = [], [root]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(reversed(self.children[node]))
+        return nodes
@@ -0,0 +1,224 @@
+"""
+Matchup scorer module that scores team matchups member against member.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.projections import STAT_NAMES
+from utils.reference_data import ReferenceDataMixin
+from utils.type_calculator import COMBO_INDEX, NO_TYPE
+
+MAX_TEAM_SIZE = 6
+
+# Weights of the (type advantage, speed, stat pressure) components per scoring priority
+PRIORITY_WEIGHTS = {
+    "overall": (0.4, 0.3, 0.3),
+    "type_advantage": (0.7, 0.15, 0.15),
+    "speed": (0.2, 0.6, 0.2),
+    "stats": (0.2, 0.2, 0.6),
+}
+
+# Scales that map each raw component difference onto roughly [-1, 1]
+TYPE_SCALE = 4.0  # log2 multiplier difference, e.g. 4x vs 0.25x is 4
+SPEED_SCALE = 20.0  # base speed points
+STAT_SCALE = 0.5  # log ratio of attacking stat to defending stat
+MIN_MULTIPLIER = 0.125  # immunities count as a very strong resistance when taking logs
+
+
+class MatchupScorer(ReferenceDataMixin):
+    """Scores team pairs from member-vs-member matrices computed with array ops.
+
+    Each member is encoded as a type id pair and a base stat row. For every
+    pair of opposing members the scorer compares best STAB type effectiveness
+    both ways, base speed and best attacking stat against the matching
+    defensive stat, then combines them with the scoring priority's weights.
+    Batches of team pairs are stacked along a leading axis and scored at once.
+    """
+
+    def encode_teams(
+        self, teams: Sequence[Sequence[Dict[str, Any]]], format: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Encode teams of Pokemon data dicts as (type ids, base stats, member mask) arrays.
+
+        Members without types or stats, such as failed fetches, are left out and
+        teams are padded to 6 members. Types are encoded as of the format's
+        generation chart.
+        """
+        calculator = self.type_calculator.for_format(format)
+        types = np.full((len(teams), MAX_TEAM_SIZE, 2), NO_TYPE, dtype=np.intp)
+        stats = np.ones((len(teams), MAX_TEAM_SIZE, len(STAT_NAMES)), dtype=np.float32)
+        mask = np.zeros((len(teams), MAX_TEAM_SIZE), dtype=bool)
+
+        for t, team in enumerate(teams):
+            members = [p for p in team if "types" in p and "stats" in p][:MAX_TEAM_SIZE]
+            for m, pokemon in enumerate(members):
+                first, second = calculator.encode_chart_types(pokemon["types"])
+                types[t, m] = (first, NO_TYPE if second == first else second)
+                stats[t, m] = [max(pokemon["stats"].get(stat, 1), 1) for stat in STAT_NAMES]
+                mask[t, m] = True
+        return types, stats, mask
+
+    def _offense(self, profiles: np.ndarray, attackers: np.ndarray, defenders: np.ndarray) -> np.ndarray:
+        """Get best STAB multipliers of each attacker against each defender as a (pairs x N x M) array."""
+        combos = COMBO_INDEX[defenders[..., 0], defenders[..., 1]][:, np.newaxis, :]
+        first = profiles[combos, attackers[:, :, np.newaxis, 0]]
+        second = profiles[combos, attackers[:, :, np.newaxis, 1]]
+        return np.maximum(first, second)
+
+    def score_batch(
+        self,
+        team1: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        team2: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        format: Optional[str] = None,
+        scoring_priority: str = "overall",
+    ) -> Dict[str, np.ndarray]:
+        """Score stacked team pairs encoded by encode_teams with the same format.
+
+        Returns (pairs x N x M) component and combined pair matrices, each
+        from team1's point of view, plus per-pair team scores in [-1, 1].
+        """
+        types1, stats1, mask1 = team1
+        types2, stats2, mask2 = team2
+        calculator = self.type_calculator.for_format(format)
+        weights = PRIORITY_WEIGHTS.get(scoring_priority, PRIORITY_WEIGHTS["overall"])
+
+        # Rows past the 171 combos are the neutral padding defender; the extra
+        # column is the NO_TYPE attacker, which deals nothing
+        profiles = np.ones((len(calculator.profiles) + 1, NO_TYPE + 1), dtype=np.float32)
+        profiles[:-1, :NO_TYPE] = calculator.profiles
+        profiles[:, NO_TYPE] = 0.0
+
+        offense = np.maximum(self._offense(profiles, types1, types2), MIN_MULTIPLIER)
+        defense = np.maximum(self._offense(profiles, types2, types1), MIN_MULTIPLIER).transpose(0, 2, 1)
+        type_score = np.clip((np.log2(offense) - np.log2(defense)) / TYPE_SCALE, -1, 1)
+
+        speed = stats1[:, :, np.newaxis, 5] - stats2[:, np.newaxis, :, 5]
+        speed_score = np.tanh(speed / SPEED_SCALE)
+
+        # Best of physical (attack vs defense) and special (sp. attack vs sp. defense) pressure each way
+        pressure1 = np.maximum(
+            stats1[:, :, np.newaxis, 1] / stats2[:, np.newaxis, :, 2],
+            stats1[:, :, np.newaxis, 3] / stats2[:, np.newaxis, :, 4],
+        )
+        pressure2 = np.maximum(
+            stats2[:, np.newaxis, :, 1] / stats1[:, :, np.newaxis, 2],
+            stats2[:, np.newaxis, :, 3] / stats1[:, :, np.newaxis, 4],
+        )
+        stat_score = np.tanh(np.log(pressure1 / pressure2) / STAT_SCALE)
+
+        pairs = weights[0] * type_score + weights[1] * speed_score + weights[2] * stat_score
+        valid = mask1[:, :, np.newaxis] & mask2[:, np.newaxis, :]
+        pairs = np.where(valid, pairs, 0.0)
+
+        # Each side's score is how well its best answer handles each opposing member, on average
+        answered1, answered2 = valid.any(axis=1), valid.any(axis=2)
+        best1 = np.where(answered1, np.where(valid, pairs, -np.inf).max(axis=1), 0)
+        best2 = np.where(answered2, np.where(valid, -pairs, -np.inf).max(axis=2), 0)
+        team1_score = best1.sum(axis=1) / np.maximum(answered1.sum(axis=1), 1)
+        team2_score = best2.sum(axis=1) / np.maximum(answered2.sum(axis=1), 1)
+
+        return {
+            "type": type_score,
+            "speed": speed_score,
+            "stats": stat_score,
+            "pairs": pairs,
+            "team1_score": team1_score,
+            "team2_score": team2_score,
+            "advantage": (team1_score - team2_score) / 2,
+        }
+
+    def score(
+        self,
+        team1_data: List[Dict[str, Any]],
+        team2_data: List[Dict[str, Any]],
+        format: Optional[str] = None,
+        scoring_priority: str = "overall",
+    ) -> Dict[str, Any]:
+        """Score one matchup between two teams of Pokemon data dicts."""
+        team1, team2 = self.encode_teams([team1_data], format), self.encode_teams([team2_data], format)
+        result = self.score_batch(team1, team2, format, scoring_priority)
+        names1 = [p["name"] for p in team1_data if "types" in p and "stats" in p][:MAX_TEAM_SIZE]
+        names2 = [p["name"] for p in team2_data if "types" in p and "stats" in p][:MAX_TEAM_SIZE]
+        n, m = len(names1), len(names2)
+
+        def matrix(name: str) -> List[List[float]]:
+            return np.round(result[name][0, :n, :m].astype(float), 3).tolist()
+
+        priority = scoring_priority if scoring_priority in PRIORITY_WEIGHTS else "overall"
+        advantage = float(result["advantage"][0])
+        pairs = result["pairs"][0, :n, :m]
+        return {
+            "scoring_priority": priority,
+            "weights": dict(zip(("type", "speed", "stats"), PRIORITY_WEIGHTS[priority])),
+            "team1_members": names1,
+            "team2_members": names2,
+            "pair_scores": matrix("pairs"),
+            "type_scores": matrix("type"),
+            "speed_scores": matrix("speed"),
+            "stat_scores": matrix("stats"),
+            "best_answers": {name: names1[int(np.argmax(pairs[:, j]))] for j, name in enumerate(names2)} if n else {},
+            "team1_score": round(float(result["team1_score"][0]), 3),
+            "team2_score": round(float(result["team2_score"][0]), 3),
+            "advantage": round(advantage, 3),
+            "team1_win_probability": round(1 / (1 + float(np.exp(-4 * advantage))), 3),
+            "favored": "team1" if advantage > 0.02 else "team2" if advantage < -0.02 else "even",
+        }
+
+    @staticmethod
+    def reorder(prediction: Dict[str, Any], order1: List[int], order2: List[int]) -> Dict[str, Any]:
+        """Get the result of score with each team's members reordered from an existing result.
+
+        order1[i] is the existing position of the team 1 member that goes
+        i-th, and likewise for order2.
+        """
+
+        def permute(matrix: List[List[float]]) -> List[List[float]]:
+            return [[matrix[i][j] for j in order2] for i in order1]
+
+        names2 = [prediction["team2_members"][j] for j in order2]
+        return {
+            **prediction,
+            "team1_members": [prediction["team1_members"][i] for i in order1],
+            "team2_members": names2,
+            "pair_scores": permute(prediction["pair_scores"]),
+            "type_scores": permute(prediction["type_scores"]),
+            "speed_scores": permute(prediction["speed_scores"]),
+            "stat_scores": permute(prediction["stat_scores"]),
+            "best_answers": {name: prediction["best_answers"][name] for name in names2},
+        }
+
+    @staticmethod
+    def mirror(prediction: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the result of score with the two teams swapped from an existing result.
+
+        Every component is antisymmetric, so swapped pair matrices are the
+        negated transposes and the team scores trade places.
+        """
+
+        def flip(matrix: List[List[float]]) -> List[List[float]]:
+            return [[0.0 - v for v in column] for column in zip(*matrix)]
+
+        pairs = flip(prediction["pair_scores"])
+        names1, names2 = prediction["team2_members"], prediction["team1_members"]
+        favored = {"team1": "team2", "team2": "team1"}.get(prediction["favored"], prediction["favored"])
+        return {
+            **prediction,
+            "team1_members": names1,
+            "team2_members": names2,
+            "pair_scores": pairs,
+            "type_scores": flip(prediction["type_scores"]),
+            "speed_scores": flip(prediction["speed_scores"]),
+            "stat_scores": flip(prediction["stat_scores"]),
+            "best_answers": (
+                {name: names1[max(range(len(names1)), key=lambda i: pairs[i][j])] for j, name in enumerate(names2)}
+                if names1
+                else {}
+            ),
+            "team1_score": prediction["team2_score"],
+            "team2_score": prediction["team1_score"],
+            "advantage": 0.0 - prediction["advantage"],
+            "team1_win_probability": round(1 - prediction["team1_win_probability"], 3),
+            "favored": favored,
+        }
@@ -0,0 +1,239 @@
+"""
+Pokedex index module that provides filtered, paginated Pokemon search without API calls.
+"""
+
+import base64
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.local_mirror import LocalMirror
+from utils.projections import STAT_NAMES, id_from_url
+
+ROMAN_NUMERALS = {"i": 1, "ii": 2, "iii": 3, "iv": 4, "v": 5, "vi": 6, "vii": 7, "viii": 8, "ix": 9, "x": 10}
+
+# Last national dex number of each generation
+GENERATION_ENDS = (151, 251, 386, 493, 649, 721, 809, 905, 1025)
+
+# Most results returned on one search page
+MAX_PAGE_SIZE = 100
+
+
+def parse_generation(generation: Union[int, str, None]) -> Optional[int]:
+    """Convert 4, '4', 'iv' or 'generation-iv' into a generation number."""
+    if generation is None or isinstance(generation, int):
+        return generation
+    value = str(generation).lower().replace("generation-", "").replace("gen", "").strip()
+    if value.isdigit():
+        return int(value)
+    if value in ROMAN_NUMERALS:
+        return ROMAN_NUMERALS[value]
+    raise ValueError(f"Unknown generation: {generation}")
+
+
+def page_bounds(limit: int, offset: int) -> Tuple[int, int]:
+    """Reject negative paging arguments and clamp limit to MAX_PAGE_SIZE."""
+    if limit < 0 or offset < 0:
+        raise ValueError(f"limit and offset must be non-negative integers, got {limit!r} and {offset!r}")
+    return min(limit, MAX_PAGE_SIZE), offset
+
+
+def generation_from_dex_number(dex_number: int) -> Optional[int]:
+    """Get the generation that introduced a national dex number, or None past the known dex."""
+    for generation, end in enumerate(GENERATION_ENDS, start=1):
+        if dex_number <= end:
+            return generation
+    return None
+
+
+class PokedexIndex:
+    """Columnar in-memory index of the national dex.
+
+    Built from the local PokeAPI mirror when one exists, otherwise from the
+    per-Pokemon module cache, and rebuilt when either changes. Filters are
+    evaluated as numpy masks over sorted id/type/generation/stat columns, and
+    pages are found by binary search on id.
+    """
+
+    def __init__(self, mirror: Optional[LocalMirror] = None, cache_dir: Optional[Path] = None):
+        """Initialize with data sources. The index is built on first use."""
+        self.mirror = mirror
+        self.cache_dir = cache_dir or Path(__file__).parent.parent / "data" / "cache"
+        self.source: Optional[str] = None
+        self._state: Optional[Tuple[Optional[int], Optional[int]]] = None
+        self._built = False
+        self._lock = threading.Lock()
+
+    @property
+    def complete(self) -> bool:
+        """Whether the index covers the full dex rather than just cached Pokemon."""
+        self.ensure_built()
+        return self.source == "mirror"
+
+    def _source_state(self) -> Tuple[Optional[int], Optional[int]]:
+        """Get the mirror database's and cache directory's mtimes, which change when either is written."""
+        states = []
+        for path in (self.mirror.db_path if self.mirror is not None else None, self.cache_dir):
+            try:
+                states.append(path.stat().st_mtime_ns if path is not None else None)
+            except OSError:
+                states.append(None)
+        return states[0], states[1]
+
+    def ensure_built(self) -> None:
+        """Build the index if it has not been built or its source has changed since."""
+        state = self._source_state()
+        if not self._built or state != self._state:
+            with self._lock:
+                if not self._built or state != self._state:
+                    if self._built and self.mirror is not None and state[0] != self._state[0]:
+                        # The mirror was re-imported; reopen it rather than read the replaced file
+                        self.mirror.close()
+                    self.build()
+                    self._state = state
+
+    def build(self) -> None:
+        """(Re)build the index from the best available source."""
+        if self.mirror is not None and self.mirror.count("pokemon"):
+            entries, self.source = list(self._entries_from_mirror()), "mirror"
+        else:
+            entries, self.source = list(self._entries_from_cache()), "cache"
+        self._load(entries)
+        self._built = True
+
+    def _entries_from_mirror(self) -> Iterator[Dict[str, Any]]:
+        """Read index entries from the local mirror's pokemon and species tables."""
+        generations = {
+            species["id"]: parse_generation(species["generation"]["name"])
+            for species in self.mirror.iter_resource("pokemon-species")
+        }
+        for pokemon in self.mirror.iter_resource("pokemon"):
+            yield {
+                "id": pokemon["id"],
+                "name": pokemon["name"],
+                "types": [t["type"]["name"] for t in sorted(pokemon["types"], key=lambda t: t["slot"])],
+                "stats": {s["stat"]["name"]: s["base_stat"] for s in pokemon["stats"]},
+                "generation": generations.get(id_from_url(pokemon["species"]["url"])),
+            }
+
+    def _entries_from_cache(self) -> Iterator[Dict[str, Any]]:
+        """Read index entries from the per-Pokemon module cache."""
+        for cache_file in self.cache_dir.glob("*.json"):
+            with open(cache_file, "r") as f:
+                data = json.load(f)
+            if "id" not in data or "stats" not in data:
+                continue
+            species = data.get("species_data") or data.get("species") or {}
+            if "generation" in species:
+                generation = parse_generation(species["generation"])
+            else:
+                generation = generation_from_dex_number(data["id"])
+            yield {
+                "id": data["id"],
+                "name": data["name"],
+                "types": data["types"],
+                "stats": data["stats"],
+                "generation": generation,
+            }
+
+    def _load(self, entries: List[Dict[str, Any]]) -> None:
+        """Pack entries into id-sorted columns."""
+        entries.sort(key=lambda e: e["id"])
+        self.type_names = sorted({t for e in entries for t in e["types"]})
+        type_ids = {name: i for i, name in enumerate(self.type_names)}
+
+        self.names = [e["name"] for e in entries]
+        self.types = [e["types"] for e in entries]
+        self.ids = np.array([e["id"] for e in entries], dtype=np.int32)
+        self.stats = np.array([[e["stats"].get(s, 0) for s in STAT_NAMES] for e in entries], dtype=np.int16)
+        self.stats = self.stats.reshape(len(entries), len(STAT_NAMES))
+        self.bst = self.stats.sum(axis=1, dtype=np.int32)
+        self.generations = np.array([e["generation"] or 0 for e in entries], dtype=np.int8)
+        # One boolean column per type; a Pokemon has one or two set
+        self.type_mask = np.zeros((len(entries), len(self.type_names)), dtype=bool)
+        for row, entry in enumerate(entries):
+            self.type_mask[row, [type_ids[t] for t in entry["types"]]] = True
+
+    def search(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        pokemon_type: Optional[str] = None,
+        generation: Union[int, str, None] = None,
+        min_bst: Optional[int] = None,
+        max_bst: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Get one page of Pokemon matching all given filters, ordered by national dex id.
+
+        Pass the returned next_cursor back as `cursor` to fetch the following page;
+        `offset` is only used when no cursor is given, and `limit` is capped at
+        MAX_PAGE_SIZE. An index built from the module cache only covers cached
+        Pokemon, so it reports complete as False and no total count.
+        """
+        limit, offset = page_bounds(limit, offset)
+        self.ensure_built()
+        mask = np.ones(len(self.names), dtype=bool)
+
+        if pokemon_type:
+            pokemon_type = pokemon_type.lower()
+            if pokemon_type not in self.type_names:
+                mask[:] = False
+            else:
+                mask &= self.type_mask[:, self.type_names.index(pokemon_type)]
+        if generation is not None:
+            mask &= self.generations == parse_generation(generation)
+        if min_bst is not None:
+            mask &= self.bst >= min_bst
+        if max_bst is not None:
+            mask &= self.bst <= max_bst
+
+        matches = np.flatnonzero(mask)
+        if cursor:
+            start = int(np.searchsorted(self.ids[matches], self._decode_cursor(cursor), side="right"))
+        else:
+            start = offset
+        page = matches[start : start + limit]
+
+        next_cursor = None
+        if start + limit < len(matches) and len(page):
+            next_cursor = self._encode_cursor(int(self.ids[page[-1]]))
+
+        complete = self.source == "mirror"
+        return {
+            "count": int(len(matches)) if complete else None,
+            "complete": complete,
+            "results": [self._row(i) for i in page],
+            "next_cursor": next_cursor,
+            "index_source": self.source,
+        }
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        """Get one index row as a result dict."""
+        return {
+            "id": int(self.ids[i]),
+            "name": self.names[i],
+            "types": self.types[i],
+            "generation": int(self.generations[i]) or None,
+            "stats": dict(zip(STAT_NAMES, self.stats[i].tolist())),
+            "bst": int(self.bst[i]),
+        }
+
+    @staticmethod
+    def _encode_cursor(last_id: int) -> str:
+        """Encode the last returned id as an opaque cursor."""
+        return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> int:
+        """Decode a cursor back into the last returned id."""
+        try:
+            prefix, _, last_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition(":")
+            if prefix != "id":
+                raise ValueError
+            return int(last_id)
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}")
@@ -2,10 +2,10 @@
 Pokemon role classification system.
 """
 
-import json
-from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+from utils.reference_data import get_reference_data
+
 
 class RoleClassifier:
     """Classifies Pokemon into competitive roles based on stats and characteristics."""
@@ -15,14 +15,12 @@ class RoleClassifier:
         self.role_data = self._load_role_data()
 
     def _load_role_data(self) -> Dict:
-        """Load role definitions from JSON file."""
-        try:
-            data_path = Path(__file__).parent.parent / "data" / "pokemon_roles.json"
-            with open(data_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
+        """Load role definitions from the shared pokemon_roles.json data."""
+        role_data = get_reference_data().pokemon_roles
+        if "role_definitions" not in role_data:
             # Fallback to basic role definitions
             return self._get_basic_roles()
+        return role_data
 
     def _get_basic_roles(self) -> Dict:
         """Basic role definitions fallback."""
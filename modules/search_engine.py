@@ -5,10 +5,10 @@ Pokemon search and filtering engine.
 import re
 from typing import Dict, List, Optional, Any
 from modules.role_classifier import RoleClassifier
-from utils.type_calculator import TypeCalculator
+from utils.reference_data import ReferenceDataMixin
 
 
-class SearchEngine:
+class SearchEngine(ReferenceDataMixin):
     """Advanced Pokemon search with multiple filtering capabilities."""
 
     def __init__(self, pokemon_data_fetcher):
@@ -20,7 +20,6 @@ class SearchEngine:
         """
         self.fetch_pokemon = pokemon_data_fetcher
         self.role_classifier = RoleClassifier()
-        self.type_calculator = TypeCalculator()
         self._pokemon_cache = {}
 
     def search_pokemon(
@@ -0,0 +1,271 @@
+"""
+Speed tier module that ranks Pokemon by computed speed with binary search.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from modules.damage_calculator import DamageCalculator
+from utils.local_mirror import LocalMirror
+from utils.projections import STAT_NAMES
+
+LEVEL = 100
+
+# Speed investment spreads, slowest first
+INVESTMENTS: Dict[str, Dict[str, Any]] = {
+    "min": {"ivs": {"speed": 0}, "evs": {}, "nature": {"minus": "speed"}},
+    "uninvested": {"ivs": {}, "evs": {}, "nature": {}},
+    "max": {"ivs": {}, "evs": {"speed": 252}, "nature": {}},
+    "max_plus": {"ivs": {}, "evs": {"speed": 252}, "nature": {"plus": "speed"}},
+}
+
+# Speed multipliers from Choice Scarf and Tailwind
+MODIFIERS = {"none": 1.0, "scarf": 1.5, "tailwind": 2.0}
+
+# Moves that count as each kind of speed control
+SPEED_CONTROL_MOVES = {
+    "trick_room": ("trick-room",),
+    "tailwind": ("tailwind",),
+    "paralysis": ("thunder-wave", "glare", "stun-spore", "nuzzle"),
+    "speed_drops": ("icy-wind", "electroweb", "rock-tomb", "bulldoze", "sticky-web"),
+    "priority": (
+        "extreme-speed",
+        "fake-out",
+        "aqua-jet",
+        "bullet-punch",
+        "ice-shard",
+        "mach-punch",
+        "shadow-sneak",
+        "sucker-punch",
+        "quick-attack",
+        "accelerock",
+        "vacuum-wave",
+        "first-impression",
+        "grassy-glide",
+        "jet-punch",
+    ),
+}
+
+
+class SpeedTierIndex:
+    """Sorted level 100 speed tiers over a reference field of Pokemon.
+
+    The field is every Pokemon in the local mirror when one exists, otherwise
+    every cached Pokemon. Speed is computed for each investment spread, then
+    each (investment, modifier, Trick Room) tier is kept as an ascending
+    column of sort keys with matching names. Under Trick Room the key is the
+    negated speed, so in every tier a higher key moves first and "who
+    outspeeds X" or "where does X rank" is a binary search. The index is
+    rebuilt when its source changes.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, mirror: Optional[LocalMirror] = None):
+        """Initialize with the per-Pokemon cache directory and an optional mirror. The index is built on first use."""
+        self.cache_dir = cache_dir or Path(__file__).parent.parent / "data" / "cache"
+        self.mirror = mirror
+        self.source: Optional[str] = None
+        self._state: Optional[Tuple[str, Optional[int]]] = None
+        self._built = False
+        self._lock = threading.Lock()
+
+    def _source_state(self) -> Tuple[str, Optional[int]]:
+        """Get the field's source and its mtime, which changes whenever the source is written.
+
+        A mirror is only replaced by a re-import, so the cache's writes do not
+        change a mirror-backed field.
+        """
+        if self.mirror is not None and self.mirror.count("pokemon"):
+            source, path = "mirror", self.mirror.db_path
+        else:
+            source, path = "cache", self.cache_dir
+        try:
+            return source, path.stat().st_mtime_ns
+        except OSError:
+            return source, None
+
+    def ensure_built(self) -> None:
+        """Build the index if it has not been built or its source has changed since."""
+        state = self._source_state()
+        if not self._built or state != self._state:
+            with self._lock:
+                if not self._built or state != self._state:
+                    self.source = state[0]
+                    if self.source == "mirror":
+                        self._load(list(self._entries_from_mirror()))
+                    else:
+                        self._load(list(self._entries_from_cache()))
+                    self._state, self._built = state, True
+
+    def _entries_from_mirror(self) -> Iterator[Dict[str, Any]]:
+        """Read index entries from the local mirror's pokemon table."""
+        for pokemon in self.mirror.iter_resource("pokemon"):
+            yield {
+                "name": pokemon["name"],
+                "stats": {s["stat"]["name"]: s["base_stat"] for s in pokemon["stats"]},
+                "moves": {m["move"]["name"] for m in pokemon["moves"]},
+            }
+
+    def _entries_from_cache(self) -> Iterator[Dict[str, Any]]:
+        """Read index entries from the per-Pokemon module cache."""
+        for cache_file in self.cache_dir.glob("*.json"):
+            with open(cache_file, "r") as f:
+                data = json.load(f)
+            if "stats" not in data or "name" not in data:
+                continue
+            yield {
+                "name": data["name"],
+                "stats": data["stats"],
+                "moves": {m["name"] if isinstance(m, dict) else m for m in data.get("moves", [])},
+            }
+
+    def _load(self, entries: List[Dict[str, Any]]) -> None:
+        """Compute speeds for every spread and pack each tier into sorted key and name columns."""
+        entries.sort(key=lambda e: e["name"])
+        self.names = [e["name"] for e in entries]
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        base_stats = np.array([[e["stats"].get(s, 1) for s in STAT_NAMES] for e in entries], dtype=np.int64)
+        base_stats = base_stats.reshape(len(entries), len(STAT_NAMES))
+        self.speed_control = {
+            kind: np.array([bool(e["moves"].intersection(moves)) for e in entries], dtype=bool)
+            for kind, moves in SPEED_CONTROL_MOVES.items()
+        }
+
+        self.speeds = {
+            investment: DamageCalculator.calc_stats(base_stats, LEVEL, spread)[:, 5]
+            for investment, spread in INVESTMENTS.items()
+        }
+        self.tiers: Dict[Tuple[str, str, bool], Tuple[np.ndarray, List[str]]] = {}
+        for investment, speeds in self.speeds.items():
+            for modifier in MODIFIERS:
+                for trick_room in (False, True):
+                    keys = self._key(speeds, modifier, trick_room)
+                    order = np.argsort(keys, kind="stable")
+                    self.tiers[investment, modifier, trick_room] = (keys[order], [self.names[i] for i in order])
+
+    @staticmethod
+    def _key(speed: np.ndarray, modifier: str, trick_room: bool) -> np.ndarray:
+        """Get sort keys where higher moves first: the modified speed, negated under Trick Room."""
+        speed = np.floor(np.asarray(speed) * MODIFIERS[modifier]).astype(np.int64)
+        return -speed if trick_room else speed
+
+    @staticmethod
+    def speed(base_speed: int, investment: str = "max_plus", modifier: str = "none") -> int:
+        """Compute a level 100 speed stat for a base speed, investment spread and modifier."""
+        if investment not in INVESTMENTS:
+            raise ValueError(f"Unknown investment: {investment}. Use one of {', '.join(INVESTMENTS)}")
+        if modifier not in MODIFIERS:
+            raise ValueError(f"Unknown modifier: {modifier}. Use one of {', '.join(MODIFIERS)}")
+        base_stats = np.ones((1, len(STAT_NAMES)), dtype=np.int64)
+        base_stats[0, 5] = base_speed
+        stat = DamageCalculator.calc_stats(base_stats, LEVEL, INVESTMENTS[investment])[0, 5]
+        return int(np.floor(stat * MODIFIERS[modifier]))
+
+    def rank(
+        self,
+        base_speed: int,
+        investment: str = "max_plus",
+        modifier: str = "none",
+        field_modifier: str = "none",
+        trick_room: bool = False,
+        limit: int = 10,
+        name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Rank a base speed against the field at the same investment.
+
+        modifier applies to the ranked Pokemon and field_modifier to the field.
+        A Pokemon given by name is left out of its own field. Returns how many
+        of the field outspeed it and how many it outspeeds, its percentile
+        (share of the field it moves before, counting ties as half) and the
+        closest `limit` Pokemon that move before it.
+        """
+        if field_modifier not in MODIFIERS:
+            raise ValueError(f"Unknown modifier: {field_modifier}. Use one of {', '.join(MODIFIERS)}")
+        self.ensure_built()
+        speed = self.speed(base_speed, investment, modifier)
+        keys, names = self.tiers[investment, field_modifier, trick_room]
+        key = -speed if trick_room else speed
+        slower = int(np.searchsorted(keys, key, side="left"))
+        faster_start = int(np.searchsorted(keys, key, side="right"))
+        counts = [slower, faster_start - slower, len(names) - faster_start]
+
+        own = self._positions.get(name.lower()) if name else None
+        if own is not None:
+            own_key = int(self._key(self.speeds[investment][own], field_modifier, trick_room))
+            counts[(own_key >= key) + (own_key > key)] -= 1
+        field_size = sum(counts)
+        own_name = self.names[own] if own is not None else None
+        outsped_by = [n for n in names[faster_start : faster_start + limit + 1] if n != own_name][:limit]
+        return {
+            "speed": speed,
+            "outsped_by_count": counts[2],
+            "outspeeds_count": counts[0],
+            "ties": counts[1],
+            "percentile": round((counts[0] + counts[1] / 2) / field_size, 3) if field_size else None,
+            "outsped_by": outsped_by,
+        }
+
+    def analyze_team(
+        self, team_data: List[Dict[str, Any]], investment: str = "max_plus", modifier: str = "none", limit: int = 10
+    ) -> Dict[str, Any]:
+        """Rank each team member in the speed tiers, normally and under Trick Room.
+
+        A member's Trick Room percentile is the share of the field that it
+        moves before once Trick Room flips the order; members that gain the
+        most are the team's Trick Room abusers.
+        """
+        members = {}
+        for pokemon in team_data:
+            if "stats" not in pokemon:
+                continue
+            base_speed = pokemon["stats"].get("speed", 1)
+            normal = self.rank(base_speed, investment, modifier, limit=limit, name=pokemon["name"])
+            trick_room = self.rank(base_speed, investment, modifier, trick_room=True, limit=limit, name=pokemon["name"])
+            members[pokemon["name"]] = {
+                "base_speed": base_speed,
+                **normal,
+                "trick_room": {key: trick_room[key] for key in ("outsped_by_count", "outspeeds_count", "percentile")},
+            }
+
+        ranked = sorted(members, key=lambda name: -members[name]["speed"])
+        # Percentiles are None only when the field is empty
+        ranked_members = [m for m in members.values() if m["percentile"] is not None]
+        percentiles = [m["percentile"] for m in ranked_members]
+        tr_percentiles = [m["trick_room"]["percentile"] for m in ranked_members]
+        return {
+            "investment": investment,
+            "modifier": modifier,
+            "level": LEVEL,
+            "field_size": len(self.names),
+            "field_source": self.source,
+            "members": members,
+            "speed_order": ranked,
+            "average_percentile": round(sum(percentiles) / len(percentiles), 3) if percentiles else None,
+            "average_trick_room_percentile": (
+                round(sum(tr_percentiles) / len(tr_percentiles), 3) if percentiles else None
+            ),
+            "trick_room_gains": [
+                name
+                for name in ranked
+                if members[name]["percentile"] is not None
+                and members[name]["trick_room"]["percentile"] > members[name]["percentile"]
+            ],
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the share of the field with each kind of speed control and the field's speed quartiles."""
+        self.ensure_built()
+        if not self.names:
+            return {"field_size": 0, "field_source": self.source}
+        quartiles = np.percentile(self.speeds["max_plus"], [25, 50, 75]).round().astype(int).tolist()
+        return {
+            "field_size": len(self.names),
+            "field_source": self.source,
+            **{kind: round(float(mask.mean() * 100), 1) for kind, mask in self.speed_control.items()},
+            "max_plus_speed_quartiles": dict(zip(("25th", "50th", "75th"), quartiles)),
+            "fastest": self.tiers["max_plus", "none", False][1][-1],
+            "slowest": self.tiers["max_plus", "none", False][1][0],
+        }
@@ -0,0 +1,51 @@
+"""
+Stat comparator module that compares base stats across groups of Pokemon.
+"""
+
+from typing import List, Dict, Any
+
+import numpy as np
+
+from utils.projections import STAT_NAMES
+
+
+class StatComparator:
+    """Compares base stats of any number of Pokemon in one pass."""
+
+    def compare(self, pokemon_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compare base stats of Pokemon with `name` and `stats` fields.
+
+        Stats are packed into an N x 7 array (six base stats plus BST) and
+        every difference, rank and percentile is computed from it with
+        broadcasting instead of per-pair loops.
+        """
+        names = [p["name"] for p in pokemon_data]
+        columns = STAT_NAMES + ("bst",)
+        base = np.array([[p["stats"].get(stat, 0) for stat in STAT_NAMES] for p in pokemon_data], dtype=np.int32)
+        table = np.column_stack([base, base.sum(axis=1)])
+
+        # differences[i, j, k] = table[j, k] - table[i, k], i.e. how much j exceeds i
+        differences = table[np.newaxis, :, :] - table[:, np.newaxis, :]
+
+        # Competition ranking: 1 + number of Pokemon with a strictly higher stat
+        higher = (differences > 0).sum(axis=1)
+        lower = (differences < 0).sum(axis=1)
+        ties = (differences == 0).sum(axis=1) - 1
+        ranks = higher + 1
+
+        # Percentile within the group, counting ties as half below
+        others = max(len(names) - 1, 1)
+        percentiles = (
+            np.round((lower + 0.5 * ties) / others * 100, 1) if len(names) > 1 else np.full(ranks.shape, 100.0)
+        )
+
+        order = np.argsort(-table, axis=0, kind="stable")
+
+        return {
+            "pokemon": names,
+            "stats": {name: dict(zip(columns, row.tolist())) for name, row in zip(names, table)},
+            "rankings": {stat: [names[i] for i in order[:, k]] for k, stat in enumerate(columns)},
+            "ranks": {name: dict(zip(columns, row.tolist())) for name, row in zip(names, ranks)},
+            "percentiles": {name: dict(zip(columns, row.tolist())) for name, row in zip(names, percentiles)},
+            "difference_matrices": {stat: differences[:, :, k].tolist() for k, stat in enumerate(columns)},
+        }
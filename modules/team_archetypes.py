@@ -2,23 +2,14 @@
 Team archetypes module that provides data for Pokemon team building strategies.
 """
 
-import requests
-import json
-from pathlib import Path
+import asyncio
 from typing import Dict, List, Any, Optional
-from utils.type_calculator import TypeCalculator
+from utils.pokemon_fetcher import PokemonFetcher
 
 
-class TeamArchetypes:
+class TeamArchetypes(PokemonFetcher):
     """Provides data for team building archetypes and strategies."""
 
-    def __init__(self):
-        """Initialize with required components."""
-        self.type_calculator = TypeCalculator()
-        self.pokeapi_base = "https://pokeapi.co/api/v2"
-        self.cache_dir = Path(__file__).parent.parent / "data" / "cache"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-
     def get_team_suggestion(
         self, archetype: str, format: str = "OU", key_pokemon: Optional[str] = None, style: str = "balanced"
     ) -> Dict[str, Any]:
@@ -28,32 +19,55 @@ class TeamArchetypes:
             if not self._is_valid_archetype(archetype):
                 return {"error": f"Invalid archetype: {archetype}"}
 
-            # Get archetype requirements
-            requirements = self._get_archetype_requirements(archetype)
-
             # Get core members data
             core_members = self._get_core_pokemon_data(archetype, key_pokemon)
             if not core_members:
                 return {"error": "Failed to get core member data"}
 
-            # Get team type data
-            team_types = [member["types"] for member in core_members]
-            type_data = self.type_calculator.get_team_type_data(team_types)
-
-            return {
-                "archetype": archetype,
-                "format_info": self._get_format_data(format),
-                "core_pokemon": core_members,
-                "type_data": type_data,
-                "requirements": requirements,
-                "style_context": self._get_style_data(style),
-                "archetype_data": self._get_archetype_data(archetype),
-                "meta_context": self._get_meta_context(format),
-            }
+            return self._build_suggestion(archetype, format, style, core_members)
 
         except Exception as e:
             return {"error": f"Team suggestion failed: {str(e)}", "archetype": archetype}
 
+    async def get_team_suggestion_async(
+        self, archetype: str, format: str = "OU", key_pokemon: Optional[str] = None, style: str = "balanced"
+    ) -> Dict[str, Any]:
+        """Provide data for team archetype suggestions, fetching core members concurrently."""
+        try:
+            if not self._is_valid_archetype(archetype):
+                return {"error": f"Invalid archetype: {archetype}"}
+
+            core_members = await self._get_core_pokemon_data_async(archetype, key_pokemon)
+            if not core_members:
+                return {"error": "Failed to get core member data"}
+
+            return self._build_suggestion(archetype, format, style, core_members)
+
+        except Exception as e:
+            return {"error": f"Team suggestion failed: {str(e)}", "archetype": archetype}
+
+    def _build_suggestion(
+        self, archetype: str, format: str, style: str, core_members: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Assemble archetype suggestion data around the core members."""
+        # Get archetype requirements
+        requirements = self._get_archetype_requirements(archetype)
+
+        # Get team type data
+        team_types = [member["types"] for member in core_members]
+        type_data = self.type_calculator.for_format(format).get_team_type_data(team_types)
+
+        return {
+            "archetype": archetype,
+            "format_info": self._get_format_data(format),
+            "core_pokemon": core_members,
+            "type_data": type_data,
+            "requirements": requirements,
+            "style_context": self._get_style_data(style),
+            "archetype_data": self._get_archetype_data(archetype),
+            "meta_context": self._get_meta_context(format),
+        }
+
     def _is_valid_archetype(self, archetype: str) -> bool:
         """Check if archetype is valid."""
         valid_archetypes = {
@@ -91,57 +105,48 @@ class TeamArchetypes:
     def _get_core_pokemon_data(self, archetype: str, key_pokemon: Optional[str]) -> List[Dict[str, Any]]:
         """Get data for core team members."""
         core_members = []
-
-        # Add key Pokemon if provided
-        if key_pokemon:
-            data = self.fetch_pokemon_data(key_pokemon)
+        for pokemon in self._get_core_pokemon_names(archetype, key_pokemon):
+            data = self.fetch_pokemon_data(pokemon)
             if "error" not in data:
                 core_members.append(data)
 
-        # Add archetype-specific Pokemon
-        requirements = self._get_archetype_requirements(archetype)
-        for pokemon in requirements.get("key_pokemon", [])[:2]:  # Get first two key Pokemon
-            if pokemon.lower() != key_pokemon:
-                data = self.fetch_pokemon_data(pokemon)
-                if "error" not in data:
-                    core_members.append(data)
-
         return core_members
 
-    def fetch_pokemon_data(self, name: str) -> Dict[str, Any]:
-        """Fetch Pokemon data from PokeAPI with caching."""
-        cache_file = self.cache_dir / f"{name.lower()}.json"
+    async def _get_core_pokemon_data_async(self, archetype: str, key_pokemon: Optional[str]) -> List[Dict[str, Any]]:
+        """Get data for core team members concurrently."""
+        names = self._get_core_pokemon_names(archetype, key_pokemon)
+        results = await asyncio.gather(*(self.fetch_pokemon_data_async(pokemon) for pokemon in names))
+        return [data for data in results if "error" not in data]
 
-        if cache_file.exists():
-            with open(cache_file, "r") as f:
-                return json.load(f)
-
-        try:
-            response = requests.get(f"{self.pokeapi_base}/pokemon/{name.lower()}")
-            data = response.json()
+    def _get_core_pokemon_names(self, archetype: str, key_pokemon: Optional[str]) -> List[str]:
+        """Get the names of core team members, key Pokemon first."""
+        names = []
 
-            pokemon_data = {
-                "id": data["id"],
-                "name": data["name"],
-                "types": [t["type"]["name"] for t in data["types"]],
-                "stats": {s["stat"]["name"]: s["base_stat"] for s in data["stats"]},
-                "abilities": [{"name": a["ability"]["name"], "is_hidden": a["is_hidden"]} for a in data["abilities"]],
-                "moves": [m["move"]["name"] for m in data["moves"]],
-            }
+        # Add key Pokemon if provided
+        if key_pokemon:
+            names.append(key_pokemon)
 
-            with open(cache_file, "w") as f:
-                json.dump(pokemon_data, f, indent=2)
+        # Add archetype-specific Pokemon
+        requirements = self._get_archetype_requirements(archetype)
+        for pokemon in requirements.get("key_pokemon", [])[:2]:  # Get first two key Pokemon
+            if pokemon.lower() != key_pokemon:
+                names.append(pokemon)
 
-            return pokemon_data
+        return names
 
-        except Exception as e:
-            return {"error": f"Failed to fetch data for {name}: {str(e)}"}
+    def _reduce_pokemon_data(self, data: Dict[str, Any], species_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Reduce a PokeAPI pokemon payload to the fields we use, keeping whether abilities are hidden."""
+        return {
+            **super()._reduce_pokemon_data(data, species_data),
+            "abilities": [{"name": a["ability"]["name"], "is_hidden": a["is_hidden"]} for a in data["abilities"]],
+        }
 
     def _get_format_data(self, format: str) -> Dict[str, Any]:
         """Get format-specific data."""
         return {
             "name": format.upper(),
             "level_cap": 100,
+            **self.reference_data.formats.get(format.upper(), {}),
             "allowed_pokemon": self._get_format_pokemon(format),
             "common_archetypes": self._get_common_archetypes(format),
         }
@@ -192,12 +197,7 @@ class TeamArchetypes:
 
     def _get_format_pokemon(self, format: str) -> List[Dict[str, Any]]:
         """Get format-legal Pokemon data."""
-        try:
-            with open(self.cache_dir.parent / "pokemon_roles.json", "r") as f:
-                roles_data = json.load(f)
-                return roles_data.get(format, [])
-        except Exception:
-            return []
+        return self.reference_data.pokemon_roles.get(format, [])
 
     def _get_common_archetypes(self, format: str) -> List[Dict[str, Any]]:
         """Get common archetypes in the format."""
@@ -0,0 +1,119 @@
+"""
+Team coverage module that computes defensive and offensive type coverage of teams.
+"""
+
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from utils.reference_data import ReferenceDataMixin
+from utils.type_calculator import COMBO_INDEX, NO_TYPE, TYPE_NAMES
+
+MAX_TEAM_SIZE = 6
+
+
+class TeamCoverage(ReferenceDataMixin):
+    """Computes team type coverage with array ops over the shared type chart.
+
+    Teams are encoded as (teams x 6 x 2) type id arrays, with missing members
+    padded out so every team in a batch has the same shape. Defensive
+    multipliers come from the precomputed profile table and offensive STAB
+    multipliers from the effectiveness matrix, for all teams at once.
+    """
+
+    def _encode_teams(self, teams: Sequence[Sequence[Sequence[str]]]) -> np.ndarray:
+        """Encode teams of member type lists as a (teams x 6 x 2) id array padded with NO_TYPE."""
+        encoded = np.full((len(teams), MAX_TEAM_SIZE, 2), NO_TYPE, dtype=np.intp)
+        for t, team in enumerate(teams):
+            if not 1 <= len(team) <= MAX_TEAM_SIZE:
+                raise ValueError(f"A team has 1 to {MAX_TEAM_SIZE} members, got {len(team)}")
+            for m, types in enumerate(team):
+                first, second = self.type_calculator.encode_types(types)
+                encoded[t, m] = (first, NO_TYPE if second == first else second)
+        return encoded
+
+    def _matrices(self, encoded: np.ndarray) -> Dict[str, np.ndarray]:
+        """Compute defensive and offensive (teams x 6 x 18) matrices plus per-team summaries."""
+        calculator = self.type_calculator
+        members = encoded[:, :, 0] != NO_TYPE
+
+        # A padded member has no combo (index -1), which picks the appended neutral row
+        profiles = np.vstack([calculator.profiles, np.ones((1, len(TYPE_NAMES)), dtype=calculator.profiles.dtype)])
+        defense = profiles[COMBO_INDEX[encoded[..., 0], encoded[..., 1]]]
+
+        # Best STAB multiplier of each member against each single defending type; NO_TYPE attacks for 0
+        attack = np.vstack([calculator.matrix[:, : len(TYPE_NAMES)], np.zeros((1, len(TYPE_NAMES)), dtype=np.float32)])
+        offense = np.maximum(attack[encoded[..., 0]], attack[encoded[..., 1]])
+
+        weak_counts = (defense > 1).sum(axis=1)
+        resist_counts = (defense < 1).sum(axis=1)
+        best_offense = offense.max(axis=1)
+        team_sizes = members.sum(axis=1)
+
+        # Score: half for types hit super effectively, half for types resisted
+        # by someone, scaled down by the share of types that hit several members
+        offensive = (best_offense > 1).mean(axis=1)
+        resisted = (resist_counts > 0).mean(axis=1)
+        shared = (weak_counts >= 2).mean(axis=1)
+        score = np.round(50 * offensive + 50 * resisted * (1 - shared), 1)
+
+        return {
+            "members": members,
+            "defense": defense,
+            "offense": offense,
+            "weak_counts": weak_counts,
+            "resist_counts": resist_counts,
+            "best_offense": best_offense,
+            "team_sizes": team_sizes,
+            "score": score,
+        }
+
+    @staticmethod
+    def _summary(result: Dict[str, np.ndarray], t: int) -> Dict[str, Any]:
+        """Get shared weaknesses, uncovered types and the score of team t."""
+        weak_counts = result["weak_counts"][t]
+        resist_counts = result["resist_counts"][t]
+        shared = sorted(np.flatnonzero(weak_counts >= 2), key=lambda i: -weak_counts[i])
+        return {
+            "coverage_score": float(result["score"][t]),
+            "shared_weaknesses": [
+                {"type": TYPE_NAMES[i], "weak_members": int(weak_counts[i]), "resisting_members": int(resist_counts[i])}
+                for i in shared
+            ],
+            "unresisted_types": [TYPE_NAMES[i] for i in np.flatnonzero(resist_counts == 0)],
+            "uncovered_types": [TYPE_NAMES[i] for i in np.flatnonzero(result["best_offense"][t] <= 1)],
+        }
+
+    def analyze(self, team_types: Sequence[Sequence[str]], names: Sequence[str] = ()) -> Dict[str, Any]:
+        """Analyze the coverage of one team given each member's types.
+
+        Returns the member x attacking type defensive matrix, the member x
+        defending type best-STAB offensive matrix, shared weaknesses (types at
+        least two members are weak to), unresisted and uncovered types and a
+        0-100 coverage score.
+        """
+        result = self._matrices(self._encode_teams([team_types]))
+        size = int(result["team_sizes"][0])
+        names = list(names) or [str(list(types)) for types in team_types]
+
+        return {
+            "members": [{"name": name, "types": list(types)} for name, types in zip(names, team_types)],
+            "attacking_types": list(TYPE_NAMES),
+            "defensive_matrix": result["defense"][0, :size].tolist(),
+            "offensive_matrix": result["offense"][0, :size].tolist(),
+            "weak_counts": dict(zip(TYPE_NAMES, result["weak_counts"][0].tolist())),
+            "resist_counts": dict(zip(TYPE_NAMES, result["resist_counts"][0].tolist())),
+            **self._summary(result, 0),
+            "type_chart_version": self.type_calculator.chart_version,
+        }
+
+    def analyze_many(self, teams: Sequence[Sequence[Sequence[str]]]) -> Dict[str, Any]:
+        """Score many candidate teams in one pass, best first, without per-team matrices."""
+        result = self._matrices(self._encode_teams(teams))
+        order = np.argsort(-result["score"], kind="stable")
+
+        return {
+            "count": len(teams),
+            "results": [{"index": int(t), **self._summary(result, t)} for t in order],
+            "type_chart_version": self.type_calculator.chart_version,
+        }
@@ -0,0 +1,299 @@
+"""
+Local PokeAPI stand-in server for deterministic benchmarking.
+
+Serves recorded PokeAPI responses at the same /api/v2 paths, with configurable
+latency, error rate and bandwidth. Point the MCP server at it with:
+
+    python pokeapi_standin.py --latency-ms 80 --error-rate 0.01
+    POKEAPI_BASE=http://127.0.0.1:8765/api/v2 python server.py
+
+Responses come from, in order:
+  1. a fixture directory laid out like the API (pokemon/garchomp.json or
+     pokemon/445/index.json, as in the api-data repository)
+  2. the per-Pokemon module cache in data/cache, expanded back into the
+     PokeAPI pokemon / pokemon-species shapes, by name or id, plus /pokemon and
+     /pokemon-species listings of the cached Pokemon
+  3. data/cache/type_data.json for /type and /type/<name>
+  4. the evolution chains of the cached Pokemon bundled in data/standin, for
+     /evolution-chain/<id> and the species' evolution fields
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from aiohttp import web
+
+from modules.pokedex_index import ROMAN_NUMERALS, generation_from_dex_number
+from utils.projections import STAT_NAMES
+
+CACHE_DIR = Path(__file__).parent / "data" / "cache"
+BUNDLED_DIR = Path(__file__).parent / "data" / "standin"
+
+# Base URL of the resource URLs in the bundled responses
+RECORDED_BASE = "https://pokeapi.co/api/v2"
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+
+
+class PokeAPIStandIn:
+    """Serves recorded PokeAPI responses under injected latency, errors and bandwidth limits."""
+
+    def __init__(
+        self,
+        fixtures_dir: Optional[Path] = None,
+        cache_dir: Path = CACHE_DIR,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        bandwidth: int = 0,
+        seed: int = 0,
+    ):
+        """Initialize with response sources and fault injection settings."""
+        self.fixtures_dir = fixtures_dir
+        self.cache_dir = cache_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.bandwidth = bandwidth
+        self.random = random.Random(seed)
+        self.type_data = self._load_type_data()
+        self.chains, self.chain_links = self._load_chains()
+        self.stats = {"requests": 0, "served": 0, "not_found": 0, "injected_errors": 0, "bytes": 0}
+
+    def _load_type_data(self) -> Dict[str, Any]:
+        """Load the cached type chart, if any."""
+        type_file = self.cache_dir / "type_data.json"
+        if type_file.exists():
+            with open(type_file, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _load_chains(self) -> Tuple[Dict[int, Dict[str, Any]], Dict[str, Tuple[int, Optional[str]]]]:
+        """Load the bundled evolution chains and map each species to its (chain id, pre-evolution)."""
+        chains, links = {}, {}
+        for chain_file in (BUNDLED_DIR / "evolution-chain").glob("*.json"):
+            with open(chain_file, "r") as f:
+                chain = json.load(f)
+            chains[chain["id"]] = chain
+            stack = [(chain["chain"], None)]
+            while stack:
+                link, parent = stack.pop()
+                name = link["species"]["name"]
+                links[name] = (chain["id"], parent)
+                stack.extend((child, name) for child in link["evolves_to"])
+        return chains, links
+
+    def _cached_pokemon(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the module cache's Pokemon entries."""
+        for cache_file in self.cache_dir.glob("*.json"):
+            with open(cache_file, "r") as f:
+                cached = json.load(f)
+            if isinstance(cached, dict) and "id" in cached and "stats" in cached:
+                yield cached
+
+    def _find_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached Pokemon by name or national dex id."""
+        if key.isdigit():
+            return next((cached for cached in self._cached_pokemon() if cached["id"] == int(key)), None)
+        cache_file = self.cache_dir / f"{key}.json"
+        if not cache_file.exists() or key == "type_data":
+            return None
+        with open(cache_file, "r") as f:
+            return json.load(f)
+
+    def _lookup(self, path: str, base_url: str, query: Optional[Mapping[str, str]] = None) -> Optional[Any]:
+        """Find a recorded response for an API path such as 'pokemon/garchomp'."""
+        if self.fixtures_dir:
+            for candidate in (self.fixtures_dir / f"{path}.json", self.fixtures_dir / path / "index.json"):
+                if candidate.exists():
+                    with open(candidate, "r") as f:
+                        return json.load(f)
+
+        parts = path.split("/")
+        if parts[0] == "type":
+            return self._type_response(parts[1] if len(parts) > 1 else None, base_url)
+
+        if parts[0] in ("pokemon", "pokemon-species") and len(parts) == 1:
+            return self._listing(parts[0], base_url, query or {})
+
+        if parts[0] in ("pokemon", "pokemon-species") and len(parts) == 2:
+            cached = self._find_cached(parts[1])
+            if cached is not None:
+                if parts[0] == "pokemon":
+                    return self._expand_pokemon(cached, base_url)
+                return self._expand_species(cached, base_url)
+
+        if parts[0] == "evolution-chain" and len(parts) == 2 and parts[1].isdigit():
+            chain = self.chains.get(int(parts[1]))
+            if chain is not None:
+                return json.loads(json.dumps(chain).replace(f'"{RECORDED_BASE}/', f'"{base_url}/'))
+        return None
+
+    def _listing(self, resource: str, base_url: str, query: Mapping[str, str]) -> Dict[str, Any]:
+        """Build a paginated /pokemon or /pokemon-species listing of the cached Pokemon in id order."""
+        limit, offset = query.get("limit", "20"), query.get("offset", "0")
+        limit = int(limit) if limit.isdigit() else 20
+        offset = int(offset) if offset.isdigit() else 0
+        entries = sorted((cached["id"], cached["name"]) for cached in self._cached_pokemon())
+        page = entries[offset : offset + limit]
+
+        def page_url(page_offset: int) -> str:
+            return f"{base_url}/{resource}/?offset={page_offset}&limit={limit}"
+
+        return {
+            "count": len(entries),
+            "next": page_url(offset + limit) if offset + limit < len(entries) else None,
+            "previous": page_url(max(offset - limit, 0)) if offset > 0 else None,
+            "results": [{"name": name, "url": f"{base_url}/{resource}/{id_}/"} for id_, name in page],
+        }
+
+    def _type_response(self, name: Optional[str], base_url: str) -> Optional[Dict[str, Any]]:
+        """Build /type and /type/<name> responses from the cached type chart."""
+        if name is None:
+            results = [{"name": t, "url": f"{base_url}/type/{t}/"} for t in self.type_data]
+            return {"count": len(results), "next": None, "previous": None, "results": results}
+        if name not in self.type_data:
+            return None
+        return {"name": name, "damage_relations": self.type_data[name]}
+
+    def _expand_pokemon(self, cached: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+        """Expand a module cache entry back into the PokeAPI pokemon shape."""
+        # Moves and abilities are cached either as names or as dicts with a name
+        abilities = [a if isinstance(a, dict) else {"name": a, "is_hidden": False} for a in cached["abilities"]]
+        return {
+            "id": cached["id"],
+            "name": cached["name"],
+            "types": [
+                {"slot": i + 1, "type": {"name": t, "url": f"{base_url}/type/{t}/"}}
+                for i, t in enumerate(cached["types"])
+            ],
+            "stats": [
+                {
+                    "base_stat": cached["stats"].get(s, 0),
+                    "effort": 0,
+                    "stat": {"name": s, "url": f"{base_url}/stat/{s}/"},
+                }
+                for s in STAT_NAMES
+            ],
+            "abilities": [
+                {"ability": {"name": a["name"], "url": ""}, "is_hidden": a["is_hidden"], "slot": i + 1}
+                for i, a in enumerate(abilities)
+            ],
+            "moves": [
+                {"move": {"name": m["name"] if isinstance(m, dict) else m, "url": ""}, "version_group_details": []}
+                for m in cached["moves"]
+            ],
+            "species": {"name": cached["name"], "url": f"{base_url}/pokemon-species/{cached['name']}/"},
+            "sprites": {"front_default": None, "front_shiny": None},
+            # Not every cache entry records these; numeric placeholders keep clients doing arithmetic working
+            "height": cached.get("height", 0),
+            "weight": cached.get("weight", 0),
+            "base_experience": cached.get("base_experience", 0),
+        }
+
+    def _expand_species(self, cached: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+        """Expand a module cache entry into the PokeAPI pokemon-species shape.
+
+        Entries without recorded species data get a minimal species with the
+        generation implied by their national dex number and no egg groups.
+        """
+        species = cached.get("species_data") or cached.get("species") or {}
+        generation = species.get("generation")
+        if generation is None:
+            numeral = {number: numeral for numeral, number in ROMAN_NUMERALS.items()}.get(
+                generation_from_dex_number(cached["id"])
+            )
+            generation = f"generation-{numeral}" if numeral else None
+        chain_id, evolves_from = self.chain_links.get(cached["name"], (None, None))
+        return {
+            "id": cached["id"],
+            "name": cached["name"],
+            "generation": {"name": generation, "url": ""},
+            "growth_rate": {"name": species.get("growth_rate"), "url": ""},
+            "egg_groups": [{"name": g, "url": ""} for g in species.get("egg_groups", [])],
+            "evolution_chain": {"url": f"{base_url}/evolution-chain/{chain_id}/"} if chain_id else None,
+            "evolves_from_species": {"name": evolves_from, "url": ""} if evolves_from else None,
+            # Not recorded in the module cache
+            "is_legendary": None,
+            "is_mythical": None,
+            "genera": [],
+            "flavor_text_entries": [],
+            "varieties": [{"is_default": True, "pokemon": {"name": cached["name"], "url": ""}}],
+        }
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """Serve one API request with injected latency, errors and bandwidth."""
+        self.stats["requests"] += 1
+        delay = self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.random.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            return web.json_response({"detail": "Injected error"}, status=503)
+
+        path = request.match_info["path"].strip("/").lower()
+        base_url = f"{request.scheme}://{request.host}/api/v2"
+        data = self._lookup(path, base_url, request.query)
+        if data is None:
+            self.stats["not_found"] += 1
+            return web.json_response({"detail": "Not found."}, status=404)
+
+        body = json.dumps(data).encode()
+        self.stats["served"] += 1
+        self.stats["bytes"] += len(body)
+        if not self.bandwidth:
+            return web.Response(body=body, content_type="application/json")
+
+        # Throttle by streaming the body in 100 ms worth of bytes at a time
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        response.content_length = len(body)
+        await response.prepare(request)
+        chunk_size = max(self.bandwidth // 10, 1)
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start : start + chunk_size]
+            await response.write(chunk)
+            await asyncio.sleep(len(chunk) / self.bandwidth)
+        await response.write_eof()
+        return response
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        """Report request counters."""
+        return web.json_response(self.stats)
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/__stats", self.handle_stats)
+        app.router.add_get("/api/v2/{path:.*}", self.handle)
+        return app
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Serve recorded PokeAPI responses for benchmarking.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", type=Path, help="Directory of recorded responses laid out like the API")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="Module cache directory to serve")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--bandwidth", type=int, default=0, help="Response bandwidth in bytes/s (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and error injection")
+    args = parser.parse_args()
+
+    standin = PokeAPIStandIn(
+        args.fixtures, args.cache_dir, args.latency_ms, args.jitter_ms, args.error_rate, args.bandwidth, args.seed
+    )
+    logging.info(f"Serving PokeAPI stand-in at http://{args.host}:{args.port}/api/v2")
+    web.run_app(standin.create_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
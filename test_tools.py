@@ -72,6 +72,25 @@ class MCPTester:
             logging.error(f"Tool execution failed: {str(e)}")
             raise
 
+    async def test_resource(self, uri: str) -> Any:
+        """Test reading a JSON resource."""
+        try:
+            logging.info(f"\nReading {uri}...")
+
+            result = await self.session.read_resource(uri)
+            data = json.loads(result.contents[0].text)
+            logging.info(f"Result:\n{json.dumps(data, indent=2)}")
+
+            self.test_results.append({"resource": uri, "result": data, "timestamp": datetime.now().isoformat()})
+            return data
+
+        except Exception as e:
+            self.test_results.append(
+                {"resource": uri, "result": {"error": str(e)}, "timestamp": datetime.now().isoformat()}
+            )
+            logging.error(f"Resource read failed: {str(e)}")
+            raise
+
     async def save_results(self):
         """Save test results to a JSON file."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -103,7 +122,7 @@ async def run_tests():
         logging.info("\nTesting Type Effectiveness")
         logging.info("=" * 50)
 
-        await tester.test_tool(
+        effectiveness = await tester.test_tool(
             "get_type_effectiveness",
             {
                 "attacking_type": "Fire",
@@ -139,6 +158,89 @@ async def run_tests():
             },
         )
 
+        # Test data tools
+        logging.info("\nTesting Data Tools")
+        logging.info("=" * 50)
+
+        batch = await tester.test_tool(
+            "get_pokemon_batch", {"names": ["Garchomp", "Tyranitar", "Garchomp", "NotAPokemon"], "fields": ["types"]}
+        )
+        # Results keep input order, duplicates included, and failures are per entry
+        assert [r["name"] for r in batch["results"]] == ["Garchomp", "Tyranitar", "Garchomp", "NotAPokemon"], batch
+        assert batch["errors"] == 1 and "error" in batch["results"][-1], batch
+
+        # The cursor marks a position, so the next page repeats the filters
+        search = {"pokemon_type": "ground", "min_bst": 500, "limit": 2}
+        page = await tester.test_tool("search_pokemon", search)
+        assert all("ground" in p["types"] and p["bst"] >= 500 for p in page["results"]), page
+        if page.get("next_cursor"):
+            next_page = await tester.test_tool("search_pokemon", {**search, "cursor": page["next_cursor"]})
+            last_id = page["results"][-1]["id"]
+            assert all("ground" in p["types"] and p["id"] > last_id for p in next_page["results"]), next_page
+
+        line = await tester.test_tool("get_evolution_line", {"species": "Garchomp"})
+        assert line["pre_evolutions"] == ["gible", "gabite"] and line["is_fully_evolved"], line
+        # Looking up a species indexes its whole chain
+        line = await tester.test_tool("get_evolution_line", {"species": "Gabite"})
+        assert line["pre_evolutions"] == ["gible"] and line["evolutions"] == ["garchomp"], line
+        assert not line["is_fully_evolved"], line
+        unknown = await tester.test_tool("get_evolution_line", {"species": "NotAPokemon"})
+        assert "error" in unknown, unknown
+
+        speed = await tester.test_tool(
+            "analyze_speed_tiers", {"team": ["Garchomp", "Ferrothorn", "NotAPokemon"], "limit": 3}
+        )
+        assert speed["speed_order"] == ["garchomp", "ferrothorn"] and "NotAPokemon" in speed["failed"], speed
+        # Members are left out of their own field and Trick Room flips the order
+        garchomp = speed["members"]["garchomp"]
+        assert garchomp["outsped_by_count"] + garchomp["outspeeds_count"] + garchomp["ties"] == speed["field_size"] - 1
+        assert "garchomp" not in garchomp["outsped_by"] and "ferrothorn" in speed["trick_room_gains"], speed
+
+        # Test team coverage tools
+        logging.info("\nTesting Team Coverage Tools")
+        logging.info("=" * 50)
+
+        coverage = await tester.test_tool("analyze_team_coverage", {"team": ["Garchomp", "Tyranitar", "Zapdos"]})
+        assert len(coverage["defensive_matrix"]) == 3 and len(coverage["defensive_matrix"][0]) == 18, coverage
+
+        teams = [["Garchomp", "Tyranitar"], ["Garchomp", "Tyranitar", "Zapdos"], ["Pelipper", "Ferrothorn"]]
+        scored = await tester.test_tool("score_team_coverage", {"teams": teams})
+        scores = [r["coverage_score"] for r in scored["results"]]
+        assert sorted(r["index"] for r in scored["results"]) == [0, 1, 2] and scores == sorted(scores, reverse=True)
+        assert next(r for r in scored["results"] if r["index"] == 1)["coverage_score"] == coverage["coverage_score"]
+
+        invalid = await tester.test_tool("score_team_coverage", {"teams": [["Garchomp"], []]})
+        assert invalid["invalid_teams"] == [1], invalid
+
+        # Test resources
+        logging.info("\nTesting Resources")
+        logging.info("=" * 50)
+
+        # Type analysis responses reference the full chart by version
+        chart = await tester.test_resource(effectiveness["type_chart_uri"])
+        assert chart["type_chart_version"] == effectiveness["type_chart_version"], chart
+        assert chart["multipliers"]["fire"]["steel"] * chart["multipliers"]["fire"]["grass"] == 4.0, chart
+        gen1_chart = await tester.test_resource("type-chart://gen1")
+        assert "fairy" not in gen1_chart["types"] and gen1_chart["multipliers"]["ghost"]["psychic"] == 0.0, gen1_chart
+
+        # Several tools above fetched Garchomp, so the response cache has been hit
+        response_cache = await tester.test_resource("cache://stats")
+        assert response_cache["hits"] > 0 and response_cache["size"] <= response_cache["max_entries"], response_cache
+
+        # The earlier matchup with its teams swapped and reordered is served from the matchup cache
+        before = await tester.test_resource("cache://matchups")
+        await tester.test_tool(
+            "predict_matchup",
+            {
+                "team1": ["Garchomp", "Swampert", "Ferrothorn"],
+                "team2": ["Excadrill", "Charizard", "Tyranitar"],
+                "format": "OU",
+                "scoring_priority": "type_advantage",
+            },
+        )
+        after = await tester.test_resource("cache://matchups")
+        assert after["hits"] == before["hits"] + 1 and after["size"] == before["size"], after
+
         # Save all test results
         await tester.save_results()
 
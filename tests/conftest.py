@@ -0,0 +1,42 @@
+"""
+Shared fixtures for the unit tests.
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+CACHE_DIR = ROOT / "data" / "cache"
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def pokemon():
+    """Load a cached Pokemon data dict by name."""
+
+    def load(name: str):
+        with open(CACHE_DIR / f"{name}.json", "r") as f:
+            return json.load(f)
+
+    return load
+
+
+@pytest.fixture
+def type_cache_dir(tmp_path):
+    """A cache directory holding only the cached type data, so tests never touch data/cache."""
+    shutil.copy(CACHE_DIR / "type_data.json", tmp_path / "type_data.json")
+    return tmp_path
+
+
+@pytest.fixture
+def calculator(type_cache_dir):
+    """A TypeCalculator reading type data from the isolated cache directory."""
+    from utils.type_calculator import TypeCalculator
+
+    return TypeCalculator(cache_dir=type_cache_dir)
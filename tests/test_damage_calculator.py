@@ -0,0 +1,133 @@
+"""
+Tests for the batched damage calculator against hand-computed damage numbers.
+"""
+
+import numpy as np
+import pytest
+
+from modules.damage_calculator import DamageCalculator
+from utils.projections import STAT_NAMES
+
+MOVES = ["earthquake", "body-press", "foul-play", "frost-breath", "stone-edge", "aerial-ace"]
+
+
+@pytest.fixture
+def calculator():
+    return DamageCalculator()
+
+
+def base_stats(pokemon):
+    return np.array([[pokemon["stats"][stat] for stat in STAT_NAMES]])
+
+
+def with_moves(pokemon, moves):
+    return {**pokemon, "moves": moves}
+
+
+def test_calc_stats_neutral_spread(pokemon):
+    garchomp = DamageCalculator.calc_stats(base_stats(pokemon("garchomp")), 100)[0]
+    tyranitar = DamageCalculator.calc_stats(base_stats(pokemon("tyranitar")), 100)[0]
+
+    assert garchomp.tolist() == [357, 296, 226, 196, 206, 240]
+    assert tyranitar[0] == 341
+    assert tyranitar[2] == 256
+
+
+def test_calc_stats_invested_spreads(pokemon):
+    stats = base_stats(pokemon("garchomp"))
+    adamant = {"evs": {"attack": 252, "speed": 252}, "nature": {"plus": "attack", "minus": "special-attack"}}
+    jolly = {"evs": {"speed": 252}, "nature": {"plus": "speed"}}
+    min_speed = {"ivs": {"speed": 0}, "nature": {"minus": "speed"}}
+
+    assert DamageCalculator.calc_stats(stats, 100, adamant)[0].tolist() == [357, 394, 226, 176, 206, 303]
+    assert DamageCalculator.calc_stats(stats, 100, jolly)[0, 5] == 333
+    assert DamageCalculator.calc_stats(stats, 100, min_speed)[0, 5] == 188
+    assert DamageCalculator.calc_stats(stats, 50)[0, 0] == 183
+
+
+@pytest.mark.parametrize(
+    "move, low, high",
+    [
+        # STAB and 2x on Rock/Dark
+        ("earthquake", 252, 296),
+        # Attacks with Garchomp's Defense, 4x on Rock/Dark
+        ("body-press", 204, 244),
+        # Attacks with Tyranitar's own Attack, resisted by Dark
+        ("foul-play", 40, 48),
+        # Always crits for 1.5x, neutral on Rock/Dark
+        ("frost-breath", 54, 64),
+    ],
+)
+def test_known_damage_rolls(calculator, pokemon, move, low, high):
+    garchomp = calculator._encode([with_moves(pokemon("garchomp"), [move])])
+    tyranitar = calculator._encode([pokemon("tyranitar")])
+    rolls = calculator.damage_rolls(garchomp, tyranitar, calculator.type_calculator, 100)
+
+    assert rolls["hp"].tolist() == [341]
+    assert rolls["damage"].shape == (1, 1, 16)
+    assert rolls["damage"][0, 0, 0] == low
+    assert rolls["damage"][0, 0, -1] == high
+    assert np.all(np.diff(rolls["damage"][0, 0]) >= 0)
+
+
+def test_immunities_deal_no_damage(calculator, pokemon):
+    zapdos = calculator._encode([with_moves(pokemon("zapdos"), ["thunderbolt"])])
+    garchomp = calculator._encode([pokemon("garchomp")])
+    rolls = calculator.damage_rolls(zapdos, garchomp, calculator.type_calculator, 100)
+
+    assert rolls["effectiveness"][0, 0] == 0
+    assert not rolls["damage"].any()
+    assert rolls["ohko"][0, 0] == 0 and rolls["twohko"][0, 0] == 0
+
+
+def test_ko_chances_include_accuracy(calculator, pokemon):
+    garchomp = calculator._encode([with_moves(pokemon("garchomp"), MOVES)])
+    frail = calculator._encode([{"name": "frail", "types": ["fire"], "stats": dict.fromkeys(STAT_NAMES, 1)}])
+    rolls = calculator.damage_rolls(garchomp, frail, calculator.type_calculator, 100)
+    ohko = dict(zip(garchomp["move_names"], rolls["ohko"][:, 0]))
+    twohko = dict(zip(garchomp["move_names"], rolls["twohko"][:, 0]))
+    accuracy = dict(zip(garchomp["move_names"], rolls["accuracy"]))
+
+    # Every roll of these moves is a KO, so the chances are those of hitting
+    assert accuracy["earthquake"] == 1.0 and ohko["earthquake"] == 1.0
+    assert accuracy["stone-edge"] == 0.8
+    assert ohko["stone-edge"] == pytest.approx(0.8)
+    assert twohko["stone-edge"] == pytest.approx(1 - 0.2**2)
+    # Moves that never miss count as always hitting
+    assert accuracy["aerial-ace"] == 1.0
+
+
+def test_best_move_weighs_accuracy(calculator, pokemon):
+    zapdos = calculator._encode([with_moves(pokemon("zapdos"), ["thunder", "thunderbolt"])])
+    pelipper = calculator._encode([pokemon("pelipper")])
+    rolls = calculator.damage_rolls(zapdos, pelipper, calculator.type_calculator, 100)
+    thunder, thunderbolt = rolls["damage"][:, 0].mean(axis=1)
+
+    # Thunder hits harder but its 70% accuracy makes Thunderbolt the better choice
+    assert thunder > thunderbolt > 0.7 * thunder
+    assert zapdos["move_names"][calculator.best_moves(zapdos, rolls)[0, 0]] == "thunderbolt"
+
+
+def test_calculate_summarizes_both_ways(calculator, pokemon):
+    result = calculator.calculate(
+        [with_moves(pokemon("garchomp"), ["earthquake"])], [with_moves(pokemon("tyranitar"), ["stone-edge"])], "OU"
+    )
+    earthquake = result["team1_to_team2"]["garchomp"]["tyranitar"]
+
+    assert result["level"] == 100
+    assert earthquake["move"] == "earthquake"
+    assert earthquake["effectiveness"] == 2.0
+    assert earthquake["min_percent"] == round(252 / 341 * 100, 1)
+    assert earthquake["max_percent"] == round(296 / 341 * 100, 1)
+    assert result["team2_to_team1"]["tyranitar"]["garchomp"]["accuracy"] == 0.8
+
+
+def test_fairy_only_pokemon_are_normal_before_gen6(calculator, pokemon):
+    gengar = {"name": "gengar", "types": ["ghost", "poison"], "stats": pokemon("zapdos")["stats"]}
+    clefable = {"name": "clefable", "types": ["fairy"], "stats": pokemon("swampert")["stats"]}
+    attacker = calculator._encode([with_moves(gengar, ["shadow-ball"])], "gen5ou")
+    defender = calculator._encode([clefable], "gen5ou")
+    rolls = calculator.damage_rolls(attacker, defender, calculator.type_calculator.for_format("gen5ou"), 100)
+
+    assert rolls["effectiveness"][0, 0] == 0
+    assert not rolls["damage"].any()
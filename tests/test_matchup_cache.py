@@ -0,0 +1,146 @@
+"""
+Tests for canonical matchup keys, the matchup LRU cache and cached matchup analyses.
+"""
+
+import pytest
+
+from modules.battle_analyzer import BattleAnalyzer
+from utils.matchup_cache import MatchupCache, canonical_key, data_version
+
+TEAM1 = ["Charizard", "Tyranitar", "Excadrill"]
+TEAM2 = ["Swampert", "Ferrothorn", "Garchomp"]
+
+
+def test_canonical_key_ignores_member_order_and_case():
+    key, swapped = canonical_key(TEAM1, TEAM2, "ou", "overall")
+
+    assert canonical_key(list(reversed(TEAM1)), [n.lower() for n in TEAM2], "OU", "overall") == (key, swapped)
+    assert canonical_key(TEAM1, TEAM2, "UU", "overall")[0] != key
+    assert canonical_key(TEAM1, TEAM2, "OU", "speed")[0] != key
+
+
+def test_canonical_key_shares_mirrored_matchups():
+    key, swapped = canonical_key(TEAM1, TEAM2, "OU", "overall")
+    mirrored_key, mirrored_swapped = canonical_key(TEAM2, TEAM1, "OU", "overall")
+
+    assert mirrored_key == key
+    assert mirrored_swapped != swapped
+    # Teams are multisets: a repeated member is not the same as a single one
+    assert canonical_key(TEAM1 + ["Charizard"], TEAM2, "OU", "overall")[0] != key
+
+
+def test_data_version_tracks_data_not_order():
+    members = [{"name": "a", "stats": {"hp": 1}}, {"name": "b", "stats": {"hp": 2}}]
+
+    assert data_version("chart", "moves", members) == data_version("chart", "moves", list(reversed(members)))
+    assert data_version("chart", "moves", members) != data_version("other", "moves", members)
+    assert data_version("chart", "moves", members) != data_version("chart", "other", members)
+    changed = [members[0], {"name": "b", "stats": {"hp": 3}}]
+    assert data_version("chart", "moves", members) != data_version("chart", "moves", changed)
+
+
+def test_lru_eviction():
+    cache = MatchupCache(max_entries=2)
+    cache.set("a", "v", 1)
+    cache.set("b", "v", 2)
+    assert cache.get("a", "v") == 1
+    cache.set("c", "v", 3)
+
+    assert cache.get("b", "v") is None
+    assert cache.get("a", "v") == 1 and cache.get("c", "v") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_version_change_invalidates():
+    cache = MatchupCache()
+    cache.set("a", "v1", 1)
+
+    assert cache.get("a", "v2") is None
+    assert cache.get("a", "v1") is None
+    stats = cache.stats()
+    assert stats["invalidations"] == 1 and stats["size"] == 0
+
+
+def test_persisted_entries_survive_restarts(tmp_path):
+    MatchupCache(directory=tmp_path).set("a", "v", {"x": 1})
+
+    cache = MatchupCache(directory=tmp_path)
+    assert cache.get("a", "v") == {"x": 1}
+    cache.clear()
+    assert not list(tmp_path.glob("*.json"))
+    assert MatchupCache(directory=tmp_path).get("a", "v") is None
+
+
+def test_persisted_entries_are_pruned_to_max_entries(tmp_path):
+    writer = MatchupCache(directory=tmp_path)
+    for key in "abc":
+        writer.set(key, "v", key)
+
+    MatchupCache(max_entries=2, directory=tmp_path)
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    """An analyzer with its own empty matchup cache."""
+    monkeypatch.setattr(BattleAnalyzer, "_matchup_cache", MatchupCache())
+    return BattleAnalyzer()
+
+
+def fresh_analysis(analyzer, team1_data, team2_data):
+    """Analyze a matchup in the caller's order without the cache."""
+    return analyzer._analyze_matchup(team1_data, team2_data, "OU", "overall")
+
+
+@pytest.mark.parametrize(
+    "team1, team2",
+    [
+        (TEAM1, TEAM2),
+        (["Excadrill", "Charizard", "Tyranitar"], ["Garchomp", "Swampert", "Ferrothorn"]),
+        (TEAM2, TEAM1),
+        (["Ferrothorn", "Garchomp", "Swampert"], ["Tyranitar", "Excadrill", "Charizard"]),
+    ],
+)
+def test_reordered_and_mirrored_matchups_hit_the_cache(analyzer, pokemon, team1, team2):
+    data = {name: pokemon(name.lower()) for name in TEAM1 + TEAM2}
+    analyzer._cached_analysis(TEAM1, TEAM2, [data[n] for n in TEAM1], [data[n] for n in TEAM2], "OU", "overall")
+
+    team1_data, team2_data = [data[n] for n in team1], [data[n] for n in team2]
+    cached = analyzer._cached_analysis(team1, team2, team1_data, team2_data, "OU", "overall")
+
+    assert analyzer.cache_stats()["hits"] == 1
+    assert cached == fresh_analysis(analyzer, team1_data, team2_data)
+    assert [p["name"] for p in cached["team1"]["pokemon"]] == [n.lower() for n in team1]
+    assert list(cached["damage"]["team1_to_team2"]) == [n.lower() for n in team1]
+
+
+def test_cached_entries_are_not_mutated_by_callers(analyzer, pokemon):
+    team1_data, team2_data = [pokemon(n.lower()) for n in TEAM1], [pokemon(n.lower()) for n in TEAM2]
+    first = analyzer._cached_analysis(TEAM2, TEAM1, team2_data, team1_data, "OU", "overall")
+    first["prediction"]["pair_scores"][0][0] = 99.0
+    first["team1"]["pokemon"].clear()
+
+    second = analyzer._cached_analysis(TEAM2, TEAM1, team2_data, team1_data, "OU", "overall")
+    assert second == fresh_analysis(analyzer, team2_data, team1_data)
+
+
+def test_changed_member_data_misses(analyzer, pokemon):
+    team1_data, team2_data = [pokemon(n.lower()) for n in TEAM1], [pokemon(n.lower()) for n in TEAM2]
+    analyzer._cached_analysis(TEAM1, TEAM2, team1_data, team2_data, "OU", "overall")
+
+    team1_data[0] = {**team1_data[0], "stats": {**team1_data[0]["stats"], "speed": 120}}
+    analysis = analyzer._cached_analysis(TEAM1, TEAM2, team1_data, team2_data, "OU", "overall")
+
+    stats = analyzer.cache_stats()
+    assert stats["hits"] == 0 and stats["invalidations"] == 1
+    assert analysis == fresh_analysis(analyzer, team1_data, team2_data)
+
+
+def test_failed_members_are_not_cached(analyzer, pokemon):
+    team1_data = [pokemon(n.lower()) for n in TEAM1[:2]] + [{"name": "Missingno", "error": "not found"}]
+    team2_data = [pokemon(n.lower()) for n in TEAM2]
+    team1 = TEAM1[:2] + ["Missingno"]
+    analysis = analyzer._cached_analysis(team1, TEAM2, team1_data, team2_data, "OU", "overall")
+
+    assert analysis["errors"]["team1"] == [{"name": "Missingno", "error": "not found"}]
+    assert analyzer.cache_stats()["size"] == 0
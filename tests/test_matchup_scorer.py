@@ -0,0 +1,89 @@
+"""
+Tests for the vectorized member-vs-member matchup scorer.
+"""
+
+import numpy as np
+import pytest
+
+from modules.matchup_scorer import PRIORITY_WEIGHTS, MatchupScorer
+
+TEAM1 = ["charizard", "tyranitar", "excadrill"]
+TEAM2 = ["swampert", "ferrothorn", "garchomp", "zapdos"]
+
+
+@pytest.fixture
+def scorer():
+    return MatchupScorer()
+
+
+@pytest.fixture
+def teams(pokemon):
+    return [pokemon(name) for name in TEAM1], [pokemon(name) for name in TEAM2]
+
+
+@pytest.mark.parametrize("priority", list(PRIORITY_WEIGHTS))
+def test_swapped_teams_match_mirror(scorer, teams, priority):
+    team1, team2 = teams
+    mirrored = MatchupScorer.mirror(scorer.score(team1, team2, "OU", priority))
+    swapped = scorer.score(team2, team1, "OU", priority)
+
+    assert mirrored.pop("team1_win_probability") == pytest.approx(swapped.pop("team1_win_probability"), abs=1e-3)
+    assert mirrored == swapped
+
+
+def test_pair_matrices_are_antisymmetric(scorer, teams):
+    team1, team2 = teams
+    forward = scorer.score(team1, team2)
+    backward = scorer.score(team2, team1)
+
+    for matrix in ("pair_scores", "type_scores", "speed_scores", "stat_scores"):
+        assert np.array_equal(np.array(forward[matrix]), -np.array(backward[matrix]).T)
+
+
+def test_self_matchup_is_even(scorer, teams):
+    team1, _ = teams
+    result = scorer.score(team1, team1)
+
+    assert result["advantage"] == 0
+    assert result["favored"] == "even"
+    assert result["team1_win_probability"] == 0.5
+
+
+def test_reorder_matches_rescoring(scorer, teams):
+    team1, team2 = teams
+    order1, order2 = [2, 0, 1], [3, 1, 0, 2]
+    reordered = MatchupScorer.reorder(scorer.score(team1, team2), order1, order2)
+    rescored = scorer.score([team1[i] for i in order1], [team2[j] for j in order2])
+
+    assert reordered == rescored
+
+
+def test_known_type_advantages(scorer, pokemon):
+    result = scorer.score([pokemon("swampert")], [pokemon("charizard"), pokemon("ferrothorn")], "OU", "type_advantage")
+    type_scores = dict(zip(result["team2_members"], result["type_scores"][0]))
+
+    # Water STAB is 2x on Charizard, which only hits Swampert neutrally
+    assert type_scores["charizard"] > 0
+    # Ferrothorn's Grass STAB is 4x on Swampert, which Ferrothorn resists
+    assert type_scores["ferrothorn"] < 0
+
+
+def test_members_without_data_are_skipped(scorer, teams):
+    team1, team2 = teams
+    result = scorer.score(team1 + [{"name": "missingno", "error": "not found"}], team2)
+
+    assert result["team1_members"] == TEAM1
+    assert result == scorer.score(team1, team2)
+
+
+def test_fairy_only_pokemon_are_normal_before_gen6(scorer, pokemon):
+    clefable = {"name": "clefable", "types": ["fairy"], "stats": pokemon("swampert")["stats"]}
+    gengar = {"name": "gengar", "types": ["ghost", "poison"], "stats": pokemon("zapdos")["stats"]}
+
+    gen5 = scorer.score([clefable], [gengar], "gen5ou")
+    gen6 = scorer.score([clefable], [gengar], "gen6ou")
+
+    # As a Normal type before gen 6, Clefable cannot touch Gengar and takes neutral Poison STAB:
+    # log2(1/8) - log2(1) = -3. From gen 6 its Fairy STAB is resisted and Poison is 2x: log2(1/2) - log2(2) = -2
+    assert gen5["type_scores"][0][0] == -3 / 4
+    assert gen6["type_scores"][0][0] == -2 / 4
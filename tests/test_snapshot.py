@@ -0,0 +1,149 @@
+"""
+Tests for the binary reference data snapshot.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from utils.reference_data import ReferenceData
+from utils.snapshot import REFERENCE_FILES, build_snapshot, open_snapshot
+from utils.type_calculator import TypeCalculator
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A copy of the data files and Pokemon cache, so tests never touch data/."""
+    data_dir = tmp_path / "data"
+    (data_dir / "cache").mkdir(parents=True)
+    for source in REFERENCE_FILES.values():
+        shutil.copy(ROOT / "data" / source, data_dir / source)
+    for cache_file in (ROOT / "data" / "cache").glob("*.json"):
+        shutil.copy(cache_file, data_dir / "cache" / cache_file.name)
+    return data_dir
+
+
+@pytest.fixture
+def snapshot_path(data_dir):
+    path = data_dir / "reference.snapshot"
+    build_snapshot(path, data_dir)
+    return path
+
+
+def touch(path):
+    """Move a file's mtime forward, as an edit would."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_round_trip(data_dir, snapshot_path):
+    snapshot = open_snapshot(snapshot_path, data_dir)
+    assert snapshot is not None and not snapshot.stale
+
+    for name, source in REFERENCE_FILES.items():
+        with open(data_dir / source, "r") as f:
+            assert snapshot.json(name) == json.load(f)
+
+    calculator = TypeCalculator(cache_dir=data_dir / "cache")
+    assert np.array_equal(snapshot.array("matrix"), calculator.matrix)
+    assert np.array_equal(snapshot.array("profiles"), calculator.profiles)
+    assert snapshot.array("profiles").dtype == calculator.profiles.dtype
+    assert not snapshot.array("profiles").flags.writeable
+
+    for cache_file in (data_dir / "cache").glob("*.json"):
+        if cache_file.name.startswith("type_data"):
+            continue
+        with open(cache_file, "r") as f:
+            assert snapshot.pokemon(cache_file.stem) == json.load(f)
+    assert snapshot.pokemon("missingno") is None
+    snapshot.close()
+
+
+def test_changed_reference_file_makes_snapshot_stale(data_dir, snapshot_path):
+    touch(data_dir / "formats.json")
+
+    assert open_snapshot(snapshot_path, data_dir) is None
+
+
+def test_changed_type_chart_makes_snapshot_stale(data_dir, snapshot_path):
+    touch(data_dir / "cache" / "type_data.json")
+
+    assert open_snapshot(snapshot_path, data_dir) is None
+
+
+def test_changed_pokemon_entry_is_skipped(data_dir, snapshot_path):
+    touch(data_dir / "cache" / "garchomp.json")
+
+    snapshot = open_snapshot(snapshot_path, data_dir)
+    assert snapshot is not None
+    assert snapshot.pokemon("garchomp") is None
+    assert snapshot.pokemon("tyranitar") is not None
+    snapshot.close()
+
+
+def test_pokemon_entry_is_checked_once(data_dir, snapshot_path, monkeypatch):
+    snapshot = open_snapshot(snapshot_path, data_dir)
+    checks = []
+
+    def file_state(path):
+        checks.append(path)
+        return snapshot.pokemon_entries[path.stem][2]
+
+    monkeypatch.setattr("utils.snapshot._file_state", file_state)
+
+    assert snapshot.pokemon("garchomp") is not None
+    assert snapshot.pokemon("Garchomp") is not None
+    assert len(checks) == 1
+    snapshot.close()
+
+
+def test_invalid_snapshot_is_ignored(data_dir):
+    path = data_dir / "reference.snapshot"
+    path.write_bytes(b"not a snapshot at all")
+
+    assert open_snapshot(path, data_dir) is None
+    assert open_snapshot(data_dir / "missing.snapshot", data_dir) is None
+
+
+def test_reference_data_reads_the_snapshot(data_dir, snapshot_path):
+    reference_data = ReferenceData(data_dir, snapshot_path)
+
+    assert reference_data.snapshot is not None
+    assert np.array_equal(reference_data.type_calculator.profiles, reference_data.snapshot.array("profiles"))
+    assert np.array_equal(reference_data.type_calculator.matrix, reference_data.snapshot.array("matrix"))
+    assert not reference_data.type_calculator.matrix.flags.writeable
+    with open(data_dir / "move_data.json", "r") as f:
+        assert dict(reference_data.moves) == json.load(f)["moves"]
+    with open(data_dir / "cache" / "tyranitar.json", "r") as f:
+        assert reference_data.cached_pokemon("tyranitar") == json.load(f)
+
+
+def test_reference_data_falls_back_when_stale(data_dir, snapshot_path):
+    touch(data_dir / "move_data.json")
+    reference_data = ReferenceData(data_dir, snapshot_path)
+
+    assert reference_data.snapshot is None
+    assert reference_data.cached_pokemon("tyranitar") is None
+    with open(data_dir / "move_data.json", "r") as f:
+        assert dict(reference_data.moves) == json.load(f)["moves"]
+
+
+def test_moves_version_follows_move_data(data_dir):
+    reference_data = ReferenceData(data_dir, data_dir / "missing.snapshot")
+    version = reference_data.moves_version
+
+    with open(data_dir / "move_data.json", "r") as f:
+        move_data = json.load(f)
+    move_data["moves"].pop(next(iter(move_data["moves"])))
+    with open(data_dir / "move_data.json", "w") as f:
+        json.dump(move_data, f)
+
+    assert reference_data.moves_version == version
+    reference_data.reload()
+    assert reference_data.moves_version != version
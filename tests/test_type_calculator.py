@@ -0,0 +1,141 @@
+"""
+Tests for the dense type effectiveness matrix.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from utils.type_calculator import NO_TYPE, TYPE_IDS, TYPE_NAMES, TypeCalculator
+
+
+def test_matrix_shape(calculator):
+    # One row per attacking type; one column per defending type plus the NO_TYPE padding column
+    assert calculator.matrix.shape == (len(TYPE_NAMES), len(TYPE_NAMES) + 1)
+    assert np.all(calculator.matrix[:, NO_TYPE] == 1.0)
+
+
+@pytest.mark.parametrize(
+    "attacker, defenders, expected",
+    [
+        ("fire", ["grass", "steel"], 4.0),
+        ("ground", ["flying"], 0.0),
+        ("electric", ["water", "flying"], 4.0),
+        ("ice", ["dragon", "ground"], 4.0),
+        ("fighting", ["rock", "dark"], 4.0),
+        ("water", ["fire"], 2.0),
+        ("grass", ["fire", "flying"], 0.25),
+        ("normal", ["ghost"], 0.0),
+        ("dragon", ["fairy"], 0.0),
+        ("ghost", ["normal", "psychic"], 0.0),
+        ("psychic", ["poison"], 2.0),
+        ("electric", ["ground", "water"], 0.0),
+        ("bug", ["grass", "steel"], 1.0),
+    ],
+)
+def test_known_multipliers(calculator, attacker, defenders, expected):
+    assert calculator.multiplier(attacker, defenders) == expected
+
+
+def test_multipliers_grid_matches_single_lookups(calculator):
+    attackers = ["fire", "water", "ground", "ice"]
+    defenders = [["grass", "steel"], ["water"], ["dragon", "ground"], ["flying"]]
+    grid = calculator.multipliers(attackers, defenders)
+
+    assert grid.shape == (len(attackers), len(defenders))
+    for i, attacker in enumerate(attackers):
+        for j, types in enumerate(defenders):
+            assert grid[i, j] == calculator.multiplier(attacker, types)
+
+
+def test_type_order_does_not_matter(calculator):
+    for attacker in TYPE_NAMES:
+        assert calculator.multiplier(attacker, ["rock", "dark"]) == calculator.multiplier(attacker, ["dark", "rock"])
+
+
+def test_unknown_types_are_rejected(calculator):
+    with pytest.raises(ValueError):
+        calculator.multiplier("sound", ["normal"])
+    with pytest.raises(ValueError):
+        calculator.multiplier("fire", ["grass", "steel", "bug"])
+
+
+def test_effectiveness_reports_unknown_types(calculator):
+    assert calculator.get_effectiveness("grass", ["grss"]) == {"error": "Unknown type: grss"}
+    assert calculator.get_effectiveness("sound", ["normal"]) == {"error": "Unknown type: sound"}
+    assert calculator.get_effectiveness("fire", ["grass", "steel"])["multiplier"] == 4.0
+
+
+def test_wrapped_and_bare_relations_compile_alike(calculator):
+    wrapped = {name: {"damage_relations": relations} for name, relations in calculator.type_data.items()}
+
+    assert np.array_equal(TypeCalculator._compile_matrix(wrapped), calculator.matrix)
+
+
+@pytest.mark.parametrize(
+    "format, chart",
+    [("gen1ou", "gen1"), ("gen2ou", "gen2-5"), ("gen5uu", "gen2-5"), ("gen6ou", "gen6+"), ("OU", "gen6+")],
+)
+def test_formats_select_generation_charts(calculator, format, chart):
+    assert calculator.for_format(format).chart == chart
+
+
+@pytest.mark.parametrize(
+    "format, attacker, defenders, expected",
+    [
+        # Ghost failed to hit Psychic and Bug and Poison were mutually super effective in gen 1
+        ("gen1ou", "ghost", ["psychic"], 0.0),
+        ("gen1ou", "bug", ["poison"], 2.0),
+        ("gen1ou", "poison", ["bug"], 2.0),
+        ("gen1ou", "ice", ["fire"], 1.0),
+        # Steel resisted Ghost and Dark until gen 6
+        ("gen4ou", "ghost", ["steel"], 0.5),
+        ("gen4ou", "dark", ["steel"], 0.5),
+        ("gen4ou", "ghost", ["psychic"], 2.0),
+        ("gen6ou", "ghost", ["steel"], 1.0),
+        ("gen6ou", "dark", ["steel"], 1.0),
+    ],
+)
+def test_generation_chart_differences(calculator, format, attacker, defenders, expected):
+    assert calculator.for_format(format).multiplier(attacker, defenders) == expected
+
+
+def test_types_missing_from_older_charts(calculator):
+    gen1, gen5 = calculator.for_format("gen1ou"), calculator.for_format("gen5ou")
+
+    with pytest.raises(ValueError):
+        gen1.multiplier("dark", ["normal"])
+    assert gen1.chart_types(["steel", "ground"]) == ["ground"]
+    assert gen5.chart_types(["water", "fairy"]) == ["water"]
+    # A primary Fairy type was Normal before gen 6
+    assert gen5.chart_types(["fairy"]) == ["normal"]
+    assert gen5.chart_types(["fairy", "flying"]) == ["normal", "flying"]
+    assert gen5.chart_types(["normal", "fairy"]) == ["normal"]
+    assert gen1.chart_types(["fairy", "flying"]) == ["normal", "flying"]
+    assert gen5.encode_chart_types(["fairy"]) == (TYPE_IDS["normal"], NO_TYPE)
+    assert calculator.chart_types(["fairy"]) == ["fairy"]
+
+
+def test_bootstrap_skips_non_battle_types(type_cache_dir, tmp_path, monkeypatch):
+    with open(type_cache_dir / "type_data.json", "r") as f:
+        relations = json.load(f)
+
+    class Client:
+        def get_json(self, url):
+            name = url.rsplit("/", 1)[-1]
+            if name.startswith("type?"):
+                return {"results": [{"name": n, "url": f"type/{n}"} for n in [*TYPE_NAMES, "shadow", "unknown"]]}
+            if name not in TYPE_IDS:
+                raise ConnectionError(f"no {name}")
+            return {"damage_relations": relations[name].get("damage_relations", relations[name])}
+
+    monkeypatch.setattr("utils.type_calculator.get_http_client", Client)
+    cache_dir = tmp_path / "cold"
+    cache_dir.mkdir()
+    calculator = TypeCalculator(cache_dir=cache_dir)
+
+    assert calculator.multiplier("fairy", ["dragon"]) == 2.0
+    with open(cache_dir / "type_data.json", "r") as f:
+        assert sorted(json.load(f)) == sorted(TYPE_NAMES)
+    assert not (cache_dir / "type_data.partial.json").exists()
@@ -0,0 +1,83 @@
+"""
+Tests for the precomputed dual-type defensive profile table and its npz cache.
+"""
+
+import io
+
+import numpy as np
+import pytest
+
+from utils.type_calculator import TYPE_COMBOS, TYPE_IDS, TYPE_NAMES, TypeCalculator
+
+
+def test_profile_table_covers_every_combo(calculator):
+    # 18 single types and 153 dual types, each with a multiplier per attacking type
+    assert len(TYPE_COMBOS) == 171
+    assert calculator.profiles.shape == (171, len(TYPE_NAMES))
+
+
+def test_profiles_match_matrix_lookups(calculator):
+    for combo, (first, second) in enumerate(TYPE_COMBOS):
+        types = [TYPE_NAMES[first]] + ([TYPE_NAMES[second]] if second < len(TYPE_NAMES) else [])
+        for attacker in TYPE_NAMES:
+            assert calculator.profiles[combo, TYPE_IDS[attacker]] == calculator.multiplier(attacker, types)
+
+
+def test_known_defensive_profiles(calculator):
+    tyranitar = calculator.defensive_profile(["rock", "dark"])
+    assert tyranitar["multipliers"]["fighting"] == 4.0
+    assert tyranitar["multipliers"]["psychic"] == 0.0
+    assert tyranitar["immunities"] == ["psychic"]
+    assert set(tyranitar["weaknesses"]) == {"fighting", "ground", "bug", "steel", "water", "grass", "fairy"}
+
+    garchomp = calculator.defensive_profile(["dragon", "ground"])
+    assert garchomp["multipliers"]["ice"] == 4.0
+    assert garchomp["immunities"] == ["electric"]
+    assert set(garchomp["resistances"]) == {"poison", "rock", "fire"}
+
+    ferrothorn = calculator.defensive_profile(["grass", "steel"])
+    assert ferrothorn["multipliers"]["fire"] == 4.0
+    assert ferrothorn["immunities"] == ["poison"]
+    assert ferrothorn["multipliers"]["grass"] == 0.25
+
+
+def test_combo_order_does_not_matter(calculator):
+    assert calculator.combo_id(["rock", "dark"]) == calculator.combo_id(["dark", "rock"])
+    with pytest.raises(ValueError):
+        calculator.combo_id(["fire", "fire"])
+
+
+def test_npz_round_trip(type_cache_dir, monkeypatch):
+    built = TypeCalculator(cache_dir=type_cache_dir)
+    assert (type_cache_dir / "type_profiles.npz").exists()
+
+    # Older charts are always derived; the current chart's profiles must come from the npz
+    build = TypeCalculator._build_profiles
+    built_from = []
+    monkeypatch.setattr(TypeCalculator, "_build_profiles", staticmethod(lambda m: built_from.append(m) or build(m)))
+    loaded = TypeCalculator(cache_dir=type_cache_dir)
+
+    assert np.array_equal(loaded.profiles, built.profiles)
+    assert not any(np.array_equal(matrix, loaded.matrix) for matrix in built_from)
+
+
+def test_stale_npz_is_rebuilt(type_cache_dir):
+    profile_file = type_cache_dir / "type_profiles.npz"
+    expected = TypeCalculator(cache_dir=type_cache_dir).profiles
+
+    buffer = io.BytesIO()
+    np.savez(buffer, profiles=np.zeros_like(expected), chart_version=np.array("outdated"))
+    profile_file.write_bytes(buffer.getvalue())
+
+    rebuilt = TypeCalculator(cache_dir=type_cache_dir)
+    assert np.array_equal(rebuilt.profiles, expected)
+    with np.load(profile_file) as stored:
+        assert str(stored["chart_version"]) == rebuilt.chart_version
+        assert np.array_equal(stored["profiles"], expected)
+
+
+def test_unreadable_npz_is_rebuilt(type_cache_dir):
+    (type_cache_dir / "type_profiles.npz").write_bytes(b"not an npz")
+
+    calculator = TypeCalculator(cache_dir=type_cache_dir)
+    assert np.array_equal(calculator.profiles, TypeCalculator._build_profiles(calculator.matrix))
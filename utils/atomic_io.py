@@ -0,0 +1,34 @@
+"""
+Atomic file writes for on-disk caches.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write bytes to a temporary file and rename it over path.
+
+    Readers see either the old file or the complete new one, never a partial
+    write, and concurrent writers cannot interleave their output.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    """Write JSON to a temporary file and rename it over path."""
+    write_bytes_atomic(path, json.dumps(data, indent=indent).encode())
@@ -0,0 +1,218 @@
+"""
+Shared HTTP client for PokeAPI requests.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+# Base URL for PokeAPI; point it at a stand-in server for benchmarks
+POKEAPI_BASE = os.getenv("POKEAPI_BASE", "https://pokeapi.co/api/v2").rstrip("/")
+
+# Connection pool and timeout defaults, overridable through the environment
+DEFAULT_POOL_SIZE = int(os.getenv("POKEAPI_POOL_SIZE", "20"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("POKEAPI_CONNECT_TIMEOUT", "3.05"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("POKEAPI_READ_TIMEOUT", "10"))
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class HTTPClient:
+    """Process-wide HTTP client with keep-alive connection pooling.
+
+    Blocking callers use a pooled requests.Session. Coroutines use an
+    aiohttp.ClientSession with the same pool size and timeouts; one is kept
+    per event loop because aiohttp sessions are bound to the loop they were
+    created on.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ):
+        """Initialize client settings. Connections are opened lazily."""
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self._session: Optional[requests.Session] = None
+        self._async_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Get the pooled session, creating it on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        """Create a session whose adapters keep up to pool_size connections per host."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept": "application/json"})
+        return session
+
+    def get_json(self, url: str, timeout: Optional[Timeout] = None) -> Any:
+        """GET a URL and decode the JSON body, raising on HTTP errors."""
+        response = self.session.get(url, timeout=timeout or self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """Get the aiohttp session for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            self._evict_dead_sessions()
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size)
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._async_timeout(self.timeout),
+                headers={"Accept": "application/json"},
+            )
+            self._async_sessions[loop] = session
+        return session
+
+    @staticmethod
+    def _async_timeout(timeout: Timeout) -> aiohttp.ClientTimeout:
+        """Convert a requests-style timeout into an aiohttp.ClientTimeout."""
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            return aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        return aiohttp.ClientTimeout(total=timeout)
+
+    async def get_json_async(self, url: str, timeout: Optional[Timeout] = None) -> Any:
+        """GET a URL without blocking the event loop and decode the JSON body."""
+        session = self._get_async_session()
+        request_timeout = self._async_timeout(timeout or self.timeout)
+        async with session.get(url, timeout=request_timeout) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    @staticmethod
+    def _close_idle(loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession) -> None:
+        """Close a session by running its close on its own loop while that loop is idle.
+
+        Run from a thread with no running loop. If the loop starts running in
+        the meantime, the close is scheduled on it instead.
+        """
+        try:
+            loop.run_until_complete(session.close())
+        except RuntimeError:
+            if loop.is_closed():
+                session.detach()
+            else:
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    def _evict_dead_sessions(self) -> None:
+        """Drop sessions whose event loop has closed.
+
+        Nothing can run on a closed loop and the connections died with it, so
+        the session is only marked closed.
+        """
+        for loop, session in list(self._async_sessions.items()):
+            if loop.is_closed():
+                self._async_sessions.pop(loop, None)
+                session.detach()
+
+    def _close_sync_session(self) -> None:
+        """Close the pooled requests session."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def close(self) -> None:
+        """Close pooled connections from synchronous code.
+
+        Every aiohttp session is closed on its own loop: on a running loop by
+        scheduling the close there, on an idle loop by running it from a
+        helper thread. Sessions of closed loops are dropped.
+        """
+        self._close_sync_session()
+        self._evict_dead_sessions()
+        for loop, session in list(self._async_sessions.items()):
+            self._async_sessions.pop(loop, None)
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+            else:
+                # The calling thread may be running another loop, which cannot run this one
+                closer = threading.Thread(target=self._close_idle, args=(loop, session))
+                closer.start()
+                closer.join()
+
+    async def aclose(self) -> None:
+        """Close pooled connections, including every event loop's aiohttp session on its own loop."""
+        self._close_sync_session()
+        self._evict_dead_sessions()
+        running = asyncio.get_running_loop()
+        for loop, session in list(self._async_sessions.items()):
+            self._async_sessions.pop(loop, None)
+            if loop is running:
+                await session.close()
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+            else:
+                await asyncio.to_thread(self._close_idle, loop, session)
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Get the shared process-wide HTTP client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient()
+    return _client
+
+
+def configure_http_client(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_READ_TIMEOUT,
+) -> HTTPClient:
+    """Replace the shared client with one using the given pool size and timeouts.
+
+    From a coroutine, use aconfigure_http_client so the old client's aiohttp
+    session on the running loop is closed on that loop.
+    """
+    global _client
+    with _client_lock:
+        old, _client = _client, HTTPClient(pool_size, connect_timeout, read_timeout)
+    if old is not None:
+        old.close()
+    return _client
+
+
+async def aconfigure_http_client(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_READ_TIMEOUT,
+) -> HTTPClient:
+    """Replace the shared client from a coroutine, closing all of the old client's sessions."""
+    global _client
+    with _client_lock:
+        old, _client = _client, HTTPClient(pool_size, connect_timeout, read_timeout)
+    if old is not None:
+        await old.aclose()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client's connections, e.g. on server shutdown."""
+    if _client is not None:
+        await _client.aclose()
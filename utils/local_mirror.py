@@ -0,0 +1,230 @@
+"""
+Local SQLite mirror of PokeAPI data.
+
+Build it from a checkout of the PokeAPI api-data repository
+(https://github.com/PokeAPI/api-data):
+
+    python -m utils.local_mirror /path/to/api-data
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from utils.http_client import POKEAPI_BASE
+
+DEFAULT_DB_PATH = Path(os.getenv("POKEAPI_MIRROR_DB", Path(__file__).parent.parent / "data" / "pokeapi.sqlite3"))
+
+# Base URL of the resource URLs stored in mirrored bodies, as returned by the live API
+STORED_BASE = "https://pokeapi.co/api/v2"
+
+# Resources imported by default; "pokemon/encounters" is the per-Pokemon encounters sub-resource
+DEFAULT_RESOURCES = (
+    "pokemon",
+    "pokemon/encounters",
+    "pokemon-species",
+    "ability",
+    "move",
+    "type",
+    "evolution-chain",
+    "generation",
+)
+
+SCHEMA = """
+CREATE TABLE resources (
+    resource TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (resource, id)
+);
+CREATE INDEX idx_resources_name ON resources (resource, name);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def parse_endpoint(endpoint: str) -> Tuple[str, Optional[str], Dict[str, List[str]]]:
+    """Split an endpoint like 'pokemon/25/encounters' into ('pokemon/encounters', '25', {})."""
+    path, _, query = endpoint.partition("?")
+    parts = path.strip("/").split("/")
+    resource = parts[0] if len(parts) < 3 else f"{parts[0]}/{parts[2]}"
+    key = parts[1] if len(parts) > 1 else None
+    return resource, key, parse_qs(query)
+
+
+class LocalMirror:
+    """Read-only view of a local PokeAPI mirror database."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, base_url: str = POKEAPI_BASE):
+        """Initialize with the database path and the API base URL that returned resource URLs point at.
+
+        The database is opened on first use.
+        """
+        self.db_path = Path(db_path)
+        self.base_url = base_url.rstrip("/")
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether a mirror database exists."""
+        return self._connection is not None or self.db_path.exists()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database read-only, or return None if it does not exist."""
+        if self._connection is None and self.db_path.exists():
+            self._connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+        return self._connection
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        """Run a read query, returning no rows if the mirror is unavailable."""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return []
+            return connection.execute(sql, params).fetchall()
+
+    def get(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Get the stored response for a PokeAPI endpoint, or None if not mirrored."""
+        resource, key, query = parse_endpoint(endpoint)
+        if key is None:
+            if resource not in DEFAULT_RESOURCES or not self.count(resource):
+                return None
+            limit, offset = query.get("limit", ["20"])[0], query.get("offset", ["0"])[0]
+            if not (limit.isdigit() and offset.isdigit()):
+                return {"error": f"limit and offset must be non-negative integers, got {limit!r} and {offset!r}"}
+            return self.list(resource, int(limit), int(offset))
+
+        if key.isdigit():
+            rows = self._query("SELECT body FROM resources WHERE resource = ? AND id = ?", (resource, int(key)))
+        else:
+            rows = self._query("SELECT body FROM resources WHERE resource = ? AND name = ?", (resource, key))
+        return json.loads(self._rebase(rows[0][0])) if rows else None
+
+    def _rebase(self, body: str) -> str:
+        """Point the resource URLs in a stored body at the configured API base."""
+        if self.base_url == STORED_BASE:
+            return body
+        return body.replace(f'"{STORED_BASE}/', f'"{self.base_url}/')
+
+    def list(self, resource: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """Get a page of a resource listing in the PokeAPI list response shape."""
+        rows = self._query(
+            "SELECT id, name FROM resources WHERE resource = ? ORDER BY id LIMIT ? OFFSET ?",
+            (resource, limit, offset),
+        )
+        return {
+            "count": self.count(resource),
+            "results": [{"name": name, "url": f"{self.base_url}/{resource}/{id_}/"} for id_, name in rows],
+        }
+
+    def count(self, resource: str) -> int:
+        """Count mirrored entries of a resource."""
+        rows = self._query("SELECT COUNT(*) FROM resources WHERE resource = ?", (resource,))
+        return rows[0][0] if rows else 0
+
+    def iter_resource(self, resource: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over every mirrored body of a resource in id order."""
+        for (body,) in self._query("SELECT body FROM resources WHERE resource = ? ORDER BY id", (resource,)):
+            yield json.loads(self._rebase(body))
+
+    def close(self) -> None:
+        """Close the database so the next lookup reopens it, e.g. after a re-import."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def _find_api_root(source_dir: Path) -> Path:
+    """Locate the api/v2 directory inside an api-data checkout."""
+    for candidate in (source_dir, source_dir / "v2", source_dir / "api" / "v2", source_dir / "data" / "api" / "v2"):
+        if (candidate / "pokemon").is_dir():
+            return candidate
+    raise FileNotFoundError(f"No api/v2 tree with a pokemon directory found under {source_dir}")
+
+
+def _iter_dump(api_root: Path, resource: str) -> Iterator[Tuple[int, Optional[str], str]]:
+    """Yield (id, name, compact body) for each entry of a resource in the dump."""
+    base, _, sub = resource.partition("/")
+    resource_dir = api_root / base
+    if not resource_dir.is_dir():
+        return
+
+    for entry in resource_dir.iterdir():
+        if not entry.name.isdigit():
+            continue
+        index_file = entry / sub / "index.json" if sub else entry / "index.json"
+        if not index_file.exists():
+            continue
+
+        # api-data uses site-relative URLs; store the same absolute URLs the live API returns
+        raw = index_file.read_text(encoding="utf-8").replace('"/api/v2/', f'"{STORED_BASE}/')
+        body = json.loads(raw)
+        name = body.get("name") if isinstance(body, dict) else None
+        if sub and name is None:
+            # Sub-resources such as encounters are lists keyed by their parent's name
+            parent_file = entry / "index.json"
+            if parent_file.exists():
+                name = json.loads(parent_file.read_text(encoding="utf-8")).get("name")
+        yield int(entry.name), name, json.dumps(body, separators=(",", ":"))
+
+
+def import_api_data(
+    source_dir: Path, db_path: Path = DEFAULT_DB_PATH, resources: Tuple[str, ...] = DEFAULT_RESOURCES
+) -> Dict[str, int]:
+    """Import an api-data JSON tree into a new mirror database and return entries per resource.
+
+    The database is built next to db_path and renamed over it when complete, so
+    running servers never see a partial import.
+    """
+    api_root = _find_api_root(Path(source_dir))
+    db_path = Path(db_path)
+    tmp_path = db_path.with_name(f".{db_path.name}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    counts = {}
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.executescript(SCHEMA)
+        for resource in resources:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO resources (resource, id, name, body) VALUES (?, ?, ?, ?)",
+                    ((resource, id_, name, body) for id_, name, body in _iter_dump(api_root, resource)),
+                )
+            counts[resource] = connection.execute(
+                "SELECT COUNT(*) FROM resources WHERE resource = ?", (resource,)
+            ).fetchone()[0]
+        with connection:
+            connection.execute("INSERT INTO meta (key, value) VALUES ('source', ?)", (str(api_root),))
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+    os.replace(tmp_path, db_path)
+    return counts
+
+
+def main():
+    """Command line entry point for building the mirror."""
+    parser = argparse.ArgumentParser(description="Import a PokeAPI api-data dump into a local SQLite mirror.")
+    parser.add_argument("source", type=Path, help="Path to an api-data checkout or its api/v2 directory")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help="Mirror database to create")
+    parser.add_argument("--resources", nargs="+", default=list(DEFAULT_RESOURCES), help="Resources to import")
+    args = parser.parse_args()
+
+    counts = import_api_data(args.source, args.db, tuple(args.resources))
+    for resource, count in counts.items():
+        print(f"{resource}: {count}")
+    print(f"Mirror written to {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+LRU cache of matchup analyses keyed by canonical team multisets.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from utils.atomic_io import write_json_atomic
+
+
+def canonical_key(team1: Sequence[str], team2: Sequence[str], format: str, scoring_priority: str) -> Tuple[str, bool]:
+    """Get the canonical key of a matchup and whether the teams are swapped relative to it.
+
+    Each team is a multiset, so member order does not matter, and the team
+    that sorts first is always the key's first team, so a matchup and its
+    mirror share one entry.
+    """
+    first, second = sorted(n.lower() for n in team1), sorted(n.lower() for n in team2)
+    swapped = second < first
+    if swapped:
+        first, second = second, first
+    return json.dumps([first, second, format.upper(), scoring_priority], separators=(",", ":")), swapped
+
+
+def data_version(chart_version: str, moves_version: str, members: Sequence[Dict[str, Any]]) -> str:
+    """Hash the type chart and move data versions and every member's data, in any order, into an entry version."""
+    digests = sorted(hashlib.sha1(json.dumps(m, sort_keys=True).encode()).hexdigest() for m in members)
+    return hashlib.sha1(json.dumps([chart_version, moves_version, digests]).encode()).hexdigest()[:16]
+
+
+class MatchupCache:
+    """Bounded LRU cache of matchup analyses with optional on-disk persistence.
+
+    Entries are stored under a canonical key with a data version. A lookup
+    with a different version, because a member's data, the type chart or
+    the move data changed, drops the entry and misses. With a directory, each entry is
+    also written to its own JSON file, read back on an in-memory miss and
+    deleted when evicted. Cached values are shared between callers and must
+    be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Optional[Path] = None):
+        """Initialize an empty cache, pruning the persisted entries to the newest max_entries."""
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        self._entries: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.directory.glob("*.json"), key=lambda f: f.stat().st_mtime_ns, reverse=True)
+            for stale in files[max_entries:]:
+                stale.unlink(missing_ok=True)
+
+    def _file(self, key: str) -> Path:
+        """Get the persisted entry file of a key."""
+        return self.directory / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _read_file(self, key: str) -> Optional[Tuple[str, Any]]:
+        """Read a persisted (version, value) entry, or None if there is none or it is unreadable."""
+        try:
+            with open(self._file(key), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        return entry["version"], entry["value"]
+
+    def get(self, key: str, version: str) -> Optional[Any]:
+        """Get the value stored for key at this version, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.directory is not None:
+                entry = self._read_file(key)
+                if entry is not None:
+                    self._store(key, entry)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry[0] != version:
+                self._drop(key)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, version: str, value: Any) -> None:
+        """Store a value at a version, evicting the least recently used entries if full."""
+        with self._lock:
+            self._store(key, (version, value))
+            if self.directory is not None:
+                write_json_atomic(self._file(key), {"key": key, "version": version, "value": value})
+
+    def _store(self, key: str, entry: Tuple[str, Any]) -> None:
+        """Put an entry in memory and evict past max_entries. Callers hold the lock."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            if self.directory is not None:
+                self._file(evicted).unlink(missing_ok=True)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry from memory and disk. Callers hold the lock."""
+        self._entries.pop(key, None)
+        if self.directory is not None:
+            self._file(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop all entries, including persisted ones. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            if self.directory is not None:
+                for entry_file in self.directory.glob("*.json"):
+                    entry_file.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss/eviction/invalidation counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self.directory is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
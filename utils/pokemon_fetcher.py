@@ -0,0 +1,121 @@
+"""
+Per-Pokemon data fetching shared by the analysis modules.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.atomic_io import write_json_atomic
+from utils.http_client import get_http_client, POKEAPI_BASE
+from utils.reference_data import ReferenceDataMixin
+from utils.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class PokemonFetcher(ReferenceDataMixin):
+    """Base for modules that fetch Pokemon from PokeAPI through the snapshot and the JSON module cache.
+
+    Subclasses choose the fields they keep by overriding _reduce_pokemon_data,
+    and set with_species to also fetch the pokemon-species payload.
+    """
+
+    # Whether the pokemon-species payload is fetched alongside the pokemon payload
+    with_species = False
+
+    # In-flight fetches shared by all instances, keyed by fetcher class and Pokemon name
+    _inflight = SingleFlight()
+    _inflight_async = AsyncSingleFlight()
+
+    def __init__(self):
+        """Initialize the API base and cache directory."""
+        self.pokeapi_base = POKEAPI_BASE
+        self.cache_dir = Path(__file__).parent.parent / "data" / "cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def fetch_pokemon_data(self, name: str) -> Dict[str, Any]:
+        """Fetch Pokemon data from PokeAPI with caching."""
+        cached = self._read_cache(name)
+        if cached is not None:
+            return cached
+
+        # Concurrent requests for the same Pokemon share one upstream fetch
+        return self._inflight.do((type(self).__name__, name.lower()), lambda: self._fetch_uncached(name))
+
+    def _fetch_uncached(self, name: str) -> Dict[str, Any]:
+        """Fetch and cache Pokemon data unless a concurrent fetch just cached it."""
+        cached = self._read_cache(name)
+        if cached is not None:
+            return cached
+
+        try:
+            client = get_http_client()
+            data = client.get_json(f"{self.pokeapi_base}/pokemon/{name.lower()}")
+            species_data = None
+            if self.with_species:
+                species_data = client.get_json(f"{self.pokeapi_base}/pokemon-species/{name.lower()}")
+            return self._cache_pokemon_data(name, data, species_data)
+
+        except Exception as e:
+            return {"error": f"Failed to fetch data for {name}: {str(e)}"}
+
+    async def fetch_pokemon_data_async(self, name: str) -> Dict[str, Any]:
+        """Fetch Pokemon data from PokeAPI with caching, without blocking the event loop."""
+        cached = self._read_cache(name)
+        if cached is not None:
+            return cached
+
+        return await self._inflight_async.do(
+            (type(self).__name__, name.lower()), lambda: self._fetch_uncached_async(name)
+        )
+
+    async def _fetch_uncached_async(self, name: str) -> Dict[str, Any]:
+        """Fetch and cache Pokemon data unless a concurrent fetch just cached it."""
+        cached = self._read_cache(name)
+        if cached is not None:
+            return cached
+
+        try:
+            client = get_http_client()
+            urls = [f"{self.pokeapi_base}/pokemon/{name.lower()}"]
+            if self.with_species:
+                urls.append(f"{self.pokeapi_base}/pokemon-species/{name.lower()}")
+            data, *species_data = await asyncio.gather(*(client.get_json_async(url) for url in urls))
+            return self._cache_pokemon_data(name, data, species_data[0] if species_data else None)
+
+        except Exception as e:
+            return {"error": f"Failed to fetch data for {name}: {str(e)}"}
+
+    def _read_cache(self, name: str) -> Optional[Dict[str, Any]]:
+        """Read cached Pokemon data from the snapshot or the JSON cache if present."""
+        cached = self.reference_data.cached_pokemon(name)
+        if cached is not None:
+            return cached
+
+        cache_file = self.cache_dir / f"{name.lower()}.json"
+
+        if cache_file.exists():
+            with open(cache_file, "r") as f:
+                return json.load(f)
+        return None
+
+    def _cache_pokemon_data(
+        self, name: str, data: Dict[str, Any], species_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Reduce PokeAPI payloads to the fields we use and cache them."""
+        pokemon_data = self._reduce_pokemon_data(data, species_data)
+
+        write_json_atomic(self.cache_dir / f"{name.lower()}.json", pokemon_data)
+
+        return pokemon_data
+
+    def _reduce_pokemon_data(self, data: Dict[str, Any], species_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Reduce a PokeAPI pokemon payload to id, name, types, stats, ability names and move names."""
+        return {
+            "id": data["id"],
+            "name": data["name"],
+            "types": [t["type"]["name"] for t in data["types"]],
+            "stats": {s["stat"]["name"]: s["base_stat"] for s in data["stats"]},
+            "abilities": [a["ability"]["name"] for a in data["abilities"]],
+            "moves": [m["move"]["name"] for m in data["moves"]],
+        }
@@ -0,0 +1,76 @@
+"""
+Field projections that reduce raw PokeAPI payloads to compact documents.
+"""
+
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+# Base stat names in PokeAPI order
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+
+
+def _english(entries: Sequence[Dict[str, Any]], key: str) -> Optional[str]:
+    """Get the first English entry text from a localized PokeAPI list."""
+    for entry in entries:
+        if entry.get("language", {}).get("name") == "en":
+            return " ".join(entry[key].split())
+    return None
+
+
+def id_from_url(url: Optional[str]) -> Optional[int]:
+    """Get the trailing numeric id from a PokeAPI resource URL, or None if it has none."""
+    tail = (url or "").rstrip("/").rsplit("/", 1)[-1]
+    return int(tail) if tail.isdigit() else None
+
+
+# Fields derived from the raw payload; any other requested field is copied as-is
+POKEMON_PROJECTORS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "types": lambda d: [t["type"]["name"] for t in d["types"]],
+    "stats": lambda d: {s["stat"]["name"]: s["base_stat"] for s in d["stats"]},
+    "abilities": lambda d: [{"name": a["ability"]["name"], "is_hidden": a["is_hidden"]} for a in d["abilities"]],
+    "moves": lambda d: [m["move"]["name"] for m in d["moves"]],
+    "species": lambda d: d["species"]["name"],
+    "sprites": lambda d: {"front_default": d["sprites"]["front_default"], "front_shiny": d["sprites"]["front_shiny"]},
+}
+
+SPECIES_PROJECTORS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "generation": lambda d: d["generation"]["name"],
+    "evolution_chain_id": lambda d: id_from_url((d.get("evolution_chain") or {}).get("url")),
+    "evolves_from_species": lambda d: (d.get("evolves_from_species") or {}).get("name"),
+    "egg_groups": lambda d: [g["name"] for g in d["egg_groups"]],
+    "growth_rate": lambda d: d["growth_rate"]["name"],
+    "genus": lambda d: _english(d.get("genera", []), "genus"),
+    "flavor_text": lambda d: _english(d.get("flavor_text_entries", []), "flavor_text"),
+    "varieties": lambda d: [v["pokemon"]["name"] for v in d.get("varieties", [])],
+}
+
+PROJECTORS = {"pokemon": POKEMON_PROJECTORS, "pokemon-species": SPECIES_PROJECTORS}
+
+# Default compact profiles returned by the data tools
+SLIM_POKEMON_FIELDS: Tuple[str, ...] = ("id", "name", "types", "stats", "abilities", "moves")
+SLIM_SPECIES_FIELDS: Tuple[str, ...] = (
+    "id",
+    "name",
+    "generation",
+    "evolution_chain_id",
+    "evolves_from_species",
+    "is_legendary",
+    "is_mythical",
+    "egg_groups",
+    "genus",
+    "flavor_text",
+)
+
+
+def project(resource: str, data: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """Project a raw payload of the given resource type onto the requested top-level fields.
+
+    Unknown fields are skipped.
+    """
+    projectors = PROJECTORS.get(resource, {})
+    result = {}
+    for field in fields:
+        if field in projectors:
+            result[field] = projectors[field](data)
+        elif field in data:
+            result[field] = data[field]
+    return result
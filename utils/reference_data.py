@@ -0,0 +1,165 @@
+"""
+Process-wide registry of read-only reference data shared by all modules.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from utils.snapshot import DATA_DIR, DEFAULT_SNAPSHOT_PATH, REFERENCE_FILES, Snapshot, open_snapshot
+from utils.type_calculator import TypeCalculator
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceData:
+    """Lazily loaded reference data: type chart, roles, archetypes, formats and moves.
+
+    Each item is parsed once on first use and then shared, from the binary
+    snapshot when a fresh one exists and from the JSON data files otherwise.
+    Values must be treated as read-only; JSON data is exposed as read-only
+    mappings. reload() builds a complete new set of values before swapping it
+    in, so readers see either the old data or the new data, never a mix.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, snapshot_path: Path = DEFAULT_SNAPSHOT_PATH):
+        """Initialize with the data directory and snapshot path. Nothing is loaded until first use."""
+        self.data_dir = Path(data_dir)
+        self.snapshot_path = Path(snapshot_path)
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # Each loader gets the snapshot (or None) to read from
+        self._loaders: Dict[str, Callable[[Optional[Snapshot]], Any]] = {
+            "snapshot": lambda _: open_snapshot(self.snapshot_path, self.data_dir),
+            "type_calculator": self._load_type_calculator,
+            "pokemon_roles": lambda snapshot: self._load_json("pokemon_roles", snapshot),
+            "team_archetypes": lambda snapshot: self._load_json("team_archetypes", snapshot),
+            "formats": lambda snapshot: self._load_json("formats", snapshot),
+            "move_data": lambda snapshot: self._load_json("move_data", snapshot),
+            "moves_version": lambda snapshot: self._digest(self._load_json("move_data", snapshot)),
+        }
+
+    def _load_json(self, name: str, snapshot: Optional[Snapshot]) -> Mapping[str, Any]:
+        """Load a JSON data file as a read-only mapping, or an empty one if it is unreadable."""
+        if snapshot is not None and name in snapshot.sections:
+            return MappingProxyType(snapshot.json(name))
+        try:
+            with open(self.data_dir / REFERENCE_FILES[name], "r") as f:
+                return MappingProxyType(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load reference data {REFERENCE_FILES[name]}: {e}")
+            return MappingProxyType({})
+
+    @staticmethod
+    def _digest(data: Mapping[str, Any]) -> str:
+        """Hash JSON data into a short version string."""
+        return hashlib.sha1(json.dumps(dict(data), sort_keys=True).encode()).hexdigest()[:12]
+
+    def _load_type_calculator(self, snapshot: Optional[Snapshot]) -> TypeCalculator:
+        """Build the type calculator, reusing the snapshot's type data, matrix and profile table when present."""
+        if snapshot is not None:
+            return TypeCalculator(
+                type_data=snapshot.json("type_data"),
+                matrix=snapshot.array("matrix"),
+                profiles=snapshot.array("profiles"),
+            )
+        return TypeCalculator()
+
+    def _get(self, name: str) -> Any:
+        """Get an item, loading it on first use."""
+        values = self._values
+        if name not in values:
+            with self._lock:
+                if name not in self._values:
+                    values = dict(self._values)
+                    if "snapshot" not in values:
+                        values["snapshot"] = self._loaders["snapshot"](None)
+                    values[name] = self._loaders[name](values["snapshot"])
+                    self._values = values
+                values = self._values
+        return values[name]
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        """The memory-mapped snapshot, or None if there is none or it is stale."""
+        return self._get("snapshot")
+
+    @property
+    def type_calculator(self) -> TypeCalculator:
+        """Shared type chart and effectiveness calculator."""
+        return self._get("type_calculator")
+
+    @property
+    def pokemon_roles(self) -> Mapping[str, Any]:
+        """Format-keyed Pokemon role data from pokemon_roles.json."""
+        return self._get("pokemon_roles")
+
+    @property
+    def team_archetypes(self) -> Mapping[str, Any]:
+        """Team strategies, cores and keywords from team_archetypes.json."""
+        return self._get("team_archetypes")
+
+    @property
+    def formats(self) -> Mapping[str, Any]:
+        """Format rules keyed by upper-case format name from formats.json."""
+        return self._get("formats")
+
+    @property
+    def moves(self) -> Mapping[str, Any]:
+        """Type, category and base power of common damaging moves from move_data.json."""
+        return self._get("move_data").get("moves", {})
+
+    @property
+    def moves_version(self) -> str:
+        """Digest of move_data.json, which changes whenever the move data does."""
+        return self._get("moves_version")
+
+    def get_format(self, format: str) -> Dict[str, Any]:
+        """Get the rules of a format, or a placeholder for unknown formats."""
+        return dict(self.formats.get(format.upper(), {"name": format, "description": "Custom format"}))
+
+    def cached_pokemon(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a per-Pokemon module cache entry from the snapshot, if it has an up-to-date one."""
+        snapshot = self.snapshot
+        return snapshot.pokemon(name) if snapshot is not None else None
+
+    def reload(self) -> None:
+        """Re-open the snapshot, re-read every item that has been loaded and swap them all in at once."""
+        with self._lock:
+            values = {"snapshot": self._loaders["snapshot"](None)}
+            for name in self._values:
+                if name != "snapshot":
+                    values[name] = self._loaders[name](values["snapshot"])
+            self._values = values
+
+
+class ReferenceDataMixin:
+    """Gives a module the shared reference data registry and its type calculator."""
+
+    @property
+    def reference_data(self) -> ReferenceData:
+        """Shared process-wide reference data registry."""
+        return get_reference_data()
+
+    @property
+    def type_calculator(self) -> TypeCalculator:
+        """Shared type calculator from the reference data registry."""
+        return self.reference_data.type_calculator
+
+
+_reference_data: Optional[ReferenceData] = None
+_reference_data_lock = threading.Lock()
+
+
+def get_reference_data() -> ReferenceData:
+    """Get the shared process-wide reference data registry."""
+    global _reference_data
+    if _reference_data is None:
+        with _reference_data_lock:
+            if _reference_data is None:
+                _reference_data = ReferenceData()
+    return _reference_data
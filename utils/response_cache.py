@@ -0,0 +1,103 @@
+"""
+In-memory LRU response cache with per-endpoint-family TTLs.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Seconds a response stays fresh, by endpoint family. Species, moves and types
+# change only with new game releases; listings and encounters are cheap to refresh.
+DEFAULT_TTLS = {
+    "pokemon": 24 * 3600,
+    "pokemon-species": 24 * 3600,
+    "pokemon/encounters": 24 * 3600,
+    "ability": 7 * 24 * 3600,
+    "move": 7 * 24 * 3600,
+    "type": 7 * 24 * 3600,
+    "evolution-chain": 7 * 24 * 3600,
+    "generation": 7 * 24 * 3600,
+    "pokemon-list": 3600,
+}
+DEFAULT_TTL = 3600
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Get the TTL family of an endpoint, e.g. 'pokemon/garchomp' -> 'pokemon'."""
+    path, _, query = endpoint.partition("?")
+    parts = path.strip("/").split("/")
+    if len(parts) == 1:
+        return f"{parts[0]}-list" if query or not parts[0] else parts[0]
+    if len(parts) > 2:
+        return f"{parts[0]}/{parts[2]}"
+    return parts[0]
+
+
+class ResponseCache:
+    """Bounded LRU cache of API responses keyed by endpoint.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, ttls: Optional[Dict[str, float]] = None, default_ttl: float = DEFAULT_TTL
+    ):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a fresh cached value, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        ttl = self.ttls.get(endpoint_family(key), self.default_ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,210 @@
+"""
+Compact binary snapshot of reference data and the per-Pokemon module cache.
+
+Build it after changing data files or warming the cache:
+
+    python -m utils.snapshot
+
+The file is a fixed header (magic, format version, table of contents length),
+a compact JSON table of contents, then 64-byte aligned sections. Array sections
+are raw numpy buffers used straight from the memory map, so every worker shares
+the same pages; JSON sections are compact UTF-8 decoded on first use. Each
+section records the size and mtime of the file it was built from, and the
+snapshot is ignored when any of them has changed. Per-Pokemon entries are
+checked the first time each one is read; later edits are picked up when the
+snapshot is re-opened.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.atomic_io import write_bytes_atomic
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_SNAPSHOT_PATH = Path(os.getenv("POKEMON_SNAPSHOT", DATA_DIR / "reference.snapshot"))
+
+MAGIC = b"PKMNSNAP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHQ")
+ALIGNMENT = 64
+
+# Reference data sections and the data files they are built from
+REFERENCE_FILES = {
+    "pokemon_roles": "pokemon_roles.json",
+    "team_archetypes": "team_archetypes.json",
+    "formats": "formats.json",
+    "move_data": "move_data.json",
+    "type_data": "cache/type_data.json",
+}
+
+
+def _file_state(path: Path) -> Optional[List[int]]:
+    """Get [mtime_ns, size] of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class Snapshot:
+    """Read-only view of a memory-mapped snapshot file."""
+
+    def __init__(self, path: Path, data_dir: Path = DATA_DIR):
+        """Map the snapshot file and read its table of contents."""
+        self.path = Path(path)
+        self.data_dir = Path(data_dir)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, toc_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} snapshot")
+        self.toc = json.loads(self._map[HEADER.size : HEADER.size + toc_length])
+        self.sections: Dict[str, Dict[str, Any]] = self.toc["sections"]
+        self.pokemon_entries: Dict[str, List[Any]] = self.toc["pokemon"]
+
+        # Whether each looked-up entry's JSON file is unchanged, checked once per name like the sources at open
+        self._pokemon_fresh: Dict[str, bool] = {}
+
+    @property
+    def stale(self) -> bool:
+        """Whether any reference data file changed since the snapshot was built."""
+        return any(_file_state(self.data_dir / source) != state for source, state in self.toc["sources"].items())
+
+    def _bytes(self, offset: int, length: int) -> bytes:
+        """Read a byte range of the mapped file."""
+        return self._map[offset : offset + length]
+
+    def json(self, name: str) -> Any:
+        """Decode a JSON section."""
+        section = self.sections[name]
+        return json.loads(self._bytes(section["offset"], section["length"]))
+
+    def array(self, name: str) -> np.ndarray:
+        """Get a read-only array section backed directly by the memory map."""
+        section = self.sections[name]
+        count = int(np.prod(section["shape"]))
+        array = np.frombuffer(self._map, dtype=section["dtype"], count=count, offset=section["offset"])
+        return array.reshape(section["shape"])
+
+    def pokemon(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a per-Pokemon cache entry, or None if it is missing or its JSON file had changed when first read."""
+        name = name.lower()
+        entry = self.pokemon_entries.get(name)
+        if entry is None:
+            return None
+        offset, length, state = entry
+        fresh = self._pokemon_fresh.get(name)
+        if fresh is None:
+            fresh = self._pokemon_fresh[name] = _file_state(self.data_dir / "cache" / f"{name}.json") == state
+        if not fresh:
+            return None
+        return json.loads(self._bytes(offset, length))
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self._map.close()
+
+
+def open_snapshot(path: Path = DEFAULT_SNAPSHOT_PATH, data_dir: Path = DATA_DIR) -> Optional[Snapshot]:
+    """Open a snapshot if it exists, is readable and is not stale."""
+    if not Path(path).exists():
+        return None
+    try:
+        snapshot = Snapshot(path, data_dir)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    if snapshot.stale:
+        snapshot.close()
+        return None
+    return snapshot
+
+
+def build_snapshot(path: Path = DEFAULT_SNAPSHOT_PATH, data_dir: Path = DATA_DIR) -> Dict[str, int]:
+    """Compile reference data and the per-Pokemon cache into a snapshot file and return section counts."""
+    # Imported here so reading a snapshot does not depend on the type calculator
+    from utils.type_calculator import TypeCalculator
+
+    data_dir = Path(data_dir)
+    blobs: List[Tuple[str, bytes, Dict[str, Any]]] = []
+    sources = {}
+
+    for name, source in REFERENCE_FILES.items():
+        if name == "type_data":
+            continue
+        sources[source] = _file_state(data_dir / source)
+        if sources[source] is not None:
+            with open(data_dir / source, "r") as f:
+                blobs.append((name, json.dumps(json.load(f), separators=(",", ":")).encode(), {"kind": "json"}))
+
+    # Record the type chart file state before loading, which may create it
+    sources[REFERENCE_FILES["type_data"]] = _file_state(data_dir / REFERENCE_FILES["type_data"])
+    type_calculator = TypeCalculator(cache_dir=data_dir / "cache")
+    sources[REFERENCE_FILES["type_data"]] = _file_state(data_dir / REFERENCE_FILES["type_data"])
+    blobs.append(("type_data", json.dumps(type_calculator.type_data, separators=(",", ":")).encode(), {"kind": "json"}))
+    for name in ("matrix", "profiles"):
+        array = np.ascontiguousarray(getattr(type_calculator, name))
+        blobs.append((name, array.tobytes(), {"kind": "array", "dtype": array.dtype.str, "shape": list(array.shape)}))
+
+    pokemon_blobs = []
+    for cache_file in sorted((data_dir / "cache").glob("*.json")):
+        if cache_file.name.startswith("type_data"):
+            continue
+        state = _file_state(cache_file)
+        with open(cache_file, "r") as f:
+            pokemon_blobs.append((cache_file.stem, json.dumps(json.load(f), separators=(",", ":")).encode(), state))
+
+    # Lay out sections after the header and table of contents, which is sized by a first pass
+    sections, pokemon = {}, {}
+    toc = {"sources": sources, "chart_version": type_calculator.chart_version, "sections": sections, "pokemon": pokemon}
+    body_start = 0
+    while True:
+        offset = body_start
+        for name, blob, meta in blobs:
+            sections[name] = {**meta, "offset": offset, "length": len(blob)}
+            offset = -(-(offset + len(blob)) // ALIGNMENT) * ALIGNMENT
+        for name, blob, state in pokemon_blobs:
+            pokemon[name] = [offset, len(blob), state]
+            offset += len(blob)
+        toc_bytes = json.dumps(toc, separators=(",", ":")).encode()
+        needed = -(-(HEADER.size + len(toc_bytes)) // ALIGNMENT) * ALIGNMENT
+        if needed <= body_start:
+            break
+        body_start = needed
+
+    out = bytearray(offset)
+    out[: HEADER.size] = HEADER.pack(MAGIC, FORMAT_VERSION, len(toc_bytes))
+    out[HEADER.size : HEADER.size + len(toc_bytes)] = toc_bytes
+    for name, blob, _ in blobs:
+        out[sections[name]["offset"] : sections[name]["offset"] + len(blob)] = blob
+    for name, blob, _ in pokemon_blobs:
+        out[pokemon[name][0] : pokemon[name][0] + len(blob)] = blob
+
+    write_bytes_atomic(path, bytes(out))
+    return {"reference sections": len(blobs), "pokemon": len(pokemon_blobs), "bytes": len(out)}
+
+
+def main():
+    """Command line entry point for building the snapshot."""
+    parser = argparse.ArgumentParser(description="Compile reference data and the Pokemon cache into a snapshot.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_SNAPSHOT_PATH, help="Snapshot file to write")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="Data directory to compile")
+    args = parser.parse_args()
+
+    counts = build_snapshot(args.output, args.data_dir)
+    for section, count in counts.items():
+        print(f"{section}: {count}")
+    print(f"Snapshot written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,48 +2,239 @@
 Type data provider for Pokemon types and relationships.
 """
 
+import copy
+import hashlib
+import io
 import json
-import requests
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.atomic_io import write_bytes_atomic, write_json_atomic
+from utils.http_client import get_http_client, POKEAPI_BASE
+
+logger = logging.getLogger(__name__)
+
+# The 18 battle types in PokeAPI id order; index in this tuple is the type id
+TYPE_NAMES = (
+    "normal",
+    "fighting",
+    "flying",
+    "poison",
+    "ground",
+    "rock",
+    "bug",
+    "ghost",
+    "steel",
+    "fire",
+    "water",
+    "grass",
+    "electric",
+    "psychic",
+    "ice",
+    "dragon",
+    "dark",
+    "fairy",
+)
+TYPE_IDS = {name: i for i, name in enumerate(TYPE_NAMES)}
+
+# Padding id for the missing second type of single-typed Pokemon; its column is all 1.0
+NO_TYPE = len(TYPE_NAMES)
+
+# Concurrent requests used to fetch the type chart on a cold cache
+TYPE_FETCH_CONCURRENCY = 8
+
+# Every defensive type combo: 18 single types (paired with NO_TYPE), then the 153 dual types
+TYPE_COMBOS = np.array(
+    [(a, NO_TYPE) for a in range(NO_TYPE)] + [(a, b) for a in range(NO_TYPE) for b in range(a + 1, NO_TYPE)],
+    dtype=np.intp,
+)
+# Row in TYPE_COMBOS for an encoded (first, second) pair in either order; -1 for invalid pairs
+COMBO_INDEX = np.full((NO_TYPE + 1, NO_TYPE + 1), -1, dtype=np.intp)
+COMBO_INDEX[TYPE_COMBOS[:, 0], TYPE_COMBOS[:, 1]] = np.arange(len(TYPE_COMBOS))
+COMBO_INDEX[TYPE_COMBOS[:, 1], TYPE_COMBOS[:, 0]] = np.arange(len(TYPE_COMBOS))
+
+# Charts by generation range; the last one is the current chart loaded from PokeAPI
+CURRENT_CHART = "gen6+"
+CHART_GENERATIONS = (("gen1", 1), ("gen2-5", 5), (CURRENT_CHART, None))
+
+# Types that did not exist yet in older charts
+CHART_MISSING_TYPES = {"gen1": ("dark", "steel", "fairy"), "gen2-5": ("fairy",)}
+
+# What a missing type was as a Pokemon's primary type before it existed; as a secondary type it was dropped
+MISSING_PRIMARY_TYPES = {"fairy": "normal"}
+
+# (attacker, defender, multiplier) entries where older charts differ from the current one
+CHART_CHANGES = {
+    "gen2-5": (("ghost", "steel", 0.5), ("dark", "steel", 0.5)),
+    "gen1": (("bug", "poison", 2.0), ("poison", "bug", 2.0), ("ghost", "psychic", 0.0), ("ice", "fire", 1.0)),
+}
+
+
+def chart_for_format(format: Optional[str]) -> str:
+    """Get the chart name for a format such as 'gen1ou' or 'gen4uu'.
+
+    Formats without a generation use the current chart.
+    """
+    match = re.match(r"gen(\d+)", (format or "").lower())
+    if match:
+        generation = int(match.group(1))
+        for name, last_generation in CHART_GENERATIONS:
+            if last_generation is None or generation <= last_generation:
+                return name
+    return CURRENT_CHART
+
+
+# Multipliers for each "*_to" damage relation (PokeAPI) or chart entry (type_effectiveness.json)
+RELATION_MULTIPLIERS = {
+    "double_damage_to": 2.0,
+    "half_damage_to": 0.5,
+    "no_damage_to": 0.0,
+    "super_effective": 2.0,
+    "not_very_effective": 0.5,
+    "no_effect": 0.0,
+}
 
 
 class TypeCalculator:
     """Provides Pokemon type data and relationships."""
 
-    def __init__(self):
-        """Initialize with type data sources."""
-        self.pokeapi_base = "https://pokeapi.co/api/v2"
-        self.cache_dir = Path(__file__).parent.parent / "data" / "cache"
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        type_data: Optional[Dict[str, Any]] = None,
+        matrix: Optional[np.ndarray] = None,
+        profiles: Optional[np.ndarray] = None,
+    ):
+        """Initialize with type data sources.
+
+        type_data, matrix and profiles may be passed in pre-loaded, e.g. from a
+        snapshot; matrix and profiles must have been built from the same type data.
+        """
+        self.pokeapi_base = POKEAPI_BASE
+        self.cache_dir = cache_dir or Path(__file__).parent.parent / "data" / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.type_data = self._load_type_data()
+        self.type_data = type_data if type_data is not None else self._load_type_data()
+        if matrix is not None and matrix.shape == (len(TYPE_NAMES), len(TYPE_NAMES) + 1):
+            self.matrix = matrix
+        else:
+            self.matrix = self._compile_matrix(self.type_data)
+        self.chart_version = hashlib.sha256(self.matrix.tobytes()).hexdigest()[:12]
+        if profiles is not None and profiles.shape == (len(TYPE_COMBOS), len(TYPE_NAMES)):
+            self.profiles = profiles
+        else:
+            self.profiles = self._load_profiles()
+        self.chart = CURRENT_CHART
+        self.available_types = TYPE_NAMES
+        self._set_masks()
+
+        # Older generation charts are derived once and share everything but the chart arrays
+        self.charts = {CURRENT_CHART: self}
+        for name, _ in CHART_GENERATIONS:
+            if name != CURRENT_CHART:
+                self.charts[name] = self._derive_chart(name)
+
+    def _set_masks(self) -> None:
+        """Compute the weakness, resistance and immunity masks from the profile table."""
+        self.weak_mask = self.profiles > 1
+        self.resist_mask = (self.profiles < 1) & (self.profiles > 0)
+        self.immune_mask = self.profiles == 0
+
+    def _derive_chart(self, name: str) -> "TypeCalculator":
+        """Build a calculator for an older generation chart from the current one."""
+        chart = copy.copy(self)
+        chart.chart = name
+        chart.available_types = tuple(t for t in TYPE_NAMES if t not in CHART_MISSING_TYPES[name])
+
+        # Apply the changes of every chart from the current one back to this one
+        matrix = self.matrix.copy()
+        for older, _ in reversed(CHART_GENERATIONS[:-1]):
+            for attacker, defender, multiplier in CHART_CHANGES[older]:
+                matrix[TYPE_IDS[attacker], TYPE_IDS[defender]] = multiplier
+            if older == name:
+                break
+        # Types that do not exist yet neither deal nor take modified damage
+        missing = [TYPE_IDS[t] for t in CHART_MISSING_TYPES[name]]
+        matrix[missing, :] = 1.0
+        matrix[:, missing] = 1.0
+
+        chart.matrix = matrix
+        chart.chart_version = hashlib.sha256(matrix.tobytes()).hexdigest()[:12]
+        chart.profiles = self._build_profiles(matrix)
+        chart._set_masks()
+        return chart
+
+    def for_format(self, format: Optional[str]) -> "TypeCalculator":
+        """Get the calculator for the generation chart a format is played with."""
+        return self.charts[chart_for_format(format)]
 
     def _load_type_data(self) -> Dict[str, Any]:
-        """Load type data from cache or fetch from PokeAPI."""
+        """Load type damage relations from cache or fetch them from PokeAPI."""
         cache_file = self.cache_dir / "type_data.json"
 
         if cache_file.exists():
             with open(cache_file, "r") as f:
-                return json.load(f)
+                return {name: entry.get("damage_relations", entry) for name, entry in json.load(f).items()}
 
-        try:
-            # Fetch all type data from PokeAPI
-            response = requests.get(f"{self.pokeapi_base}/type")
-            types = response.json()["results"]
-            type_data = {}
+        type_data = self._bootstrap_type_data()
+        if all(name in type_data for name in TYPE_NAMES):
+            return type_data
 
-            for type_info in types:
-                type_response = requests.get(type_info["url"])
-                type_data[type_info["name"]] = type_response.json()
+        logger.warning(
+            f"Type data bootstrap incomplete ({len(type_data)} types fetched), using the basic chart until it resumes"
+        )
+        return self._get_basic_type_data()
 
-            # Cache the data
-            with open(cache_file, "w") as f:
-                json.dump(type_data, f, indent=2)
+    def _bootstrap_type_data(self) -> Dict[str, Any]:
+        """Fetch every battle type's damage relations from PokeAPI concurrently.
 
-            return type_data
+        Non-battle types such as shadow and unknown are skipped. Each fetched
+        type is saved to type_data.partial.json as it arrives, so an interrupted
+        bootstrap resumes with only the missing types. Once every type is
+        fetched the data is written to type_data.json and the partial file removed.
+        """
+        cache_file = self.cache_dir / "type_data.json"
+        partial_file = self.cache_dir / "type_data.partial.json"
 
+        type_data = {}
+        if partial_file.exists():
+            try:
+                with open(partial_file, "r") as f:
+                    type_data = json.load(f)
+            except ValueError as e:
+                logger.warning(f"Discarding unreadable partial type data {partial_file}: {e}")
+
+        client = get_http_client()
+        try:
+            types = client.get_json(f"{self.pokeapi_base}/type?limit=100")["results"]
         except Exception as e:
-            return self._get_basic_type_data()
+            logger.warning(f"Could not list types from PokeAPI: {e}")
+            return type_data
+
+        missing = [t for t in types if t["name"] in TYPE_IDS and t["name"] not in type_data]
+        failed = []
+        with ThreadPoolExecutor(max_workers=min(TYPE_FETCH_CONCURRENCY, max(len(missing), 1))) as pool:
+            futures = {pool.submit(client.get_json, t["url"]): t["name"] for t in missing}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    type_data[name] = future.result()["damage_relations"]
+                except Exception as e:
+                    failed.append(name)
+                    logger.warning(f"Failed to fetch type {name}: {e}")
+                    continue
+                write_json_atomic(partial_file, type_data)
+
+        if failed:
+            return type_data
+
+        write_json_atomic(cache_file, type_data)
+        partial_file.unlink(missing_ok=True)
+        return type_data
 
     def _get_basic_type_data(self) -> Dict[str, Any]:
         """Fallback type data if API fails."""
@@ -54,44 +245,254 @@ class TypeCalculator:
         except Exception:
             return {}
 
-    def get_effectiveness(self, attacking_type: str, defending_types: List[str]) -> Dict[str, Any]:
-        """Get raw type effectiveness data."""
+    @staticmethod
+    def _compile_matrix(type_data: Dict[str, Any]) -> np.ndarray:
+        """Compile type data into an attacker x defender multiplier matrix.
+
+        Accepts the PokeAPI damage relations (bare or under "damage_relations")
+        and the type_effectiveness.json chart. The matrix has an extra NO_TYPE
+        column of 1.0 so single and dual types index the same way.
+        """
+        chart = type_data.get("type_chart", type_data)
+        matrix = np.ones((len(TYPE_NAMES), len(TYPE_NAMES) + 1), dtype=np.float32)
+
+        for attacker, entry in chart.items():
+            if attacker not in TYPE_IDS:
+                continue
+            relations = entry.get("damage_relations", entry)
+            for relation, multiplier in RELATION_MULTIPLIERS.items():
+                for defender in relations.get(relation, []):
+                    defender = defender["name"] if isinstance(defender, dict) else defender
+                    if defender in TYPE_IDS:
+                        matrix[TYPE_IDS[attacker], TYPE_IDS[defender]] = multiplier
+
+        return matrix
+
+    def _load_profiles(self) -> np.ndarray:
+        """Load the combo x attacking type defensive table, rebuilding it if the chart changed."""
+        profile_file = self.cache_dir / "type_profiles.npz"
+
+        if profile_file.exists():
+            try:
+                with np.load(profile_file) as stored:
+                    if str(stored["chart_version"]) == self.chart_version:
+                        return stored["profiles"]
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable type profile cache {profile_file}: {e}")
+
+        profiles = self._build_profiles(self.matrix)
+
+        buffer = io.BytesIO()
+        np.savez(buffer, profiles=profiles, chart_version=np.array(self.chart_version))
+        try:
+            write_bytes_atomic(profile_file, buffer.getvalue())
+        except OSError as e:
+            logger.warning(f"Could not persist type profiles to {profile_file}: {e}")
+        return profiles
+
+    @staticmethod
+    def _build_profiles(matrix: np.ndarray) -> np.ndarray:
+        """Build the combo x attacking type defensive table from an effectiveness matrix."""
+        # profiles[c, a] = damage multiplier of attacking type a against combo c
+        return (matrix[:, TYPE_COMBOS[:, 0]] * matrix[:, TYPE_COMBOS[:, 1]]).T.copy()
+
+    def type_id(self, type_name: str) -> int:
+        """Get the integer id of a type name that exists in this chart's generation."""
+        type_name = type_name.lower()
+        if type_name not in self.available_types:
+            if type_name in TYPE_IDS:
+                raise ValueError(f"Type {type_name} does not exist in the {self.chart} type chart")
+            raise ValueError(f"Unknown type: {type_name}")
+        return TYPE_IDS[type_name]
+
+    def encode_types(self, types: Sequence[str]) -> Tuple[int, int]:
+        """Encode a one- or two-type list as a (type id, type id or NO_TYPE) pair."""
+        ids = [self.type_id(t) for t in types]
+        if not 1 <= len(ids) <= 2:
+            raise ValueError(f"A Pokemon has one or two types, got {list(types)}")
+        return (ids[0], ids[1] if len(ids) == 2 else NO_TYPE)
+
+    def chart_types(self, types: Sequence[str]) -> List[str]:
+        """Get a Pokemon's types as of this chart's generation.
+
+        A primary Fairy type was Normal before gen 6, so Clefable is Normal and
+        Togekiss Normal/Flying; other types added after the generation are
+        dropped, so Azumarill is Water. Unknown type names are kept so
+        encoding still rejects them.
+        """
+        chart_types = []
+        for slot, name in enumerate(types):
+            if name.lower() in TYPE_IDS and name.lower() not in self.available_types:
+                name = MISSING_PRIMARY_TYPES.get(name.lower()) if slot == 0 else None
+            if name is not None and name not in chart_types:
+                chart_types.append(name)
+        return chart_types or ["normal"]
+
+    def encode_chart_types(self, types: Sequence[str]) -> Tuple[int, int]:
+        """Encode a Pokemon's current types as this chart's generation saw them."""
+        return self.encode_types(self.chart_types(types))
+
+    def multiplier(self, attacker: str, defenders: Sequence[str]) -> float:
+        """Get the damage multiplier of an attacking type against a one- or two-type defender."""
+        first, second = self.encode_types(defenders)
+        row = self.matrix[self.type_id(attacker)]
+        return float(row[first] * row[second])
+
+    def multiplier_ids(self, attack_ids: np.ndarray, defense_ids: np.ndarray) -> np.ndarray:
+        """Get multipliers for arrays of attacking type ids and encoded defender pairs.
+
+        attack_ids and defense_ids[..., 0] / defense_ids[..., 1] broadcast against
+        each other, so any attacker x defender grid is computed in one array op.
+        """
+        defense_ids = np.asarray(defense_ids)
+        return self.matrix[attack_ids, defense_ids[..., 0]] * self.matrix[attack_ids, defense_ids[..., 1]]
+
+    def multipliers(self, attackers: Sequence[str], defenders: Sequence[Sequence[str]]) -> np.ndarray:
+        """Get an (attackers x defenders) multiplier grid for attacking types and defender type lists."""
+        attack_ids = np.array([self.type_id(t) for t in attackers], dtype=np.intp)
+        defense_ids = np.array([self.encode_types(types) for types in defenders], dtype=np.intp)
+        return self.multiplier_ids(attack_ids[:, np.newaxis], defense_ids[np.newaxis, :, :])
+
+    def combo_id(self, types: Sequence[str]) -> int:
+        """Get the row of a one- or two-type combo in the defensive profile table."""
+        first, second = self.encode_types(types)
+        if first == second:
+            raise ValueError(f"A Pokemon cannot have the same type twice, got {list(types)}")
+        return int(COMBO_INDEX[first, second])
+
+    def profile_ids(self, defense_ids: np.ndarray) -> np.ndarray:
+        """Get the 18-entry defensive multiplier vectors for an array of encoded type pairs."""
+        defense_ids = np.asarray(defense_ids)
+        return self.profiles[COMBO_INDEX[defense_ids[..., 0], defense_ids[..., 1]]]
+
+    def defensive_profile(self, types: Sequence[str]) -> Dict[str, Any]:
+        """Get the multiplier against each attacking type and the weakness, resistance and immunity sets."""
+        combo = self.combo_id(types)
         return {
+            "types": [t.lower() for t in types],
+            "multipliers": dict(zip(TYPE_NAMES, self.profiles[combo].tolist())),
+            "weaknesses": [TYPE_NAMES[i] for i in np.flatnonzero(self.weak_mask[combo])],
+            "resistances": [TYPE_NAMES[i] for i in np.flatnonzero(self.resist_mask[combo])],
+            "immunities": [TYPE_NAMES[i] for i in np.flatnonzero(self.immune_mask[combo])],
+        }
+
+    def _profiles_for(self, team_types: List[List[str]]) -> Dict[str, Any]:
+        """Get defensive profiles keyed like the per-member type lists, skipping unknown types.
+
+        Members are profiled with their types as of this chart's generation.
+        """
+        profiles = {}
+        for types in team_types:
+            try:
+                profiles[str(types)] = self.defensive_profile(self.chart_types(types))
+            except ValueError:
+                continue
+        return profiles
+
+    def _chart_reference(self) -> Dict[str, str]:
+        """Get the version and resource URI of the full type chart."""
+        return {
+            "type_chart": self.chart,
+            "type_chart_version": self.chart_version,
+            "type_chart_uri": f"type-chart://{self.chart_version}",
+        }
+
+    def get_type_chart(self, version: str = "latest") -> Dict[str, Any]:
+        """Get a full type chart by version hash, chart name such as "gen1", or "latest".
+
+        Every chart includes its attacker -> defender multipliers; the current
+        chart also includes the raw PokeAPI damage relations it was built from.
+        """
+        chart = next((c for c in self.charts.values() if version in (c.chart_version, c.chart)), None)
+        if version == "latest":
+            chart = self.charts[CURRENT_CHART]
+        if chart is None:
+            versions = {c.chart: c.chart_version for c in self.charts.values()}
+            raise ValueError(f"Unknown type chart version {version}, available versions are {versions}")
+
+        result = {
+            **chart._chart_reference(),
+            "types": list(chart.available_types),
+            "multipliers": {
+                attacker: {
+                    defender: float(chart.matrix[TYPE_IDS[attacker], TYPE_IDS[defender]])
+                    for defender in chart.available_types
+                }
+                for attacker in chart.available_types
+            },
+        }
+        if chart.chart == CURRENT_CHART:
+            result["type_relations"] = self.type_data
+        return result
+
+    def get_effectiveness(
+        self, attacking_type: str, defending_types: List[str], compact: bool = True
+    ) -> Dict[str, Any]:
+        """Get type effectiveness data.
+
+        Compact responses carry only computed multipliers and a reference to the
+        full chart resource; pass compact=False to also embed the raw relations.
+        """
+        try:
+            multiplier = self.multiplier(attacking_type, defending_types)
+            per_type = {t.lower(): self.multiplier(attacking_type, [t]) for t in defending_types}
+        except ValueError as e:
+            return {"error": str(e)}
+
+        result = {
             "attacking_type": attacking_type.lower(),
-            "attacking_type_data": self.type_data.get(attacking_type.lower(), {}),
             "defending_types": [t.lower() for t in defending_types],
-            "defending_types_data": {t.lower(): self.type_data.get(t.lower(), {}) for t in defending_types},
-            "all_type_relations": self.type_data,
+            "multiplier": multiplier,
+            "multipliers_by_type": per_type,
+            **self._chart_reference(),
         }
+        if not compact:
+            result["attacking_type_data"] = self.type_data.get(attacking_type.lower(), {})
+            result["defending_types_data"] = {t.lower(): self.type_data.get(t.lower(), {}) for t in defending_types}
+            result["all_type_relations"] = self.type_data
+        return result
 
-    def get_team_type_data(self, team_types: List[List[str]]) -> Dict[str, Any]:
-        """Get comprehensive type data for a team."""
-        return {
+    def _raw_type_data(self, team_types: List[List[str]]) -> Dict[str, Any]:
+        """Get the raw relations of each member's types, keyed by the member's type list."""
+        return {str(types): {t.lower(): self.type_data.get(t.lower(), {}) for t in types} for types in team_types}
+
+    def get_team_type_data(self, team_types: List[List[str]], compact: bool = True) -> Dict[str, Any]:
+        """Get defensive type profiles for a team."""
+        result = {
             "team_types": team_types,
-            "type_data": {
-                str(types): {t.lower(): self.type_data.get(t.lower(), {}) for t in types} for types in team_types
-            },
-            "all_type_relations": self.type_data,
+            "defensive_profiles": self._profiles_for(team_types),
+            **self._chart_reference(),
         }
+        if not compact:
+            result["type_data"] = self._raw_type_data(team_types)
+            result["all_type_relations"] = self.type_data
+        return result
 
-    def analyze_team_types(self, team1_types: List[List[str]], team2_types: List[List[str]]) -> Dict[str, Any]:
+    def analyze_team_types(
+        self, team1_types: List[List[str]], team2_types: List[List[str]], compact: bool = True
+    ) -> Dict[str, Any]:
         """Get type data for team matchup analysis."""
-        return {
+        result = {
             "team1_types": team1_types,
-            "team1_data": {
-                str(types): {t.lower(): self.type_data.get(t.lower(), {}) for t in types} for types in team1_types
-            },
+            "team1_defensive_profiles": self._profiles_for(team1_types),
             "team2_types": team2_types,
-            "team2_data": {
-                str(types): {t.lower(): self.type_data.get(t.lower(), {}) for t in types} for types in team2_types
-            },
-            "all_type_relations": self.type_data,
+            "team2_defensive_profiles": self._profiles_for(team2_types),
+            **self._chart_reference(),
         }
+        if not compact:
+            result["team1_data"] = self._raw_type_data(team1_types)
+            result["team2_data"] = self._raw_type_data(team2_types)
+            result["all_type_relations"] = self.type_data
+        return result
 
-    def get_pokemon_type_data(self, pokemon_types: List[str]) -> Dict[str, Any]:
-        """Get all type data for a Pokemon."""
-        return {
+    def get_pokemon_type_data(self, pokemon_types: List[str], compact: bool = True) -> Dict[str, Any]:
+        """Get the defensive type profile of a Pokemon."""
+        result = {
             "pokemon_types": pokemon_types,
-            "type_data": {t.lower(): self.type_data.get(t.lower(), {}) for t in pokemon_types},
-            "all_type_relations": self.type_data,
+            "defensive_profile": self._profiles_for([pokemon_types]).get(str(pokemon_types)),
+            **self._chart_reference(),
         }
+        if not compact:
+            result["type_data"] = {t.lower(): self.type_data.get(t.lower(), {}) for t in pokemon_types}
+            result["all_type_relations"] = self.type_data
+        return result